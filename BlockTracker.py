@@ -0,0 +1,182 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Per-signature table of Pixy2 blocks, updated incrementally across frames
+
+The Pixy2 gives every block it follows a tracking_index. BlockTracker keeps
+one TrackedObject per (signature, tracking_index) and compares each new
+frame against the table, so consumers get events only when something
+changes instead of rescanning every frame's block list:
+
+- "appeared": a new block is seen
+- "moved": a known block moved or changed size by at least move_threshold pixels
+- "disappeared": a block was missing for lost_frames frames in a row
+
+Every event is also fired under a signature specific name ("appeared_1",
+"moved_2", ...). Callbacks receive the tracker; the object that changed is
+tracker.changed. Objects of disappeared blocks are reused, so copy what
+must outlive the callback.
+"""
+
+from EventHandler import EventHandler
+
+# Smallest change (pixels) of position or size reported as a move
+MOVE_THRESHOLD = 2
+
+# Frames a block may be missing before it is reported as gone
+LOST_FRAMES = 3
+
+EVENTS = ("appeared", "moved", "disappeared")
+
+
+class TrackedObject:
+    """ Last known state of one tracked block."""
+    __slots__ = ("sig", "tracking_index", "x_center", "y_center", "width", "height",
+                 "angle", "age", "first_frame", "last_frame", "missed")
+
+    def __init__(self):
+        self.sig = None
+        self.tracking_index = None
+        self.x_center = 0
+        self.y_center = 0
+        self.width = 0
+        self.height = 0
+        self.angle = 0
+        self.age = 0
+        self.first_frame = 0
+        self.last_frame = 0
+        self.missed = 0
+
+    def update(self, block):
+        """Copy position and size from a Pixy2 block"""
+        self.x_center = block.x_center
+        self.y_center = block.y_center
+        self.width = block.width
+        self.height = block.height
+        self.angle = block.angle
+        self.age = block.age
+
+
+class BlockTracker(EventHandler):
+    """
+    Table of tracked blocks per signature and tracking index.
+    """
+
+    def __init__(self, move_threshold=MOVE_THRESHOLD, lost_frames=LOST_FRAMES):
+        """
+        Initialize the tracker.
+
+        Args:
+            move_threshold: Smallest change in pixels reported as a move
+            lost_frames: Missing frames before a block is reported as gone
+        """
+        self.move_threshold = move_threshold
+        self.lost_frames = lost_frames
+        self.objects = {}
+        self.count = 0
+        self.frame = 0
+        self.changed = None
+        self._event_names = {}
+        self._pool = []
+
+    def _names(self, sig):
+        """Signature specific event names (built once per signature)"""
+        names = self._event_names.get(sig)
+        if names is None:
+            names = self._event_names[sig] = tuple(
+                "{}_{}".format(event, sig) for event in EVENTS)
+        return names
+
+    def _emit(self, event, obj):
+        """Fire the generic and the signature specific event for obj"""
+        self.changed = obj
+        self.trigger(EVENTS[event])
+        self.trigger(self._names(obj.sig)[event])
+
+    def update(self, blocks):
+        """
+        Compare one frame of blocks with the table and fire events for changes.
+
+        Args:
+            blocks: Blocks of the frame (Pixy2 Block records)
+        """
+        self.frame += 1
+        frame = self.frame
+        threshold = self.move_threshold
+        seen = 0
+
+        for block in blocks:
+            table = self.objects.get(block.sig)
+            if table is None:
+                table = self.objects[block.sig] = {}
+            obj = table.get(block.tracking_index)
+            if obj is None:
+                obj = self._pool.pop() if self._pool else TrackedObject()
+                obj.sig = block.sig
+                obj.tracking_index = block.tracking_index
+                obj.update(block)
+                obj.first_frame = frame
+                obj.last_frame = frame
+                obj.missed = 0
+                table[block.tracking_index] = obj
+                self.count += 1
+                seen += 1
+                self._emit(0, obj)
+                continue
+            if obj.last_frame != frame:
+                seen += 1
+            obj.last_frame = frame
+            obj.missed = 0
+            if (abs(block.x_center - obj.x_center) >= threshold or
+                    abs(block.y_center - obj.y_center) >= threshold or
+                    abs(block.width - obj.width) >= threshold or
+                    abs(block.height - obj.height) >= threshold):
+                obj.update(block)
+                self._emit(1, obj)
+            else:
+                obj.age = block.age
+
+        if seen < self.count:
+            self._expire(frame)
+
+    def _expire(self, frame):
+        """Count missed frames and drop blocks gone for lost_frames frames"""
+        for table in self.objects.values():
+            for index in list(table):
+                obj = table[index]
+                if obj.last_frame == frame:
+                    continue
+                obj.missed += 1
+                if obj.missed >= self.lost_frames:
+                    del table[index]
+                    self.count -= 1
+                    self._emit(2, obj)
+                    self._pool.append(obj)
+
+    def get(self, sig, tracking_index):
+        """
+        Get a tracked block.
+
+        Returns:
+            TrackedObject or None
+        """
+        table = self.objects.get(sig)
+        if table is None:
+            return None
+        return table.get(tracking_index)
+
+    def get_signature(self, sig):
+        """
+        Get the tracked blocks of one signature.
+
+        Returns:
+            dict: tracking_index -> TrackedObject (do not modify)
+        """
+        return self.objects.get(sig, {})
+
+    def clear(self):
+        """Forget all blocks without firing events"""
+        for table in self.objects.values():
+            self._pool.extend(table.values())
+            table.clear()
+        self.count = 0
@@ -1,6 +1,14 @@
 from DriveSystem import DriveSystem
+from DriveStatus import (CarDriveStatus, MODE_STOPPED, MODE_FORWARD, MODE_BACKWARD,
+                         MODE_TURNING, MODE_DRIFT, MODE_STEERING)
+from SteeringCalibration import SteeringCalibration, calibrate_steering, DEFAULT_CALIBRATION_FILE
+from ErrorReporter import report_device_error
+from pybricks.parameters import Stop
 from time import sleep
 
+# Position-mode steering: only reissue a target that moved more than this (degrees)
+STEERING_HYSTERESIS = 3
+
 
 class CarDriveSystem(DriveSystem):
     """
@@ -26,6 +34,19 @@ class CarDriveSystem(DriveSystem):
         self.default_drive_speed = 1000
         self.default_steer_speed = 1000
         self.drift_speed = 1000
+        
+        # Live status record, updated in place whenever the commanded state changes
+        self.status = CarDriveStatus()
+        
+        # Steering end-stop calibration (None until loaded or calibrated)
+        self.steering_calibration = None
+        self.calibration_file = DEFAULT_CALIBRATION_FILE
+        
+        # Position-mode steering: last commanded steering angle (None = unknown)
+        self.steering_hysteresis = STEERING_HYSTERESIS
+        self.last_steer_target = None
+        
+        self.refresh_status()
     
     def initialize(self):
         """
@@ -47,6 +68,7 @@ class CarDriveSystem(DriveSystem):
         
         # Consider system initialized if at least steering is available
         self._is_initialized = self.is_device_available(self.steer_motor_name)
+        self.refresh_status()
         
         if __debug__:
             print("CarDriveSystem initialized: {}".format(self._is_initialized))
@@ -63,6 +85,7 @@ class CarDriveSystem(DriveSystem):
             duration: Optional duration in seconds
         """
         validated_speed = self.validate_speed(speed)
+        self._update_status(MODE_FORWARD, validated_speed, self.status.steer_speed)
         
         if self.is_device_available(self.drive_L_motor_name):
             self.safe_device_operation(self.drive_L_motor_name, "run", -validated_speed)
@@ -83,6 +106,7 @@ class CarDriveSystem(DriveSystem):
             duration: Optional duration in seconds
         """
         validated_speed = self.validate_speed(speed)
+        self._update_status(MODE_BACKWARD, -validated_speed, self.status.steer_speed)
         
         if self.is_device_available(self.drive_L_motor_name):
             self.safe_device_operation(self.drive_L_motor_name, "run", validated_speed)
@@ -103,7 +127,9 @@ class CarDriveSystem(DriveSystem):
             duration: Optional duration in seconds
         """
         validated_speed = self.validate_speed(speed)
+        self._update_status(MODE_TURNING, self.status.drive_speed, -validated_speed)
         
+        self.last_steer_target = None
         if self.is_device_available(self.steer_motor_name):
             self.safe_device_operation(self.steer_motor_name, "run", -validated_speed)
         
@@ -120,7 +146,9 @@ class CarDriveSystem(DriveSystem):
             duration: Optional duration in seconds
         """
         validated_speed = self.validate_speed(speed)
+        self._update_status(MODE_TURNING, self.status.drive_speed, validated_speed)
         
+        self.last_steer_target = None
         if self.is_device_available(self.steer_motor_name):
             self.safe_device_operation(self.steer_motor_name, "run", validated_speed)
         
@@ -133,6 +161,10 @@ class CarDriveSystem(DriveSystem):
         Move with simultaneous drive and steering control.
         Based on the move() function from main.py.
         
+        With a steering calibration loaded, steer_angle selects a steering
+        position (see steer_to_position()); otherwise it is an open-loop
+        steering speed.
+        
         Args:
             drive_speed: Forward/backward speed for drive motors
             steer_angle: Steering angle/speed for steering motor
@@ -140,8 +172,15 @@ class CarDriveSystem(DriveSystem):
         validated_drive_speed = self.validate_speed(drive_speed)
         validated_steer_speed = self.validate_speed(steer_angle)
         
-        # Apply steering (based on original move function logic)
-        if self.is_device_available(self.steer_motor_name):
+        if abs(validated_drive_speed) > 10:
+            self._update_status(MODE_STEERING, validated_drive_speed, validated_steer_speed)
+        else:
+            self._update_status(MODE_STEERING, 0, validated_steer_speed)
+        
+        if self.steering_calibration is not None:
+            # Calibrated: the stick selects a steering angle
+            self.steer_to_position(validated_steer_speed)
+        elif self.is_device_available(self.steer_motor_name):
             # Original logic: steer_motor.run(value.l_left*2)
             self.safe_device_operation(self.steer_motor_name, "run", validated_steer_speed * 2)
         
@@ -155,6 +194,36 @@ class CarDriveSystem(DriveSystem):
         else:
             self.stop_drive_motors()
     
+    def steer_to_position(self, steer_input) -> None:
+        """
+        Move calibrated steering to the angle selected by the stick.
+        
+        Maps -1000..1000 onto the calibrated range and issues a non-blocking
+        run_target() only when the target moved by more than
+        steering_hysteresis degrees, so the motor is not re-commanded on
+        every stick event. Center and the ends of the range are always sent
+        (unless already the last target), so the wheels settle exactly there.
+        
+        Args:
+            steer_input: Steering input (-1000 to 1000, negative = left)
+        """
+        calibration = self.steering_calibration
+        if calibration is None or not self.is_device_available(self.steer_motor_name):
+            return
+        
+        half_range = calibration.half_range
+        target = calibration.clamp(int(steer_input * half_range / 1000))
+        last = self.last_steer_target
+        if target == last:
+            return
+        endpoint = target == 0 or abs(target) >= half_range
+        if not endpoint and last is not None and abs(target - last) <= self.steering_hysteresis:
+            return
+        
+        self.last_steer_target = target
+        self.safe_device_operation(self.steer_motor_name, "run_target",
+                                   self.default_steer_speed, target, Stop.HOLD, False)
+    
     def stop(self):
         """
         Stop all drive system movement immediately.
@@ -162,6 +231,7 @@ class CarDriveSystem(DriveSystem):
         """
         self.stop_steering()
         self.stop_drive_motors()
+        self._update_status(MODE_STOPPED, 0, 0)
     
     def drift_left(self, speed: int) -> None:
         """
@@ -172,7 +242,9 @@ class CarDriveSystem(DriveSystem):
             speed: Speed for the drift maneuver
         """
         validated_speed = self.validate_speed(speed, max_speed=self.drift_speed)
+        self._update_status(MODE_DRIFT, validated_speed, -validated_speed)
         
+        self.last_steer_target = None
         if self.is_device_available(self.steer_motor_name):
             self.safe_device_operation(self.steer_motor_name, "run", -validated_speed)
         
@@ -191,7 +263,9 @@ class CarDriveSystem(DriveSystem):
             speed: Speed for the drift maneuver
         """
         validated_speed = self.validate_speed(speed, max_speed=self.drift_speed)
+        self._update_status(MODE_DRIFT, validated_speed, validated_speed)
         
+        self.last_steer_target = None
         if self.is_device_available(self.steer_motor_name):
             self.safe_device_operation(self.steer_motor_name, "run", validated_speed)
         
@@ -205,36 +279,159 @@ class CarDriveSystem(DriveSystem):
         """
         Get current status of the drive system.
         
+        Built from the incrementally updated status record, so no device
+        availability is re-queried (call refresh_status() after the devices
+        change). Use get_status_record() for allocation-free reads at high rate.
+        
         Returns:
             dict: Dictionary containing status information
         """
-        status = {
-            "initialized": self._is_initialized,
+        status = self.status
+        return {
+            "initialized": status.initialized,
             "devices": {
-                "steer_motor": self.is_device_available(self.steer_motor_name),
-                "drive_L_motor": self.is_device_available(self.drive_L_motor_name),
-                "drive_R_motor": self.is_device_available(self.drive_R_motor_name)
+                "steer_motor": status.steer_motor,
+                "drive_L_motor": status.drive_L_motor,
+                "drive_R_motor": status.drive_R_motor
             },
             "drive_system_type": "car_drive",
-            "available_operations": []
+            "available_operations": list(status.available_operations),
+            "mode": status.mode,
+            "drive_speed": status.drive_speed,
+            "steer_speed": status.steer_speed
         }
+    
+    def get_status_record(self) -> CarDriveStatus:
+        """
+        Get the live status record without allocating.
+        
+        The record is updated in place; compare its seq with a previously
+        seen value to detect changes.
+        
+        Returns:
+            CarDriveStatus: The drive system's status record
+        """
+        return self.status
+    
+    def refresh_status(self) -> None:
+        """
+        Re-query device availability once and store it in the status record.
+        
+        Called at construction and by initialize(); call again if the device
+        manager's devices change. seq is bumped only if the availability changed.
+        """
+        status = self.status
+        initialized = self._is_initialized
+        steer_motor = self.is_device_available(self.steer_motor_name)
+        drive_L_motor = self.is_device_available(self.drive_L_motor_name)
+        drive_R_motor = self.is_device_available(self.drive_R_motor_name)
+        if (status.initialized == initialized and
+                status.steer_motor == steer_motor and
+                status.drive_L_motor == drive_L_motor and
+                status.drive_R_motor == drive_R_motor):
+            return
+        status.initialized = initialized
+        status.steer_motor = steer_motor
+        status.drive_L_motor = drive_L_motor
+        status.drive_R_motor = drive_R_motor
         
         # Determine available operations based on device availability
-        if status["devices"]["steer_motor"]:
-            status["available_operations"].extend(["steering", "turn_left", "turn_right"])
+        operations = []
+        if status.steer_motor:
+            operations.extend(["steering", "turn_left", "turn_right"])
+        
+        if status.drive_L_motor and status.drive_R_motor:
+            operations.extend(["move_forward", "move_backward", "drift"])
         
-        if status["devices"]["drive_L_motor"] and status["devices"]["drive_R_motor"]:
-            status["available_operations"].extend(["move_forward", "move_backward", "drift"])
+        if status.steer_motor and status.drive_L_motor and status.drive_R_motor:
+            operations.append("full_car_control")
         
-        if all(status["devices"].values()):
-            status["available_operations"].append("full_car_control")
+        status.available_operations = tuple(operations)
+        status.seq += 1
+    
+    def _update_status(self, mode, drive_speed, steer_speed) -> None:
+        """
+        Update the status record in place, bumping seq only on real changes.
         
-        return status
+        Args:
+            mode: Drive mode constant from DriveStatus
+            drive_speed: Commanded drive speed (positive = forward)
+            steer_speed: Commanded steering speed (positive = right)
+        """
+        status = self.status
+        if status.mode != mode or status.drive_speed != drive_speed or status.steer_speed != steer_speed:
+            status.mode = mode
+            status.drive_speed = drive_speed
+            status.steer_speed = steer_speed
+            status.seq += 1
+    
+    def load_or_calibrate_steering(self, force=False) -> bool:
+        """
+        Load the cached steering calibration, or sweep the end-stops once.
+        
+        A cached calibration zeroes the encoder at the current position,
+        so the steering must be centered at boot (see center_steering()).
+        A fresh calibration is written to calibration_file for later boots.
+        
+        Args:
+            force: Ignore the cached file and re-sweep the end-stops
+            
+        Returns:
+            bool: True if the steering is calibrated
+        """
+        steer_motor = self.device_manager.get_device(self.steer_motor_name) if self.device_manager else None
+        if steer_motor is None:
+            return False
+        
+        calibration = None if force else SteeringCalibration.load(self.calibration_file)
+        try:
+            if calibration is not None:
+                steer_motor.reset_angle(0)
+                if __debug__:
+                    print("Steering calibration loaded: {} / {}".format(
+                        calibration.left_limit, calibration.right_limit))
+            else:
+                calibration = calibrate_steering(steer_motor)
+                if calibration.half_range <= 0:
+                    print("Steering calibration failed: no usable range")
+                    return False
+                calibration.save(self.calibration_file)
+        except Exception as e:
+            report_device_error(self.steer_motor_name, "load_or_calibrate_steering", e)
+            return False
+        
+        self.steering_calibration = calibration
+        return True
+    
+    def is_steering_calibrated(self) -> bool:
+        """
+        Check if a steering calibration is loaded.
+        
+        Returns:
+            bool: True if steering angles are known
+        """
+        return self.steering_calibration is not None
+    
+    def center_steering(self, speed=None) -> None:
+        """
+        Return calibrated steering to center and hold it there.
+        
+        Call before the program exits so a cached calibration stays valid
+        on the next boot.
+        
+        Args:
+            speed: Steering speed in deg/s (defaults to default_steer_speed)
+        """
+        if self.steering_calibration is None or not self.is_device_available(self.steer_motor_name):
+            return
+        steer_speed = speed if speed is not None else self.default_steer_speed
+        self.safe_device_operation(self.steer_motor_name, "run_target", steer_speed, 0)
     
     def stop_steering(self) -> None:
         """
         Stop only the steering motor.
         """
+        self.last_steer_target = None
         if self.is_device_available(self.steer_motor_name):
             self.safe_device_operation(self.steer_motor_name, "stop")
     
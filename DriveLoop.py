@@ -0,0 +1,99 @@
+#!/usr/bin/env pybricks-micropython
+
+import threading
+from time import sleep
+from Timing import ticks_us, ticks_diff
+from ErrorReporter import report_exception
+
+# Default control period in seconds (50 Hz)
+DEFAULT_TICK_PERIOD = 0.02
+
+
+class DriveLoop(threading.Thread):
+    """
+    Background thread that calls drive_tick() on registered drive systems
+    at a fixed rate.
+
+    Closed-loop features (heading hold, motion queues) run inside the tick so
+    they keep working while no controller events arrive, e.g. while a stick or
+    arrow button is held.
+    """
+
+    def __init__(self, period=DEFAULT_TICK_PERIOD):
+        """
+        Initialize the drive loop.
+
+        Args:
+            period: Tick period in seconds
+        """
+        super().__init__()
+        self.stopped = False
+        self.period = period
+        self.systems = []
+        self.ticks = 0
+        self.overruns = 0
+        self.errors = 0
+        self._failing = []  # Systems whose last tick raised
+
+    def __str__(self):
+        return "Drive control loop"
+
+    def add(self, system):
+        """
+        Register a drive system whose drive_tick() should be called.
+
+        Args:
+            system: DriveSystem instance
+        """
+        self.systems.append(system)
+
+    def tick(self):
+        """
+        Call drive_tick() once on every registered system.
+
+        A system that raises is reported and stopped; the other systems keep
+        ticking, and the failing one is ticked again on the next pass. Repeated
+        failures are only counted until the system ticks cleanly again.
+        """
+        for system in self.systems:
+            try:
+                system.drive_tick()
+            except Exception as e:
+                self.errors += 1
+                if system in self._failing:
+                    continue
+                self._failing.append(system)
+                report_exception("DriveLoop.tick()", "drive_tick() of {}".format(type(system).__name__), e)
+                self._stop_system(system)
+            else:
+                if system in self._failing:
+                    self._failing.remove(system)
+        self.ticks += 1
+
+    def _stop_system(self, system):
+        """
+        Stop a system whose tick failed, so it is not left running on its last
+        command (a running motion primitive would otherwise never complete).
+        """
+        try:
+            if hasattr(system, "flush_motions"):
+                system.flush_motions()
+            if hasattr(system, "stop"):
+                system.stop()
+        except Exception as e:
+            report_exception("DriveLoop._stop_system()", "stopping {}".format(type(system).__name__), e)
+
+    def run(self):
+        """Call drive_tick() on every registered system until stopped"""
+        period_us = int(self.period * 1000000)
+        while not self.stopped:
+            start = ticks_us()
+            self.tick()
+            remaining = period_us - ticks_diff(ticks_us(), start)
+            if remaining > 0:
+                sleep(remaining / 1000000)
+            else:
+                self.overruns += 1
+
+    def stop(self):
+        self.stopped = True
@@ -0,0 +1,77 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Incrementally updated status records for drive systems and the turret
+
+Each drive system owns one record and updates it in place whenever its
+commanded state changes. Reading the record allocates nothing, so telemetry
+can poll it at high rate. The seq counter increases on every change; a
+poller can skip sending when seq has not moved since the last read.
+"""
+
+# Drive modes (shared string constants, so updates never allocate)
+MODE_STOPPED = "stopped"
+MODE_FORWARD = "forward"
+MODE_BACKWARD = "backward"
+MODE_TURNING = "turning"
+MODE_PIVOT = "pivot"
+MODE_DRIFT = "drift"
+MODE_STEERING = "steering"
+MODE_MOTION = "motion"
+
+# Turret modes
+MODE_HOLDING = "holding"
+MODE_SPEED = "speed"
+MODE_POSITION = "position"
+MODE_AIMING = "aiming"
+
+
+class TankDriveStatus:
+    """Live status of a TankDriveSystem."""
+    __slots__ = ("seq", "initialized", "left_motor", "right_motor", "mode",
+                 "left_speed", "right_speed", "heading_hold",
+                 "available_operations")
+
+    def __init__(self):
+        self.seq = 0
+        self.initialized = False
+        self.left_motor = False
+        self.right_motor = False
+        self.mode = MODE_STOPPED
+        self.left_speed = 0
+        self.right_speed = 0
+        self.heading_hold = False
+        self.available_operations = ()
+
+
+class CarDriveStatus:
+    """Live status of a CarDriveSystem."""
+    __slots__ = ("seq", "initialized", "steer_motor", "drive_L_motor",
+                 "drive_R_motor", "mode", "drive_speed", "steer_speed",
+                 "available_operations")
+
+    def __init__(self):
+        self.seq = 0
+        self.initialized = False
+        self.steer_motor = False
+        self.drive_L_motor = False
+        self.drive_R_motor = False
+        self.mode = MODE_STOPPED
+        self.drive_speed = 0
+        self.steer_speed = 0
+        self.available_operations = ()
+
+
+class TurretStatus:
+    """Live status of a Turret."""
+    __slots__ = ("seq", "available", "mode", "speed", "target_angle",
+                 "min_angle", "max_angle")
+
+    def __init__(self):
+        self.seq = 0
+        self.available = False
+        self.mode = MODE_HOLDING
+        self.speed = 0
+        self.target_angle = 0
+        self.min_angle = 0
+        self.max_angle = 0
@@ -1,3 +1,8 @@
+import threading
+from MotionQueue import WAIT
+from Timing import ticks_us, ticks_diff
+
+
 class DriveSystem:
     """
     Base class for robot drive systems.
@@ -19,6 +24,13 @@ class DriveSystem:
         """
         self.device_manager = device_manager
         self._is_initialized = False
+        
+        # Motion queue executed from drive_tick() (see MotionQueue)
+        self._motion_lock = threading.Lock()
+        self._motion_queue = []
+        self._motion_current = None
+        self._motion_wait_start = 0
+        self.completed_motions = 0
     
     def initialize(self) -> bool:
         """
@@ -132,6 +144,134 @@ class DriveSystem:
         """
         raise NotImplementedError("This method should be implemented in child classes")
     
+    def drive_tick(self):
+        """
+        Periodic control hook called by DriveLoop at a fixed rate.
+        
+        The default implementation advances the motion queue. Drive systems
+        with additional closed-loop behaviour override this and call super().
+        """
+        if self._motion_current is not None or self._motion_queue:
+            self.motion_step()
+    
+    def begin_motion(self, primitive):
+        """
+        Start executing a motion primitive (DRIVE, PIVOT or ARC).
+        
+        Args:
+            primitive: MotionPrimitive to start
+            
+        Note: This method should be overridden in child classes that support
+        the motion queue.
+        """
+        raise NotImplementedError("This method should be implemented in child classes")
+    
+    def motion_complete(self, primitive):
+        """
+        Check whether the running motion primitive has reached its target.
+        
+        Args:
+            primitive: MotionPrimitive currently executing
+            
+        Returns:
+            bool: True once the primitive is finished
+            
+        Note: This method should be overridden in child classes that support
+        the motion queue.
+        """
+        raise NotImplementedError("This method should be implemented in child classes")
+    
+    def enqueue_motion(self, primitive):
+        """
+        Append a motion primitive to the motion queue.
+        
+        Args:
+            primitive: MotionPrimitive to execute after the queued ones
+        """
+        with self._motion_lock:
+            self._motion_queue.append(primitive)
+    
+    def enqueue_motions(self, primitives):
+        """
+        Append a whole sequence of motion primitives in one step.
+        
+        Args:
+            primitives: Iterable of MotionPrimitive instances
+        """
+        with self._motion_lock:
+            self._motion_queue.extend(primitives)
+    
+    def flush_motions(self):
+        """
+        Drop all queued motions and stop the one currently executing.
+        """
+        if self._motion_current is None and not self._motion_queue:
+            return
+        with self._motion_lock:
+            del self._motion_queue[:]
+            running = self._motion_current is not None
+            self._motion_current = None
+        if running:
+            self.stop()
+    
+    def preempt_motions(self, primitives):
+        """
+        Replace everything queued or running with a new sequence.
+        
+        Args:
+            primitives: Iterable of MotionPrimitive instances to run immediately
+        """
+        with self._motion_lock:
+            del self._motion_queue[:]
+            self._motion_queue.extend(primitives)
+            running = self._motion_current is not None
+            self._motion_current = None
+            idle = not self._motion_queue
+        if running and idle:
+            self.stop()
+    
+    def is_motion_active(self):
+        """
+        Check if the motion queue is executing or has pending primitives.
+        
+        Returns:
+            bool: True while motions are running or queued
+        """
+        return self._motion_current is not None or len(self._motion_queue) > 0
+    
+    def motion_step(self):
+        """
+        Advance the motion queue by one tick.
+        
+        Finishes the current primitive when its target is reached and starts
+        the next one in the same tick, so queued motions run back to back.
+        Stops the drive once the queue runs empty.
+        """
+        with self._motion_lock:
+            current = self._motion_current
+            if current is not None:
+                if current.kind == WAIT:
+                    done = ticks_diff(ticks_us(), self._motion_wait_start) >= current.duration * 1000
+                else:
+                    done = self.motion_complete(current)
+                if not done:
+                    return
+                self._motion_current = None
+                self.completed_motions += 1
+            
+            if not self._motion_queue:
+                if current is not None:
+                    self.stop()
+                return
+            
+            current = self._motion_queue.pop(0)
+            self._motion_current = current
+            if current.kind == WAIT:
+                self.stop()
+                self._motion_wait_start = ticks_us()
+            else:
+                self.begin_motion(current)
+    
     def is_initialized(self):
         """
         Check if the drive system is properly initialized.
@@ -0,0 +1,261 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Pixy2 line following for TankDriveSystem
+
+The Pixy2 line tracking mode reports the primary vector: the line segment
+it is following, in a 79 x 52 pixel frame. Once per camera frame the
+follower reads the vector, takes the horizontal offset of its head from the
+frame center as the lateral error and steers the tracks with a PD
+controller, slowing down on large errors.
+
+At intersections the Pixy2 picks the branch itself, using the angle set
+with set_next_turn(). The follower walks a turn plan (0 = straight,
+positive = left, negative = right, in degrees): the first turn is sent at
+start and the next one each time an intersection has been passed. The plan
+repeats, so a track with a fixed route gives repeatable laps.
+
+Heading hold would pull the tracks back to equal speeds against the PD
+output, so it is switched off while following and restored afterwards.
+
+Loop timing and lateral error statistics are kept from the last
+start_lap() call. The Pixy2 must not be polled by another thread (stop
+Pixy2Camera first) while the follower runs.
+"""
+
+import threading
+from time import sleep
+from Timing import ticks_us, ticks_diff
+from ErrorReporter import report_exception
+
+# Line tracking frame: 79 px wide, 60 frames per second
+LINE_FRAME_WIDTH = 79
+LINE_FRAME_PERIOD_US = 16667
+
+# Track speed on a centered line (deg/s)
+DEFAULT_BASE_SPEED = 400
+
+# PD gains: track speed difference (deg/s) per pixel of lateral error, and
+# per pixel/s of error rate
+DEFAULT_KP = 12.0
+DEFAULT_KD = 0.4
+
+# Speed is reduced by up to this fraction when the line is at the frame edge
+CORNER_SLOWDOWN = 0.5
+
+# Stop when no line has been seen for this long (seconds)
+LOST_TIMEOUT = 0.3
+
+
+class LineFollower(threading.Thread):
+    """
+    Follows a line seen by the Pixy2 with a TankDriveSystem.
+
+    step() runs one control cycle and can be called directly between
+    begin() and end(); run() does this once per camera frame until stopped.
+    """
+
+    def __init__(self, drive_system, pixy, base_speed=DEFAULT_BASE_SPEED,
+                 kp=DEFAULT_KP, kd=DEFAULT_KD, turn_plan=None,
+                 frame_period_us=LINE_FRAME_PERIOD_US, lost_timeout=LOST_TIMEOUT):
+        """
+        Initialize the line follower.
+
+        Args:
+            drive_system: TankDriveSystem to drive
+            pixy: Pixy2 driver (not polled by any other thread)
+            base_speed: Track speed on a centered line (deg/s)
+            kp: Proportional gain on the lateral error
+            kd: Derivative gain on the lateral error rate
+            turn_plan: Turn angles for successive intersections (repeats)
+            frame_period_us: Control period, one camera frame
+            lost_timeout: Seconds without a line before the robot stops
+        """
+        super().__init__()
+        self.stopped = False
+        self.drive_system = drive_system
+        self.pixy = pixy
+        self.base_speed = base_speed
+        self.kp = kp
+        self.kd = kd
+        self.turn_plan = list(turn_plan) if turn_plan else []
+        self.frame_period_us = frame_period_us
+        self.lost_timeout_us = int(lost_timeout * 1000000)
+        self.center_x = (LINE_FRAME_WIDTH - 1) / 2
+
+        self.turn_index = 0
+        self.last_error = None
+        self.last_error_us = None
+        self.last_seen_us = None
+        self.line_lost = True
+        self.at_intersection = False
+        self.restore_heading_hold = False
+        self.start_lap()
+
+    def __str__(self):
+        return "Pixy2 line follower"
+
+    def start_lap(self, now_us=None):
+        """Reset the statistics; elapsed time counts from now"""
+        self.lap_start_us = ticks_us() if now_us is None else now_us
+        self.frames = 0
+        self.line_frames = 0
+        self.lost_stops = 0
+        self.intersections = 0
+        self.errors = 0
+        self.overruns = 0
+        self.max_loop_us = 0
+        self.max_error = 0.0
+        self._loop_us_sum = 0
+        self._error_sq_sum = 0.0
+
+    def start_turn_plan(self):
+        """Send the first planned turn to the Pixy2"""
+        self.turn_index = 0
+        if self.turn_plan:
+            self.pixy.set_next_turn(self.turn_plan[0])
+
+    def begin(self):
+        """Take over the drive system: clear queued motions, pause heading hold, start a lap"""
+        drive_system = self.drive_system
+        drive_system.flush_motions()
+        self.restore_heading_hold = drive_system.heading_hold_enabled
+        if self.restore_heading_hold:
+            drive_system.disable_heading_hold()
+        self.start_turn_plan()
+        self.start_lap()
+
+    def end(self):
+        """Stop the robot and restore heading hold if begin() paused it"""
+        drive_system = self.drive_system
+        drive_system.stop()
+        if self.restore_heading_hold:
+            self.restore_heading_hold = False
+            drive_system.enable_heading_hold()
+
+    def step(self, now_us=None):
+        """
+        Run one control cycle: read the line features and steer.
+
+        Args:
+            now_us: Cycle time (defaults to now)
+
+        Returns:
+            bool: True if a line was seen
+        """
+        start = ticks_us()
+        if now_us is None:
+            now_us = start
+        self.frames += 1
+
+        try:
+            features = self.pixy.get_linetracking_data()
+        except Exception:
+            # Camera errors count as a frame without a line
+            self.errors += 1
+            features = None
+
+        seen = features is not None and features.number_of_vectors > 0
+        if seen:
+            self._follow(features.vectors[0], now_us)
+            self._check_intersection(features.number_of_intersections > 0)
+        elif not self.line_lost and (self.last_seen_us is None or
+                                     ticks_diff(now_us, self.last_seen_us) > self.lost_timeout_us):
+            self.line_lost = True
+            self.last_error = None
+            self.lost_stops += 1
+            self.drive_system.stop()
+
+        loop_us = ticks_diff(ticks_us(), start)
+        self._loop_us_sum += loop_us
+        if loop_us > self.max_loop_us:
+            self.max_loop_us = loop_us
+        return seen
+
+    def _follow(self, vector, now_us):
+        """Steer toward the head of the primary vector"""
+        self.line_frames += 1
+        self.last_seen_us = now_us
+        self.line_lost = False
+
+        error = vector.x1 - self.center_x
+        self._error_sq_sum += error * error
+        if abs(error) > self.max_error:
+            self.max_error = abs(error)
+
+        rate = 0.0
+        if self.last_error is not None:
+            dt = ticks_diff(now_us, self.last_error_us) / 1000000
+            if dt > 0:
+                rate = (error - self.last_error) / dt
+        self.last_error = error
+        self.last_error_us = now_us
+
+        correction = self.kp * error + self.kd * rate
+        speed = self.base_speed * (1 - CORNER_SLOWDOWN * min(1.0, abs(error) / self.center_x))
+        # Line to the right (positive error): left track faster.
+        # Forward is negative track speed on this robot.
+        self.drive_system.set_motor_speeds(int(-(speed + correction)), int(-(speed - correction)))
+
+    def _check_intersection(self, present):
+        """Send the next planned turn once an intersection has been reached"""
+        if present and not self.at_intersection:
+            self.intersections += 1
+            if self.turn_plan:
+                self.turn_index = (self.turn_index + 1) % len(self.turn_plan)
+                try:
+                    self.pixy.set_next_turn(self.turn_plan[self.turn_index])
+                except Exception:
+                    self.errors += 1
+        self.at_intersection = present
+
+    def run(self):
+        """Follow the line once per camera frame until stopped"""
+        try:
+            self.begin()
+            deadline = ticks_us()
+            while not self.stopped:
+                self.step()
+                deadline += self.frame_period_us
+                remaining = ticks_diff(deadline, ticks_us())
+                if remaining > 0:
+                    sleep(remaining / 1000000)
+                else:
+                    # Skip to the next frame instead of running back to back
+                    self.overruns += 1
+                    deadline = ticks_us()
+        except Exception as e:
+            report_exception("LineFollower.run()", "line following loop", e)
+        self.end()
+
+    def stop(self):
+        self.stopped = True
+
+    def get_stats(self, now_us=None):
+        """
+        Get lap statistics since the last start_lap().
+
+        Returns:
+            dict: elapsed_s, frames, loop_rate (Hz), avg/max loop time (us),
+                  overruns, line_frames, lost_stops, intersections, errors,
+                  rms/max lateral error (pixels)
+        """
+        if now_us is None:
+            now_us = ticks_us()
+        elapsed_us = ticks_diff(now_us, self.lap_start_us)
+        frames = self.frames
+        line_frames = self.line_frames
+        return {
+            "elapsed_s": elapsed_us / 1000000,
+            "frames": frames,
+            "loop_rate": frames * 1000000 / elapsed_us if elapsed_us > 0 else 0.0,
+            "avg_loop_us": self._loop_us_sum // frames if frames else 0,
+            "max_loop_us": self.max_loop_us,
+            "overruns": self.overruns,
+            "line_frames": line_frames,
+            "lost_stops": self.lost_stops,
+            "intersections": self.intersections,
+            "errors": self.errors,
+            "rms_error": (self._error_sq_sum / line_frames) ** 0.5 if line_frames else 0.0,
+            "max_error": self.max_error,
+        }
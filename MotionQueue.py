@@ -0,0 +1,111 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Motion primitives for the drive system motion queue
+
+Callers enqueue primitives on a DriveSystem (enqueue_motion/enqueue_motions).
+The DriveLoop thread executes them back to back from drive_tick(), finishing
+each one on encoder targets rather than sleep timing.
+
+Network sequences use a compact text form, one primitive per ';':
+    drive:<distance_mm>:<speed>
+    pivot:<angle_deg>:<speed>          (positive = left / counterclockwise)
+    arc:<radius_mm>:<angle_deg>:<speed>
+    wait:<duration_ms>
+Example: "drive:300:500;pivot:90:400;wait:250;arc:200:-45:600"
+"""
+
+# Primitive kinds
+DRIVE = 0
+PIVOT = 1
+ARC = 2
+WAIT = 3
+
+KIND_NAMES = ("drive", "pivot", "arc", "wait")
+
+
+class MotionPrimitive:
+    """
+    A single queued motion.
+
+    Attributes:
+        kind: One of DRIVE, PIVOT, ARC or WAIT
+        distance: Distance in mm (DRIVE) or turn radius in mm (ARC)
+        angle: Turn angle in degrees (PIVOT, ARC)
+        speed: Motor speed for the fastest track (DRIVE, PIVOT, ARC)
+        duration: Duration in milliseconds (WAIT)
+    """
+
+    def __init__(self, kind, distance=0, angle=0, speed=0, duration=0):
+        self.kind = kind
+        self.distance = distance
+        self.angle = angle
+        self.speed = speed
+        self.duration = duration
+
+    def __str__(self):
+        if self.kind == DRIVE:
+            return "drive {}mm @ {}".format(self.distance, self.speed)
+        if self.kind == PIVOT:
+            return "pivot {}° @ {}".format(self.angle, self.speed)
+        if self.kind == ARC:
+            return "arc r={}mm {}° @ {}".format(self.distance, self.angle, self.speed)
+        return "wait {}ms".format(self.duration)
+
+
+def drive_distance(distance, speed):
+    """Drive straight for distance mm (negative = backward) at speed"""
+    return MotionPrimitive(DRIVE, distance=distance, speed=abs(speed))
+
+
+def pivot_angle(angle, speed):
+    """Pivot in place by angle degrees (positive = left) at speed"""
+    return MotionPrimitive(PIVOT, angle=angle, speed=abs(speed))
+
+
+def arc(radius, angle, speed):
+    """Drive along an arc of radius mm for angle degrees (positive = left); negative speed reverses"""
+    return MotionPrimitive(ARC, distance=abs(radius), angle=angle, speed=speed)
+
+
+def wait(duration):
+    """Pause for duration milliseconds"""
+    return MotionPrimitive(WAIT, duration=max(0, duration))
+
+
+def parse_motion_sequence(text):
+    """
+    Parse a ';' separated motion sequence (see module docstring).
+
+    Args:
+        text: Sequence text, e.g. "drive:300:500;pivot:90:400"
+
+    Returns:
+        list: MotionPrimitive instances in order
+
+    Raises:
+        ValueError: If a step is malformed or has an unknown kind
+    """
+    primitives = []
+    for step in text.split(";"):
+        step = step.strip()
+        if not step:
+            continue
+        parts = step.split(":")
+        name = parts[0].strip().lower()
+        try:
+            values = [int(float(part)) for part in parts[1:]]
+        except ValueError:
+            raise ValueError("Invalid number in motion step: {}".format(step))
+
+        if name == "drive" and len(values) == 2:
+            primitives.append(drive_distance(values[0], values[1]))
+        elif name == "pivot" and len(values) == 2:
+            primitives.append(pivot_angle(values[0], values[1]))
+        elif name == "arc" and len(values) == 3:
+            primitives.append(arc(values[0], values[1], values[2]))
+        elif name == "wait" and len(values) == 1:
+            primitives.append(wait(values[0]))
+        else:
+            raise ValueError("Invalid motion step: {}".format(step))
+    return primitives
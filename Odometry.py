@@ -0,0 +1,212 @@
+#!/usr/bin/env pybricks-micropython
+
+import math
+import threading
+from time import sleep
+from Timing import ticks_us, ticks_diff
+from ErrorReporter import report_device_error, report_exception
+
+# Drive geometry (millimetres) - measure on the robot and adjust
+WHEEL_DIAMETER_MM = 43.2   # Effective diameter of the track drive sprocket
+TRACK_WIDTH_MM = 120.0     # Distance between the centres of the two tracks
+
+# Motor angle sign for forward travel (this robot drives forward with negative speeds)
+FORWARD_DIRECTION = -1
+
+# Default sampling period in seconds (50 Hz)
+DEFAULT_SAMPLE_PERIOD = 0.02
+
+# Quarter-wave sine table with 1 degree steps, interpolated linearly.
+# 91 entries keep the table tiny on the brick while staying well under
+# 0.01% error, and lookups cost the same no matter what the heading is.
+_SIN_TABLE = [math.sin(math.radians(d)) for d in range(91)]
+
+
+def table_sin(degrees):
+    """
+    Sine of an angle in degrees using the precomputed quarter-wave table.
+
+    Args:
+        degrees: Angle in degrees (any range)
+
+    Returns:
+        float: Sine of the angle
+    """
+    degrees = degrees % 360.0
+    if degrees < 90.0:
+        sign = 1
+    elif degrees < 180.0:
+        degrees = 180.0 - degrees
+        sign = 1
+    elif degrees < 270.0:
+        degrees = degrees - 180.0
+        sign = -1
+    else:
+        degrees = 360.0 - degrees
+        sign = -1
+
+    index = int(degrees)
+    if index >= 90:
+        return sign * _SIN_TABLE[90]
+    low = _SIN_TABLE[index]
+    return sign * (low + (_SIN_TABLE[index + 1] - low) * (degrees - index))
+
+
+def table_cos(degrees):
+    """
+    Cosine of an angle in degrees using the precomputed quarter-wave table.
+
+    Args:
+        degrees: Angle in degrees (any range)
+
+    Returns:
+        float: Cosine of the angle
+    """
+    return table_sin(degrees + 90.0)
+
+
+class Odometry(threading.Thread):
+    """
+    Incremental differential-drive odometry from the track motor encoders.
+
+    A background thread samples drive_L_motor/drive_R_motor angle() at a fixed
+    rate and integrates the robot pose (x, y in millimetres, heading in degrees,
+    counterclockwise positive, 0 = initial forward direction along +x).
+    Every sample costs the same: two encoder reads and a handful of
+    multiplications with table-based trigonometry.
+
+    Other components read the pose through get_pose(), which returns the last
+    published tuple and never touches the motors.
+    """
+
+    def __init__(self, device_manager, left_motor_name="drive_L_motor",
+                 right_motor_name="drive_R_motor",
+                 wheel_diameter=WHEEL_DIAMETER_MM, track_width=TRACK_WIDTH_MM,
+                 sample_period=DEFAULT_SAMPLE_PERIOD):
+        """
+        Initialize the odometry engine.
+
+        Args:
+            device_manager: DeviceManager providing the track motors
+            left_motor_name: Device name of the left track motor
+            right_motor_name: Device name of the right track motor
+            wheel_diameter: Effective drive wheel/sprocket diameter in mm
+            track_width: Distance between the track centres in mm
+            sample_period: Sampling period of the background thread in seconds
+        """
+        super().__init__()
+        self.stopped = False
+        self.left_motor_name = left_motor_name
+        self.right_motor_name = right_motor_name
+        self.left_motor = device_manager.get_device(left_motor_name)
+        self.right_motor = device_manager.get_device(right_motor_name)
+        self.sample_period = sample_period
+        self.track_width = track_width
+
+        # Precomputed conversion factors (per encoder degree)
+        self.mm_per_degree = math.pi * wheel_diameter / 360.0
+        self.heading_per_degree = math.degrees(self.mm_per_degree / track_width)
+
+        self.samples = 0
+        self._x = 0.0
+        self._y = 0.0
+        self._heading = 0.0
+        self._pose = (0.0, 0.0, 0.0)
+        self._last_left = 0
+        self._last_right = 0
+        self._read_encoders_as_baseline()
+
+    def __str__(self):
+        return "Encoder odometry for tank drive"
+
+    def is_available(self):
+        """Check if both track motors are available for odometry"""
+        return self.left_motor is not None and self.right_motor is not None
+
+    def _read_encoders_as_baseline(self):
+        """Use the current encoder angles as the reference for the next sample"""
+        if not self.is_available():
+            return
+        try:
+            self._last_left = self.left_motor.angle()
+            self._last_right = self.right_motor.angle()
+        except Exception as e:
+            report_device_error(self.left_motor_name, "odometry_baseline", e, "angle()")
+
+    def reset(self, x=0.0, y=0.0, heading=0.0):
+        """
+        Reset the pose and take the current encoder angles as the new baseline.
+
+        Args:
+            x: New x position in mm
+            y: New y position in mm
+            heading: New heading in degrees
+        """
+        self._read_encoders_as_baseline()
+        self._x = float(x)
+        self._y = float(y)
+        self._heading = float(heading) % 360.0
+        self._pose = (self._x, self._y, self._heading)
+
+    def sample(self):
+        """
+        Read both encoders once and integrate the pose increment.
+
+        Uses midpoint integration: the displacement is applied along the
+        heading halfway through the sample, which is exact for constant arcs.
+
+        Returns:
+            bool: True if a sample was taken, False if the motors are unavailable
+        """
+        if not self.is_available():
+            return False
+
+        try:
+            left = self.left_motor.angle()
+            right = self.right_motor.angle()
+        except Exception as e:
+            report_device_error(self.left_motor_name, "odometry_sample", e, "angle()")
+            return False
+
+        delta_left = (left - self._last_left) * FORWARD_DIRECTION
+        delta_right = (right - self._last_right) * FORWARD_DIRECTION
+        self._last_left = left
+        self._last_right = right
+
+        distance = (delta_left + delta_right) * 0.5 * self.mm_per_degree
+        delta_heading = (delta_right - delta_left) * self.heading_per_degree
+
+        mid_heading = self._heading + delta_heading * 0.5
+        self._x += distance * table_cos(mid_heading)
+        self._y += distance * table_sin(mid_heading)
+        self._heading = (self._heading + delta_heading) % 360.0
+
+        # Publish with a single reference swap so readers never see a torn pose
+        self._pose = (self._x, self._y, self._heading)
+        self.samples += 1
+        return True
+
+    def get_pose(self):
+        """
+        Get the latest pose snapshot without touching the motors.
+
+        Returns:
+            tuple: (x_mm, y_mm, heading_degrees)
+        """
+        return self._pose
+
+    def run(self):
+        """Sample the encoders at a fixed rate until stopped"""
+        period_us = int(self.sample_period * 1000000)
+        try:
+            while not self.stopped:
+                start = ticks_us()
+                self.sample()
+                remaining = period_us - ticks_diff(ticks_us(), start)
+                if remaining > 0:
+                    sleep(remaining / 1000000)
+        except Exception as e:
+            report_exception("Odometry.run()", "encoder sampling loop", e)
+
+    def stop(self):
+        self.stopped = True
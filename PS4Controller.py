@@ -6,6 +6,7 @@ import struct
 from time import sleep
 from ErrorReporter import report_controller_error, report_exception
 
+RIGHT_STICK_NOISE = 10  # Right stick values below this are noise (for -100 to 100 range)
 MIN_JOYSTICK_MOVE = 100  # The minimum value of joystick move to be considered as a move (for -1000 to 1000 range)
     #const values representing particular events 
 
@@ -130,10 +131,11 @@ class PS4Controller(EventHandler, threading.Thread):
                         self.r_left = -1 * self.scale(value, (0,255), (-100,100))
                         # printIn(35,10,"Right x-axis:" + str(self.r_left) + "   ")   
 
-                    # Apply deadzone filtering to right joystick too
-                    if abs(self.r_forward) < 50:  # Increased deadzone for right joystick
+                    # Filter stick noise only; Turret applies its own deadzone with
+                    # hysteresis, which needs values just inside the deadzone edge
+                    if abs(self.r_forward) < RIGHT_STICK_NOISE:
                         self.r_forward = 0
-                    if abs(self.r_left) < 50:
+                    if abs(self.r_left) < RIGHT_STICK_NOISE:
                         self.r_left = 0
                         
                     # Always trigger right joystick events to ensure stop commands are sent
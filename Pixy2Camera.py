@@ -1,16 +1,81 @@
 import threading
 from time import sleep
 from EventHandler import EventHandler
-from pixycamev3.pixy2 import Pixy2
+from BlockTracker import BlockTracker
+from Timing import ticks_us, ticks_diff
+from pixycamev3.pixy2 import Pixy2, Block
+
+# Pixy2 color connected components run at ~60 frames per second
+FRAME_PERIOD_US = 16667
+
+# Poll every frame while a block is seen, every IDLE_FRAMES frames once nothing
+# has been seen for IDLE_TIMEOUT seconds (12 frames = 5 Hz)
+IDLE_FRAMES = 12
+IDLE_TIMEOUT = 1.0
+
+class BlockFrame:
+    """
+    One published camera frame: copies of the detected blocks.
+
+    seq is odd while the camera thread is writing the frame and advances by
+    two for every frame written into this buffer.
+    """
+    __slots__ = ("seq", "number", "time_us", "blocks", "pool")
+
+    def __init__(self):
+        self.seq = 0
+        self.number = 0
+        self.time_us = None
+        self.blocks = []
+        self.pool = []
 
 class Pixy2Camera(EventHandler, threading.Thread):
+    """
+    Polls the Pixy2 for color blocks on a background thread.
+
+    Polls are scheduled on a grid of camera frame periods, so a poll never
+    asks for the same frame twice and a slow transaction does not shift the
+    following polls. While blocks are seen every frame is fetched; after
+    IDLE_TIMEOUT without blocks the poller backs off to every IDLE_FRAMES
+    frames.
+
+    Blocks are published double-buffered: the camera thread copies each
+    frame into the back buffer and publishes it with a single reference
+    swap, so readers never see a frame that is being written and need no
+    lock. get_frame() is for block_detected callbacks (they run on the
+    camera thread); other threads use snapshot().
+
+    All signatures in sigmap are fetched in one request. Every frame also
+    updates a BlockTracker, which fires appeared/moved/disappeared events
+    per block (onBlockAppeared() etc.) on the camera thread.
+    """
     pixy = 0;
     stopped = False
     blocks = None
+    errors = 0
 
-    def __init__(self, port=1):
-        self.pixy = Pixy2(port=1, i2c_address=0x54)
+    def __init__(self, port=1, transport=None, sigmap=1, max_blocks=1):
+        """
+        Args:
+            port: EV3 input port number of the Pixy2 (1-4)
+            transport: I2C transport (defaults to the EV3 bus)
+            sigmap: Signatures to fetch (bit 0 = signature 1, bit 7 = color codes)
+            max_blocks: Most blocks fetched per frame
+        """
+        super().__init__()
+        self.pixy = Pixy2(port=port, i2c_address=0x54, transport=transport)
         self.pixy.mode = 'SIG1'
+        self.sigmap = sigmap
+        self.max_blocks = max_blocks
+        self.tracker = BlockTracker()
+        self.frame_period_us = FRAME_PERIOD_US
+        self.idle_frames = IDLE_FRAMES
+        self.idle_timeout_us = int(IDLE_TIMEOUT * 1000000)
+        self.last_seen_us = None
+        self.tracking = False
+        self.frame = BlockFrame()
+        self._back = BlockFrame()
+        self.reset_poll_stats()
 
     def __str__(self):
         return "Pixy Camera Controller for EV3";
@@ -21,16 +86,169 @@ class Pixy2Camera(EventHandler, threading.Thread):
     def light(self, on):
         self.pixy.set_lamp(on,on)
 
-    # This is the main loop of handling PS4 controller events. It is run in a separate thread.
+    def poll(self):
+        """
+        Fetch one frame of blocks and fire block_detected if there are any.
+
+        Returns:
+            bool: True if blocks were detected
+        """
+        try:
+            nr_blocks, blocks = self.pixy.get_blocks(self.sigmap, self.max_blocks);
+        except Exception:
+            # Camera errors must not end the thread; Pixy2 counts them and
+            # skips the bus while the camera is not responding
+            self.errors += 1
+            return False
+        self._publish(blocks)
+        self.tracker.update(blocks)
+        if(nr_blocks >=1):
+            self.trigger("block_detected");
+        return nr_blocks >= 1
+
+    def _publish(self, blocks):
+        """Copy the driver's pooled blocks into the back buffer and swap it in"""
+        back = self._back
+        back.seq += 1
+        pool = back.pool
+        while len(pool) < len(blocks):
+            pool.append(Block())
+        out = back.blocks
+        out.clear()
+        for i in range(len(blocks)):
+            out.append(pool[i].copy_from(blocks[i]))
+        back.number = self.frame.number + 1
+        back.time_us = ticks_us()
+        back.seq += 1
+
+        self._back = self.frame
+        self.frame = back
+        self.blocks = out
+
+    def get_frame(self):
+        """
+        Get the latest published frame without copying.
+
+        The frame is reused two frames later, so a reader on another thread
+        must check that frame.seq did not change while it was reading
+        (or use snapshot()).
+
+        Returns:
+            BlockFrame: Latest frame
+        """
+        return self.frame
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the latest frame from any thread.
+
+        Returns:
+            tuple: (frame number, frame time in us, list of Block copies)
+        """
+        while True:
+            frame = self.frame
+            seq = frame.seq
+            if not seq & 1:
+                number = frame.number
+                time_us = frame.time_us
+                blocks = [Block().copy_from(block) for block in frame.blocks]
+                if frame.seq == seq:
+                    return number, time_us, blocks
+            # The camera thread is writing this frame: yield so it can finish
+            # (spinning would starve it on the single-core EV3)
+            sleep(0)
+
+    def next_poll(self, deadline_us, now_us, seen):
+        """
+        Schedule the next poll on the frame grid.
+
+        Args:
+            deadline_us: Time the poll that just finished was scheduled for
+            now_us: Time the poll finished
+            seen: True if the poll detected blocks
+
+        Returns:
+            int: Time of the next poll
+        """
+        if seen:
+            self.last_seen_us = now_us
+        self.tracking = (self.last_seen_us is not None and
+                         ticks_diff(now_us, self.last_seen_us) < self.idle_timeout_us)
+
+        frames = 1 if self.tracking else self.idle_frames
+        deadline_us += frames * self.frame_period_us
+        late_us = ticks_diff(now_us, deadline_us)
+        if late_us >= 0:
+            # The poll ran past the next slot: skip to the next free frame
+            self.overruns += 1
+            deadline_us += (late_us // self.frame_period_us + 1) * self.frame_period_us
+        return deadline_us
+
+    # This is the main loop of polling the camera. It is run in a separate thread.
     def run(self):
+        self.reset_poll_stats()
+        deadline = ticks_us()
         while not self.stopped:
-            nr_blocks, self.blocks = self.pixy.get_blocks(1,1);
-            if(nr_blocks >=1):
-                self.trigger("block_detected");
+            start = ticks_us()
+            seen = self.poll()
+            end = ticks_us()
+            self.polls += 1
+            self.busy_us += ticks_diff(end, start)
 
-            sleep(0.1)
+            deadline = self.next_poll(deadline, end, seen)
+            remaining = ticks_diff(deadline, ticks_us())
+            if remaining > 0:
+                sleep(remaining / 1000000)
 
+    def get_poll_stats(self):
+        """
+        Get polling statistics since the last reset.
 
+        Time spent polling splits into time on the I2C bus (bus_us) and
+        parsing plus callbacks (the rest of busy_us); the remaining wall
+        time is spent sleeping.
+
+        Returns:
+            dict: polls, achieved poll rate (Hz), time spent polling (us),
+                  time on the I2C bus (us), their shares of wall time,
+                  overruns, errors and tracking state
+        """
+        elapsed_us = ticks_diff(ticks_us(), self._stats_start_us)
+        bus_us = self.pixy.get_bus_time()
+        return {
+            "polls": self.polls,
+            "poll_rate": self.polls * 1000000 / elapsed_us if elapsed_us > 0 else 0.0,
+            "busy_us": self.busy_us,
+            "busy_share": self.busy_us / elapsed_us if elapsed_us > 0 else 0.0,
+            "bus_us": bus_us,
+            "bus_share": bus_us / elapsed_us if elapsed_us > 0 else 0.0,
+            "overruns": self.overruns,
+            "errors": self.errors,
+            "tracking": self.tracking,
+        }
+
+    def reset_poll_stats(self):
+        """Reset polling statistics (and the Pixy2 request statistics)"""
+        self.pixy.reset_request_stats()
+        self.polls = 0
+        self.busy_us = 0
+        self.overruns = 0
+        self._stats_start_us = ticks_us()
 
     def onBlockDetected(self, callback):
-        self.on("block_detected", callback)
\ No newline at end of file
+        self.on("block_detected", callback)
+
+    def onBlockAppeared(self, callback, sig=None):
+        self._on_tracker_event("appeared", callback, sig)
+
+    def onBlockMoved(self, callback, sig=None):
+        self._on_tracker_event("moved", callback, sig)
+
+    def onBlockDisappeared(self, callback, sig=None):
+        self._on_tracker_event("disappeared", callback, sig)
+
+    def _on_tracker_event(self, event, callback, sig):
+        """Register a tracker callback for all signatures or just sig"""
+        if sig is not None:
+            event = "{}_{}".format(event, sig)
+        self.tracker.on(event, callback)
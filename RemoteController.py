@@ -1,4 +1,6 @@
 from EventHandler import EventHandler
+from MotionQueue import parse_motion_sequence
+from ErrorReporter import report_exception
 import threading
 import struct
 import socket
@@ -12,6 +14,7 @@ class RemoteController(EventHandler, threading.Thread):
     l_forward = 0;
     r_left = 0;
     r_forward = 0;
+    motion_sequence = None;
 
     # Constructor
     def __init__(self):
@@ -70,6 +73,21 @@ class RemoteController(EventHandler, threading.Thread):
             self.trigger("backward");
         elif data == "Fire!":
             self.trigger("fire");
+        elif data.startswith("Motion!") or data.startswith("MotionNow!"):
+            # Whole motion sequence in one message, e.g. "Motion!drive:300:500;pivot:90:400"
+            preempt = data.startswith("MotionNow!")
+            try:
+                self.motion_sequence = parse_motion_sequence(data.split("!", 1)[1])
+            except ValueError as e:
+                report_exception("RemoteController.command_decode()", "motion sequence parsing", e, data)
+                self.trigger("unknown");
+                return
+            if preempt:
+                self.trigger("motion_preempt");
+            else:
+                self.trigger("motion_sequence");
+        elif data == "MotionFlush!":
+            self.trigger("motion_flush");
         else:
             self.trigger("unknown");
  
@@ -95,6 +113,15 @@ class RemoteController(EventHandler, threading.Thread):
     def onFire(self, callback):
         self.on("fire", callback)
 
+    def onMotionSequence(self, callback):
+        self.on("motion_sequence", callback)
+
+    def onMotionPreempt(self, callback):
+        self.on("motion_preempt", callback)
+
+    def onMotionFlush(self, callback):
+        self.on("motion_flush", callback)
+
     def onCameraLeft(self, callback):
         self.on("camera_left", callback)
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Steering end-stop calibration for CarDriveSystem
+
+The calibration sweeps the steering motor into both mechanical end-stops
+(stall detection), centers it between them and zeroes the encoder there,
+so steering angles are relative to straight ahead. The result is stored
+in a small text file on the brick; later boots load it instantly instead
+of sweeping again.
+
+A cached calibration assumes the steering is centered when the program
+starts (the encoder starts at zero on every boot), so the steering should
+be returned to center before the program exits (CarDriveSystem.center_steering).
+"""
+
+from pybricks.parameters import Stop
+from ErrorReporter import report_exception
+
+# Default calibration file on the brick (next to main.py)
+DEFAULT_CALIBRATION_FILE = "steering_calibration.txt"
+
+# Sweep parameters: slow and with limited duty so the end-stops are not hammered
+CALIBRATION_SPEED = 300
+CALIBRATION_DUTY_LIMIT = 40
+
+# Degrees kept clear of each end-stop
+END_STOP_MARGIN = 5
+
+
+class SteeringCalibration:
+    """
+    Steering range relative to the centered encoder angle.
+    """
+
+    def __init__(self, left_limit, right_limit):
+        """
+        Args:
+            left_limit: Encoder angle of the usable left end (negative)
+            right_limit: Encoder angle of the usable right end (positive)
+        """
+        self.left_limit = left_limit
+        self.right_limit = right_limit
+
+    @property
+    def half_range(self):
+        """Usable steering angle on each side of center"""
+        return min(-self.left_limit, self.right_limit)
+
+    def clamp(self, angle):
+        """
+        Clamp a steering angle to the calibrated range.
+
+        Args:
+            angle: Steering angle in degrees (negative = left)
+
+        Returns:
+            int: Angle inside [left_limit, right_limit]
+        """
+        return max(self.left_limit, min(self.right_limit, angle))
+
+    def save(self, path=DEFAULT_CALIBRATION_FILE):
+        """
+        Write the calibration to a small text file.
+
+        Returns:
+            bool: True if the file was written
+        """
+        try:
+            with open(path, "w") as f:
+                f.write("left_limit={}\n".format(self.left_limit))
+                f.write("right_limit={}\n".format(self.right_limit))
+            return True
+        except Exception as e:
+            report_exception("SteeringCalibration.save", "Writing calibration file", e, path)
+            return False
+
+    @classmethod
+    def load(cls, path=DEFAULT_CALIBRATION_FILE):
+        """
+        Read a calibration file written by save().
+
+        Returns:
+            SteeringCalibration or None if the file is missing or invalid
+        """
+        values = {}
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.strip().partition("=")
+                    if key:
+                        values[key] = int(value)
+        except OSError:
+            return None
+        except ValueError as e:
+            report_exception("SteeringCalibration.load", "Parsing calibration file", e, path)
+            return None
+
+        if "left_limit" not in values or "right_limit" not in values:
+            return None
+        if values["left_limit"] >= 0 or values["right_limit"] <= 0:
+            return None
+        return cls(values["left_limit"], values["right_limit"])
+
+
+def calibrate_steering(motor, speed=CALIBRATION_SPEED, duty_limit=CALIBRATION_DUTY_LIMIT):
+    """
+    Find both steering end-stops by stall detection and center the steering.
+
+    Leaves the steering centered with the encoder zeroed at center.
+
+    Args:
+        motor: Steering motor
+        speed: Sweep speed in deg/s
+        duty_limit: Duty limit (%) while pushing into the end-stops
+
+    Returns:
+        SteeringCalibration: Range relative to center
+    """
+    left_stop = motor.run_until_stalled(-speed, Stop.COAST, duty_limit)
+    right_stop = motor.run_until_stalled(speed, Stop.COAST, duty_limit)
+
+    center = (left_stop + right_stop) // 2
+    half_range = (right_stop - left_stop) // 2 - END_STOP_MARGIN
+
+    motor.run_target(speed, center, Stop.HOLD)
+    motor.reset_angle(0)
+
+    if __debug__:
+        print("Steering calibrated: end-stops {} / {}, half range {}".format(
+            left_stop, right_stop, half_range))
+
+    return SteeringCalibration(-half_range, half_range)
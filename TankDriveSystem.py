@@ -1,4 +1,11 @@
+import math
+import threading
 from DriveSystem import DriveSystem
+from DriveStatus import (TankDriveStatus, MODE_STOPPED, MODE_FORWARD, MODE_BACKWARD,
+                         MODE_TURNING, MODE_PIVOT, MODE_DRIFT, MODE_STEERING, MODE_MOTION)
+from MotionQueue import DRIVE, PIVOT, ARC
+from Odometry import WHEEL_DIAMETER_MM, TRACK_WIDTH_MM, FORWARD_DIRECTION
+from Timing import ticks_us, ticks_diff
 from time import sleep
 
 
@@ -29,6 +36,64 @@ class TankDriveSystem(DriveSystem):
         
         # Steering sensitivity for joystick control (1.0 = normal, 2.0 = aggressive)
         self.steering_sensitivity = 2.0
+        
+        # Share of the X-axis input mixed into the track speeds by joystick_control
+        self.turn_mix_factor = 0.8
+        
+        # Drive geometry used to turn motion primitives into encoder targets
+        self.wheel_diameter = WHEEL_DIAMETER_MM
+        self.track_width = TRACK_WIDTH_MM
+        
+        # Encoder targets of the motion primitive currently executing
+        self._motion_left_start = 0
+        self._motion_right_start = 0
+        self._motion_left_target = 0
+        self._motion_right_target = 0
+        self._motion_started_at = 0
+        self._motion_timeout_us = 0
+        self.motion_timeouts = 0
+        
+        # Live status record, updated in place whenever the commanded state changes
+        self.status = TankDriveStatus()
+        
+        # Pre-resolved motor objects used for paired (back to back) updates
+        self._left_motor = None
+        self._right_motor = None
+        self._motors_resolved = False
+        
+        # Left/right write skew instrumentation (microseconds)
+        self.last_skew_us = 0
+        self.max_skew_us = 0
+        self.skew_samples = 0
+        self._total_skew_us = 0
+        
+        # Last commanded track speeds (before any heading hold correction)
+        self.commanded_left_speed = 0
+        self.commanded_right_speed = 0
+        
+        # Command writes and heading hold writes are serialized; the generation
+        # changes with every command so a hold tick can tell that its base
+        # speed went stale while it was reading the encoders
+        self._command_lock = threading.Lock()
+        self._command_generation = 0
+        
+        # Optional heading hold: PI correction on the encoder difference
+        self.heading_hold_enabled = False
+        self.heading_hold_kp = 4.0           # Speed units per degree of encoder difference
+        self.heading_hold_ki = 2.0           # Speed units per degree-second
+        self.heading_hold_max_correction = 200
+        self._hold_reference_pending = False
+        self._hold_left_reference = 0
+        self._hold_right_reference = 0
+        self._hold_integral = 0.0
+        self._hold_last_tick = 0
+        self.heading_hold_error = 0
+        
+        # Heading hold controller cost per tick (microseconds)
+        self.hold_ticks = 0
+        self.last_hold_tick_us = 0
+        self.max_hold_tick_us = 0
+        self._total_hold_tick_us = 0
     
     def initialize(self):
         """
@@ -49,6 +114,8 @@ class TankDriveSystem(DriveSystem):
         
         # System is initialized if both motors are available
         self._is_initialized = len(available_devices) == 2
+        self.status.initialized = self._is_initialized
+        self.resolve_motors()
         
         if __debug__:
             print("TankDriveSystem initialized: {}".format(self._is_initialized))
@@ -66,11 +133,7 @@ class TankDriveSystem(DriveSystem):
         """
         validated_speed = self.validate_speed(speed)
         
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", -validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", -validated_speed)
+        self._run_motor_pair(-validated_speed, -validated_speed, MODE_FORWARD)
         
         if duration:
             sleep(duration)
@@ -86,11 +149,7 @@ class TankDriveSystem(DriveSystem):
         """
         validated_speed = self.validate_speed(speed)
         
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", validated_speed)
+        self._run_motor_pair(validated_speed, validated_speed, MODE_BACKWARD)
         
         if duration:
             sleep(duration)
@@ -110,11 +169,7 @@ class TankDriveSystem(DriveSystem):
         left_speed = validated_speed // 2   # Reverse left track for sharp turn
         right_speed = -validated_speed      # Forward right track
         
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", left_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", right_speed)
+        self._run_motor_pair(left_speed, right_speed, MODE_TURNING)
         
         if duration:
             sleep(duration)
@@ -134,11 +189,7 @@ class TankDriveSystem(DriveSystem):
         left_speed = -validated_speed       # Forward left track
         right_speed = validated_speed // 2  # Reverse right track for sharp turn
         
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", left_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", right_speed)
+        self._run_motor_pair(left_speed, right_speed, MODE_TURNING)
         
         if duration:
             sleep(duration)
@@ -178,21 +229,29 @@ class TankDriveSystem(DriveSystem):
             right_speed = int(base_speed * (1 + steer_factor))    # Reduce/reverse right speed
         
         # Apply speeds to motors
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", left_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", right_speed)
+        self._run_motor_pair(left_speed, right_speed, MODE_STEERING)
     
     def stop(self):
         """
         Stop all track movement immediately.
         """
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "stop")
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "stop")
+        if not self._motors_resolved:
+            self.resolve_motors()
+        
+        left_motor = self._left_motor
+        right_motor = self._right_motor
+        
+        with self._command_lock:
+            self.commanded_left_speed = 0
+            self.commanded_right_speed = 0
+            self._command_generation += 1
+            self._update_status(MODE_STOPPED, 0, 0)
+            
+            # Stop both tracks back to back so neither keeps driving alone
+            if left_motor is not None:
+                left_motor.stop()
+            if right_motor is not None:
+                right_motor.stop()
     
     def drift_left(self, speed):
         """
@@ -204,11 +263,7 @@ class TankDriveSystem(DriveSystem):
         validated_speed = self.validate_speed(speed, max_speed=self.drift_speed)
         
         # Left drift: left track backward, right track forward
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", -validated_speed)
+        self._run_motor_pair(validated_speed, -validated_speed, MODE_DRIFT)
     
     def drift_right(self, speed):
         """
@@ -220,39 +275,45 @@ class TankDriveSystem(DriveSystem):
         validated_speed = self.validate_speed(speed, max_speed=self.drift_speed)
         
         # Right drift: left track forward, right track backward
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", -validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", validated_speed)
+        self._run_motor_pair(-validated_speed, validated_speed, MODE_DRIFT)
     
     def get_status(self):
         """
         Get current status of the tank drive system.
         
+        Built from the incrementally updated status record, so no device
+        availability is re-queried. Use get_status_record() for
+        allocation-free reads at high rate.
+        
         Returns:
             dict: Dictionary containing status information
         """
-        status = {
-            "initialized": self._is_initialized,
+        status = self.status
+        return {
+            "initialized": status.initialized,
             "devices": {
-                "left_motor": self.is_device_available(self.left_motor_name),
-                "right_motor": self.is_device_available(self.right_motor_name)
+                "left_motor": status.left_motor,
+                "right_motor": status.right_motor
             },
             "drive_system_type": "tank_drive",
-            "available_operations": []
+            "available_operations": list(status.available_operations),
+            "mode": status.mode,
+            "left_speed": status.left_speed,
+            "right_speed": status.right_speed,
+            "heading_hold": status.heading_hold
         }
+    
+    def get_status_record(self):
+        """
+        Get the live status record without allocating.
         
-        # Determine available operations based on device availability
-        if status["devices"]["left_motor"] and status["devices"]["right_motor"]:
-            status["available_operations"].extend([
-                "move_forward", "move_backward", "turn_left", "turn_right",
-                "drift_left", "drift_right", "differential_steering"
-            ])
-        elif status["devices"]["left_motor"] or status["devices"]["right_motor"]:
-            status["available_operations"].append("limited_movement")
+        The record is updated in place; compare its seq with a previously
+        seen value to detect changes.
         
-        return status
+        Returns:
+            TankDriveStatus: The drive system's status record
+        """
+        return self.status
     
     def pivot_left(self, speed, duration=None):
         """
@@ -265,11 +326,7 @@ class TankDriveSystem(DriveSystem):
         validated_speed = self.validate_speed(speed)
         
         # Pivot left: left track backward, right track forward at same speed
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", -validated_speed)
+        self._run_motor_pair(validated_speed, -validated_speed, MODE_PIVOT)
         
         if duration:
             sleep(duration)
@@ -286,11 +343,7 @@ class TankDriveSystem(DriveSystem):
         validated_speed = self.validate_speed(speed)
         
         # Pivot right: left track forward, right track backward at same speed
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", -validated_speed)
-        
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", validated_speed)
+        self._run_motor_pair(-validated_speed, validated_speed, MODE_PIVOT)
         
         if duration:
             sleep(duration)
@@ -307,11 +360,377 @@ class TankDriveSystem(DriveSystem):
         validated_left_speed = self.validate_speed(left_speed)
         validated_right_speed = self.validate_speed(right_speed)
         
-        if self.is_device_available(self.left_motor_name):
-            self.safe_device_operation(self.left_motor_name, "run", validated_left_speed)
+        self._run_motor_pair(validated_left_speed, validated_right_speed, MODE_STEERING)
+    
+    def resolve_motors(self):
+        """
+        Look up both track motors once so paired updates need no per-call
+        availability checks or device lookups.
+        
+        Call again if the device manager's devices change after initialization.
+        """
+        if self.device_manager:
+            self._left_motor = self.device_manager.get_device(self.left_motor_name)
+            self._right_motor = self.device_manager.get_device(self.right_motor_name)
+        else:
+            self._left_motor = None
+            self._right_motor = None
+        self._motors_resolved = True
+        
+        status = self.status
+        status.left_motor = self._left_motor is not None
+        status.right_motor = self._right_motor is not None
+        if status.left_motor and status.right_motor:
+            status.available_operations = (
+                "move_forward", "move_backward", "turn_left", "turn_right",
+                "drift_left", "drift_right", "differential_steering"
+            )
+        elif status.left_motor or status.right_motor:
+            status.available_operations = ("limited_movement",)
+        else:
+            status.available_operations = ()
+        status.seq += 1
+    
+    def _run_motor_pair(self, left_speed, right_speed, mode):
+        """
+        Command both track speeds and write them as a pair.
+        
+        Records the commanded speeds for heading hold and the status record.
+        When a straight command
+        starts (or reverses direction), the encoder reference is re-taken on
+        the next drive tick so the command path itself never reads encoders.
+        
+        Args:
+            left_speed: Already validated speed for the left track motor
+            right_speed: Already validated speed for the right track motor
+            mode: Drive mode constant from DriveStatus for the status record
+        """
+        with self._command_lock:
+            if left_speed == right_speed and left_speed != 0:
+                previous = self.commanded_left_speed
+                was_straight = previous == self.commanded_right_speed and previous != 0
+                if not was_straight or (previous < 0) != (left_speed < 0):
+                    self._hold_reference_pending = True
+            
+            self.commanded_left_speed = left_speed
+            self.commanded_right_speed = right_speed
+            self._command_generation += 1
+            self._update_status(mode, left_speed, right_speed)
+            self._write_motor_pair(left_speed, right_speed)
+    
+    def _update_status(self, mode, left_speed, right_speed):
+        """
+        Update the status record in place, bumping seq only on real changes.
+        """
+        status = self.status
+        if status.mode != mode or status.left_speed != left_speed or status.right_speed != right_speed:
+            status.mode = mode
+            status.left_speed = left_speed
+            status.right_speed = right_speed
+            status.seq += 1
+    
+    def _write_motor_pair(self, left_speed, right_speed):
+        """
+        Write both track speeds back to back with nothing in between.
+        
+        Both motors are pre-resolved, so the only work between the two writes
+        is a timestamp. The gap between the start of the left and the start
+        of the right write is recorded as the left/right skew.
+        
+        Args:
+            left_speed: Already validated speed for the left track motor
+            right_speed: Already validated speed for the right track motor
+        """
+        if not self._motors_resolved:
+            self.resolve_motors()
         
-        if self.is_device_available(self.right_motor_name):
-            self.safe_device_operation(self.right_motor_name, "run", validated_right_speed)
+        left_motor = self._left_motor
+        right_motor = self._right_motor
+        
+        if left_motor is None or right_motor is None:
+            # Limited movement: nothing to pair, write whichever motor exists
+            if left_motor is not None:
+                left_motor.run(left_speed)
+            if right_motor is not None:
+                right_motor.run(right_speed)
+            return
+        
+        left_start = ticks_us()
+        left_motor.run(left_speed)
+        right_start = ticks_us()
+        right_motor.run(right_speed)
+        
+        skew = ticks_diff(right_start, left_start)
+        self.last_skew_us = skew
+        if skew > self.max_skew_us:
+            self.max_skew_us = skew
+        self._total_skew_us += skew
+        self.skew_samples += 1
+    
+    def get_skew_stats(self):
+        """
+        Get left/right write skew measured by paired motor updates.
+        
+        Returns:
+            dict: Last, maximum and average skew in microseconds and sample count
+        """
+        average = 0
+        if self.skew_samples:
+            average = self._total_skew_us / self.skew_samples
+        
+        return {
+            "last_us": self.last_skew_us,
+            "max_us": self.max_skew_us,
+            "avg_us": average,
+            "samples": self.skew_samples
+        }
+    
+    def reset_skew_stats(self):
+        """
+        Reset the left/right write skew statistics.
+        """
+        self.last_skew_us = 0
+        self.max_skew_us = 0
+        self.skew_samples = 0
+        self._total_skew_us = 0
+    
+    def enable_heading_hold(self, kp=None, ki=None, max_correction=None):
+        """
+        Enable closed-loop straight-line tracking.
+        
+        While both tracks are commanded to the same non-zero speed, every
+        drive tick compares how far each encoder has travelled since the
+        straight command started and trims the track speeds with a PI
+        controller so both tracks cover the same distance.
+        
+        Args:
+            kp: Optional proportional gain (speed units per encoder degree)
+            ki: Optional integral gain (speed units per encoder degree-second)
+            max_correction: Optional limit for the speed correction
+        """
+        if kp is not None:
+            self.heading_hold_kp = kp
+        if ki is not None:
+            self.heading_hold_ki = ki
+        if max_correction is not None:
+            self.heading_hold_max_correction = abs(max_correction)
+        self.heading_hold_enabled = True
+        self._hold_reference_pending = True
+        self.status.heading_hold = True
+        self.status.seq += 1
+    
+    def disable_heading_hold(self):
+        """
+        Disable heading hold and restore the uncorrected commanded speeds.
+        """
+        self.heading_hold_enabled = False
+        self.status.heading_hold = False
+        self.status.seq += 1
+        with self._command_lock:
+            left = self.commanded_left_speed
+            right = self.commanded_right_speed
+            if left == right and left != 0:
+                self._write_motor_pair(left, right)
+    
+    def drive_tick(self):
+        """
+        Run one heading hold control step.
+        
+        Called periodically by DriveLoop. Advances the motion queue first,
+        then applies heading hold if it is enabled and the current command
+        is straight.
+        """
+        super().drive_tick()
+        
+        if not self.heading_hold_enabled:
+            return
+        
+        generation = self._command_generation
+        base_speed = self.commanded_left_speed
+        if base_speed == 0 or base_speed != self.commanded_right_speed:
+            return
+        
+        left_motor = self._left_motor
+        right_motor = self._right_motor
+        if left_motor is None or right_motor is None:
+            return
+        
+        tick_start = ticks_us()
+        
+        left_angle = left_motor.angle()
+        right_angle = right_motor.angle()
+        
+        if self._hold_reference_pending:
+            self._hold_left_reference = left_angle
+            self._hold_right_reference = right_angle
+            self._hold_integral = 0.0
+            self._hold_last_tick = tick_start
+            self._hold_reference_pending = False
+            return
+        
+        # Positive error: left track has travelled further than the right track
+        # in the direction of travel (motor speeds carry the direction sign)
+        error = (left_angle - self._hold_left_reference) - (right_angle - self._hold_right_reference)
+        if base_speed < 0:
+            error = -error
+        
+        dt = ticks_diff(tick_start, self._hold_last_tick) / 1000000
+        self._hold_last_tick = tick_start
+        
+        limit = self.heading_hold_max_correction
+        ki = self.heading_hold_ki
+        if ki:
+            # Clamp the integral so it alone can never exceed the correction limit
+            self._hold_integral += error * dt
+            integral_limit = limit / ki
+            if self._hold_integral > integral_limit:
+                self._hold_integral = integral_limit
+            elif self._hold_integral < -integral_limit:
+                self._hold_integral = -integral_limit
+        
+        correction = self.heading_hold_kp * error + ki * self._hold_integral
+        if correction > limit:
+            correction = limit
+        elif correction < -limit:
+            correction = -limit
+        
+        # Slow the leading track and speed up the lagging one
+        if base_speed < 0:
+            correction = -correction
+        left_speed = self.validate_speed(int(base_speed - correction))
+        right_speed = self.validate_speed(int(base_speed + correction))
+        self.heading_hold_error = error
+        
+        with self._command_lock:
+            # A command issued during the encoder reads (e.g. stop()) wins
+            if generation != self._command_generation:
+                return
+            self._write_motor_pair(left_speed, right_speed)
+        
+        elapsed = ticks_diff(ticks_us(), tick_start)
+        self.last_hold_tick_us = elapsed
+        if elapsed > self.max_hold_tick_us:
+            self.max_hold_tick_us = elapsed
+        self._total_hold_tick_us += elapsed
+        self.hold_ticks += 1
+    
+    def begin_motion(self, primitive):
+        """
+        Start a DRIVE, PIVOT or ARC primitive from the motion queue.
+        
+        Converts the primitive into per-track encoder targets (in motor
+        degrees) and runs both tracks with speeds proportional to their path
+        lengths, so both tracks reach their targets at the same time.
+        
+        Args:
+            primitive: MotionPrimitive to start
+        """
+        degrees_per_mm = 360.0 / (math.pi * self.wheel_diameter)
+        half_track = self.track_width / 2.0
+        speed = abs(self.validate_speed(primitive.speed))
+        
+        # Signed track path lengths in mm, positive = forward
+        if primitive.kind == DRIVE:
+            left_path = primitive.distance
+            right_path = primitive.distance
+        elif primitive.kind == PIVOT:
+            turn = math.radians(primitive.angle) * half_track
+            left_path = -turn
+            right_path = turn
+        elif primitive.kind == ARC:
+            turn = math.radians(abs(primitive.angle))
+            inner_path = (primitive.distance - half_track) * turn
+            outer_path = (primitive.distance + half_track) * turn
+            if primitive.angle >= 0:
+                left_path, right_path = inner_path, outer_path
+            else:
+                left_path, right_path = outer_path, inner_path
+            if primitive.speed < 0:
+                left_path, right_path = -left_path, -right_path
+        else:
+            left_path = 0
+            right_path = 0
+        
+        longest = max(abs(left_path), abs(right_path))
+        if longest == 0 or speed == 0:
+            self._motion_left_target = 0
+            self._motion_right_target = 0
+            return
+        
+        left_speed = int(FORWARD_DIRECTION * speed * left_path / longest)
+        right_speed = int(FORWARD_DIRECTION * speed * right_path / longest)
+        
+        self._motion_left_target = abs(left_path) * degrees_per_mm
+        self._motion_right_target = abs(right_path) * degrees_per_mm
+        
+        # Allow three times the nominal duration before giving up on a stalled track
+        nominal_us = longest * degrees_per_mm / speed * 1000000
+        self._motion_timeout_us = int(nominal_us * 3) + 1000000
+        self._motion_started_at = ticks_us()
+        
+        if not self._motors_resolved:
+            self.resolve_motors()
+        if self._left_motor is not None:
+            self._motion_left_start = self._left_motor.angle()
+        if self._right_motor is not None:
+            self._motion_right_start = self._right_motor.angle()
+        
+        self._run_motor_pair(left_speed, right_speed, MODE_MOTION)
+    
+    def motion_complete(self, primitive):
+        """
+        Check whether the running primitive has reached its encoder target.
+        
+        The track with the longer path decides completion. A primitive that
+        runs far beyond its nominal duration (e.g. a stalled track) is
+        abandoned so the queue cannot hang.
+        
+        Args:
+            primitive: MotionPrimitive currently executing
+            
+        Returns:
+            bool: True once the target is reached
+        """
+        if self._motion_left_target >= self._motion_right_target:
+            motor = self._left_motor
+            start = self._motion_left_start
+            target = self._motion_left_target
+        else:
+            motor = self._right_motor
+            start = self._motion_right_start
+            target = self._motion_right_target
+        
+        if motor is None or target == 0:
+            return True
+        
+        if abs(motor.angle() - start) >= target:
+            return True
+        
+        if ticks_diff(ticks_us(), self._motion_started_at) > self._motion_timeout_us:
+            self.motion_timeouts += 1
+            return True
+        return False
+    
+    def get_heading_hold_stats(self):
+        """
+        Get heading hold controller state and per-tick CPU cost.
+        
+        Returns:
+            dict: Enabled flag, last encoder error, tick count and the last,
+                  maximum and average tick duration in microseconds
+        """
+        average = 0
+        if self.hold_ticks:
+            average = self._total_hold_tick_us / self.hold_ticks
+        
+        return {
+            "enabled": self.heading_hold_enabled,
+            "error": self.heading_hold_error,
+            "ticks": self.hold_ticks,
+            "last_tick_us": self.last_hold_tick_us,
+            "max_tick_us": self.max_hold_tick_us,
+            "avg_tick_us": average
+        }
     
     def joystick_control(self, forward_speed, turn_speed):
         """
@@ -332,10 +751,7 @@ class TankDriveSystem(DriveSystem):
         if forward_speed == 0 and turn_speed == 0:
             self.stop()
             # Force hard stop by setting motor speeds to 0 explicitly
-            if self.is_device_available(self.left_motor_name):
-                self.safe_device_operation(self.left_motor_name, "run", 0)
-            if self.is_device_available(self.right_motor_name): 
-                self.safe_device_operation(self.right_motor_name, "run", 0)
+            self._run_motor_pair(0, 0, MODE_STOPPED)
             return
         
         # Calculate base motor speeds from forward input
@@ -345,7 +761,7 @@ class TankDriveSystem(DriveSystem):
         
         # Add turning component
         # For tank drive: turn by making one side faster/slower
-        turn_factor = turn_speed * 0.8  # Scale turning for better control
+        turn_factor = turn_speed * self.turn_mix_factor  # Scale turning for better control
         
         left_speed = base_left - turn_factor   # Left motor: subtract for right turn
         right_speed = base_right + turn_factor # Right motor: add for right turn
@@ -0,0 +1,22 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Microsecond timing helpers for EV3 MicroPython
+
+MicroPython provides time.ticks_us()/time.ticks_diff() for cheap, wrap-safe
+timing. Desktop CPython (used by the test suite and offline tools) does not,
+so this module falls back to time.perf_counter() with the same interface.
+"""
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter
+
+    def ticks_us():
+        """Return a monotonic timestamp in microseconds."""
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        """Return the signed difference end - start in microseconds."""
+        return end - start
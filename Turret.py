@@ -3,8 +3,24 @@
 from pybricks.ev3devices import Motor
 from pybricks.parameters import Port, Stop, Direction
 from pybricks.tools import wait
+import math
+import threading
 from DriveSystem import DriveSystem
+from DriveStatus import TurretStatus, MODE_HOLDING, MODE_SPEED, MODE_POSITION, MODE_AIMING
 from ErrorReporter import report_device_error, report_exception
+from Timing import ticks_us, ticks_diff
+
+# Speed mode slows down within this many degrees of a soft limit
+LIMIT_SLOWDOWN_ZONE = 20
+
+# Slowest speed (degrees/second) while approaching a soft limit
+MIN_LIMIT_SPEED = 30
+
+# Aim mode: stick deflection needed to set a heading, minimum time between
+# target updates, and smallest target change worth sending
+AIM_DEADZONE = 60
+AIM_UPDATE_INTERVAL_US = 50000
+AIM_THRESHOLD = 2
 
 
 class Turret(DriveSystem):
@@ -22,9 +38,43 @@ class Turret(DriveSystem):
         self.center_position = 0  # Center/home position
         self.max_speed = 360  # Maximum rotation speed in degrees/second
         
+        # Encoder angle sampled by drive_tick() in the drive loop, so speed mode
+        # can enforce the soft limits without reading the motor on every event
+        self.cached_angle = 0
+        self.requested_speed = 0  # Speed asked for before soft limiting
+        
+        # Commanded motor state (None = unknown, 0 = holding, else running speed);
+        # the motor is only commanded when this changes
+        self.commanded_speed = None
+        self.last_x_axis = None
+        self.motor_commands = 0
+        
+        # Commands and drive_tick() motor writes are serialized; the generation
+        # changes with every command so a tick can tell that the speed it read
+        # went stale while it was reading the encoder
+        self._command_lock = threading.Lock()
+        self._command_generation = 0
+        
+        # Speed mode deadzone with hysteresis: the stick must leave deadzone to
+        # start rotating and fall below deadzone_exit to stop again
+        self.deadzone = 50
+        self.deadzone_exit = 40
+        
+        # Absolute aim mode: the right stick direction selects a turret heading
+        self.aim_mode = False
+        self.aim_target = None
+        self._aim_pending = None
+        self._aim_last_us = None
+        
+        # Live status record, updated in place whenever the commanded state changes
+        self.status = TurretStatus()
+        self.status.min_angle = self.min_angle
+        self.status.max_angle = self.max_angle
+        
         # Get turret motor from device manager
         if device_manager.is_device_available("turret_motor"):
             self.turret_motor = device_manager.get_device("turret_motor")
+            self.status.available = True
             print("Turret motor initialized")
             # Reset motor position to center
             self.home_turret()
@@ -38,6 +88,7 @@ class Turret(DriveSystem):
                 # Reset the motor angle to 0 at current position
                 self.turret_motor.reset_angle(0)
                 self.current_target_angle = 0
+                self.cached_angle = 0
                 print("Turret homed to center position")
             except Exception as e:
                 report_device_error("turret_motor", "home_turret", e, "reset_angle(0)")
@@ -73,18 +124,31 @@ class Turret(DriveSystem):
         - Positive values rotate right
         - Magnitude determines speed
         y_axis: -100 to 100 (up/down joystick movement, currently unused)
+        
+        The motor is only commanded when the resulting command changes, so
+        repeated events (e.g. Y-axis only changes) cost no motor traffic.
         """
         if not self.turret_motor:
             return
         
-        # Apply aggressive deadzone to prevent jitter and ensure reliable stop
-        LARGE_DEADZONE = 50  # Much larger deadzone for reliable stop detection
-        if abs(x_axis) < LARGE_DEADZONE:
+        with self._command_lock:
+            self._speed_control(x_axis)
+    
+    def _speed_control(self, x_axis):
+        """speed_control() body (call with the command lock held)"""
+        # Right stick events fire on every axis change; only X matters here
+        if x_axis == self.last_x_axis:
+            return
+        self.last_x_axis = x_axis
+        self._command_generation += 1
+        
+        # Apply aggressive deadzone to prevent jitter and ensure reliable stop,
+        # with hysteresis so a stick resting on the edge does not toggle
+        threshold = self.deadzone_exit if self.requested_speed else self.deadzone
+        if abs(x_axis) < threshold:
             # Stop turret when joystick is centered or near center
-            try:
-                self.turret_motor.stop(Stop.HOLD)
-            except Exception as e:
-                report_device_error("turret_motor", "speed_control_stop", e, "stop(Stop.HOLD)")
+            self.requested_speed = 0
+            self._hold("speed_control_stop")
             return
         
         # Scale joystick input to motor speed
@@ -94,11 +158,196 @@ class Turret(DriveSystem):
         # Clamp speed to safe range
         speed = max(-self.max_speed, min(self.max_speed, speed))
         
+        self.requested_speed = speed
+        self._run_limited(speed, "speed_control_run")
+    
+    def run_speed(self, speed):
+        """
+        Run the turret at a speed in degrees/second (used by automatic tracking).
+        speed: clamped to +/- max_speed, 0 holds position
+        """
+        if not self.turret_motor:
+            return
+        
+        speed = max(-self.max_speed, min(self.max_speed, int(speed)))
+        with self._command_lock:
+            self._command_generation += 1
+            if speed == 0:
+                self._stop_motor("stop")
+                return
+            
+            self.requested_speed = speed
+            self._run_limited(speed, "run_speed")
+    
+    def limit_speed(self, speed):
+        """
+        Apply the soft limits to a speed using the cached encoder angle.
+        Moving toward a limit slows down linearly inside LIMIT_SLOWDOWN_ZONE
+        and stops at the limit; moving away is never restricted.
+        """
+        if speed > 0:
+            remaining = self.max_angle - self.cached_angle
+        elif speed < 0:
+            remaining = self.cached_angle - self.min_angle
+        else:
+            return 0
+        
+        if remaining <= 0:
+            return 0
+        if remaining < LIMIT_SLOWDOWN_ZONE:
+            allowed = max(MIN_LIMIT_SPEED, int(self.max_speed * remaining / LIMIT_SLOWDOWN_ZONE))
+            if abs(speed) > allowed:
+                return allowed if speed > 0 else -allowed
+        return speed
+    
+    def _hold(self, operation):
+        """Hold position unless already holding"""
+        if self.commanded_speed == 0:
+            return
+        
+        try:
+            self.turret_motor.stop(Stop.HOLD)
+        except Exception as e:
+            report_device_error("turret_motor", operation, e, "stop(Stop.HOLD)")
+        self.commanded_speed = 0
+        self.motor_commands += 1
+        self._update_status(MODE_HOLDING, 0)
+    
+    def _run_limited(self, speed, operation):
+        """Run at the soft-limited speed, holding position at a limit"""
+        limited = self.limit_speed(speed)
+        if limited == 0:
+            self._hold(operation)
+            return
+        if limited == self.commanded_speed:
+            return
+        
         try:
             # Use run() for continuous rotation at specified speed
-            self.turret_motor.run(speed)
+            self.turret_motor.run(limited)
+        except Exception as e:
+            report_device_error("turret_motor", operation, e, "run({})".format(limited))
+        self.commanded_speed = limited
+        self.motor_commands += 1
+        self._update_status(MODE_SPEED, limited)
+    
+    def drive_tick(self):
+        """
+        Sample the encoder angle once per control tick (called by DriveLoop).
+        While running in speed mode the soft limits are re-applied, so a held
+        stick that sends no new events still slows and stops at the limit.
+        In aim mode a target held back by the rate limit is sent here.
+        """
+        if not self.turret_motor:
+            return
+        
+        generation = self._command_generation
+        try:
+            self.cached_angle = self.turret_motor.angle()
         except Exception as e:
-            report_device_error("turret_motor", "speed_control_run", e, "run({})".format(speed))
+            report_device_error("turret_motor", "drive_tick", e, "angle()")
+            return
+        
+        with self._command_lock:
+            # A command issued during the encoder read (e.g. a stop) wins
+            if generation != self._command_generation:
+                return
+            if self.aim_mode:
+                self._apply_aim(ticks_us())
+            elif self.requested_speed:
+                self._run_limited(self.requested_speed, "drive_tick")
+    
+    def stick_active(self, x_axis, y_axis):
+        """
+        Check if a stick position is outside the deadzone of the current mode
+        (speed mode uses the same hysteresis as speed_control()).
+        """
+        if self.aim_mode:
+            return x_axis * x_axis + y_axis * y_axis >= AIM_DEADZONE * AIM_DEADZONE
+        threshold = self.deadzone_exit if self.requested_speed else self.deadzone
+        return abs(x_axis) >= threshold
+    
+    def set_aim_mode(self, enabled):
+        """
+        Switch between speed mode and absolute aim mode.
+        The turret holds its position when the mode changes.
+        """
+        self.aim_mode = enabled
+        self.aim_target = None
+        self._aim_pending = None
+        self.stop()
+    
+    def toggle_aim_mode(self):
+        """Toggle absolute aim mode, returns the new mode"""
+        self.set_aim_mode(not self.aim_mode)
+        return self.aim_mode
+    
+    def stick_to_heading(self, x_axis, y_axis):
+        """
+        Convert a stick direction to a heading in degrees.
+        Straight up is 0; positive x_axis gives positive (same direction as
+        speed mode) headings, range -180 to 180.
+        """
+        return math.degrees(math.atan2(x_axis, y_axis))
+    
+    def nearest_heading(self, heading):
+        """
+        Pick the equivalent of heading (+/- n * 360) closest to the current
+        angle, clamped to the angle limits, so the turret takes the shortest path
+        """
+        heading += 360 * round((self.cached_angle - heading) / 360.0)
+        return max(self.min_angle, min(self.max_angle, heading))
+    
+    def aim_control(self, x_axis, y_axis, now_us=None):
+        """
+        Aim the turret where the stick points (absolute aim mode).
+        x_axis, y_axis: -100 to 100 stick position
+        
+        A stick inside AIM_DEADZONE keeps the last heading. Target updates are
+        rate limited to one per AIM_UPDATE_INTERVAL_US; a newer target that
+        arrives in between is applied by drive_tick().
+        """
+        if not self.turret_motor:
+            return
+        if x_axis * x_axis + y_axis * y_axis < AIM_DEADZONE * AIM_DEADZONE:
+            return
+        
+        if now_us is None:
+            now_us = ticks_us()
+        with self._command_lock:
+            self._command_generation += 1
+            # Only the stick position is stored; the heading is worked out when
+            # the rate limit lets the target through
+            self._aim_pending = (x_axis, y_axis)
+            self._apply_aim(now_us)
+    
+    def _apply_aim(self, now_us):
+        """
+        Send the pending aim target if the update interval has passed
+        (call with the command lock held)
+        """
+        pending = self._aim_pending
+        if pending is None:
+            return
+        if self._aim_last_us is not None and ticks_diff(now_us, self._aim_last_us) < AIM_UPDATE_INTERVAL_US:
+            return
+        
+        self._aim_pending = None
+        target = self.nearest_heading(self.stick_to_heading(pending[0], pending[1]))
+        if self.aim_target is not None and abs(target - self.aim_target) <= AIM_THRESHOLD:
+            return
+        
+        target = int(target)
+        try:
+            self.turret_motor.run_target(self.max_speed, target, Stop.HOLD, wait=False)
+        except Exception as e:
+            report_device_error("turret_motor", "aim_control", e, "run_target({}, {}, Stop.HOLD, wait=False)".format(self.max_speed, target))
+        self.aim_target = target
+        self._aim_last_us = now_us
+        self.requested_speed = 0
+        self.commanded_speed = None
+        self.motor_commands += 1
+        self._update_status(MODE_AIMING, 0, target)
     
     def scale_joystick_to_angle(self, joystick_value):
         """
@@ -127,12 +376,23 @@ class Turret(DriveSystem):
         # Clamp target angle to safe range
         target_angle = max(self.min_angle, min(self.max_angle, target_angle))
         
-        try:
-            # Use run_target for precise positioning
-            # Speed of 200 degrees/second, with smooth stop
-            self.turret_motor.run_target(200, target_angle, Stop.HOLD, wait=False)
-        except Exception as e:
-            report_device_error("turret_motor", "move_to_angle", e, "run_target(200, {}, Stop.HOLD, wait=False)".format(target_angle))
+        with self._command_lock:
+            self._command_generation += 1
+            self.requested_speed = 0
+            self.commanded_speed = None
+            self.last_x_axis = None
+            
+            try:
+                # Use run_target for precise positioning
+                # Speed of 200 degrees/second, with smooth stop
+                self.turret_motor.run_target(200, target_angle, Stop.HOLD, wait=False)
+            except Exception as e:
+                report_device_error("turret_motor", "move_to_angle", e, "run_target(200, {}, Stop.HOLD, wait=False)".format(target_angle))
+            self._update_status(MODE_POSITION, 0, target_angle)
+    
+    def get_cached_angle(self):
+        """Get the turret angle sampled on the last drive_tick() (no hardware read)"""
+        return self.cached_angle
     
     def get_current_angle(self):
         """Get current turret angle"""
@@ -147,15 +407,66 @@ class Turret(DriveSystem):
     def stop(self):
         """Stop turret movement and hold position"""
         if self.turret_motor:
-            try:
-                self.turret_motor.stop(Stop.HOLD)
-            except Exception as e:
-                report_device_error("turret_motor", "stop", e, "stop(Stop.HOLD)")
+            with self._command_lock:
+                self._command_generation += 1
+                self._stop_motor("stop")
+    
+    def _stop_motor(self, operation):
+        """Hold position unconditionally (call with the command lock held)"""
+        self.requested_speed = 0
+        self.last_x_axis = None
+        try:
+            self.turret_motor.stop(Stop.HOLD)
+        except Exception as e:
+            report_device_error("turret_motor", operation, e, "stop(Stop.HOLD)")
+        self.commanded_speed = 0
+        self.motor_commands += 1
+        self._update_status(MODE_HOLDING, 0)
+    
+    def get_status(self):
+        """
+        Get current status of the turret from its status record.
+        
+        Returns:
+            dict: Dictionary containing status information
+        """
+        status = self.status
+        return {
+            "available": status.available,
+            "mode": status.mode,
+            "speed": status.speed,
+            "target_angle": status.target_angle,
+            "min_angle": status.min_angle,
+            "max_angle": status.max_angle
+        }
+    
+    def get_status_record(self):
+        """
+        Get the live status record without allocating.
+        
+        The record is updated in place; compare its seq with a previously
+        seen value to detect changes.
+        """
+        return self.status
+    
+    def _update_status(self, mode, speed, target_angle=None):
+        """Update the status record in place, bumping seq only on real changes"""
+        status = self.status
+        if target_angle is None:
+            target_angle = status.target_angle
+        if status.mode != mode or status.speed != speed or status.target_angle != target_angle:
+            status.mode = mode
+            status.speed = speed
+            status.target_angle = target_angle
+            status.seq += 1
     
     def set_angle_limits(self, min_angle, max_angle):
         """Set the movement limits for the turret"""
         self.min_angle = min_angle
         self.max_angle = max_angle
+        self.status.min_angle = min_angle
+        self.status.max_angle = max_angle
+        self.status.seq += 1
         print("Turret angle limits set to " + str(min_angle) + "° to " + str(max_angle) + "°")
     
     def set_max_speed(self, max_speed):
@@ -0,0 +1,288 @@
+#!/usr/bin/env pybricks-micropython
+
+"""
+Predictive turret tracking of Pixy2 color blocks
+
+The camera reports blocks at about 10 Hz; the turret is controlled at the
+drive loop rate. Each block (identified by its Pixy2 tracking_index) gets an
+alpha-beta filter estimating the target bearing and bearing rate, so between
+camera frames the turret is driven toward where the target is predicted to
+be rather than where it was last seen.
+
+Bearings are in turret degrees (positive = right): the turret angle when
+the frame arrived plus the block's offset from the image center. This keeps
+the estimate valid while the turret itself is moving. The turret angle is
+the one cached by Turret.drive_tick(), so the turret must be registered
+with the same DriveLoop (before the tracker).
+
+Manual stick input takes precedence: while the stick is held outside the
+deadzone, and for MANUAL_HOLDOFF seconds after it was released, no target
+is acquired and the turret is left to the operator.
+"""
+
+import threading
+from Timing import ticks_us, ticks_diff
+
+# Pixy2 color-connected-components frame: 316 px wide, ~60 degree field of view
+FRAME_CENTER_X = 158
+DEGREES_PER_PIXEL = 60.0 / 316
+
+# Filter gains: alpha weighs position residuals, beta velocity residuals
+DEFAULT_ALPHA = 0.5
+DEFAULT_BETA = 0.2
+
+# Proportional gain (deg/s per degree of predicted error)
+DEFAULT_KP = 3.0
+
+# A target not seen for this long (seconds) is dropped
+LOST_TIMEOUT = 0.5
+
+# Tracking resumes this long (seconds) after the last manual turret input
+MANUAL_HOLDOFF = 1.0
+
+# Blocks smaller than this in both dimensions are ignored (as in main.blockDetected)
+MIN_BLOCK_SIZE = 10
+
+
+class TargetFilter:
+    """ Alpha-beta estimate of one target's bearing."""
+    __slots__ = ("position", "velocity", "last_us", "updates")
+
+    def __init__(self, position, now_us):
+        self.position = position
+        self.velocity = 0.0
+        self.last_us = now_us
+        self.updates = 1
+
+    def predict(self, now_us):
+        """Predicted bearing at now_us"""
+        return self.position + self.velocity * ticks_diff(now_us, self.last_us) / 1000000
+
+    def update(self, measured, now_us, alpha, beta):
+        """
+        Correct the estimate with a new bearing measurement.
+
+        Returns:
+            float: Residual between the measurement and the prediction
+        """
+        dt = ticks_diff(now_us, self.last_us) / 1000000
+        if dt <= 0:
+            self.position = measured
+            return 0.0
+        predicted = self.position + self.velocity * dt
+        residual = measured - predicted
+        self.position = predicted + alpha * residual
+        self.velocity += beta * residual / dt
+        self.last_us = now_us
+        self.updates += 1
+        return residual
+
+
+class TurretTracker:
+    """
+    Drives a Turret toward the predicted position of a Pixy2 block.
+
+    update_blocks() is called from the camera thread with each new frame;
+    drive_tick() is called at the control rate (register with DriveLoop).
+    """
+
+    def __init__(self, turret, alpha=DEFAULT_ALPHA, beta=DEFAULT_BETA, kp=DEFAULT_KP,
+                 degrees_per_pixel=DEGREES_PER_PIXEL, center_x=FRAME_CENTER_X,
+                 lost_timeout=LOST_TIMEOUT, manual_holdoff=MANUAL_HOLDOFF):
+        """
+        Initialize the tracker.
+
+        Args:
+            turret: Turret to drive
+            alpha: Position gain of the alpha-beta filter (0..1)
+            beta: Velocity gain of the alpha-beta filter (0..2)
+            kp: Proportional gain on the predicted bearing error
+            degrees_per_pixel: Camera angular resolution
+            center_x: Image column that corresponds to the turret heading
+            lost_timeout: Seconds without detections before a target is dropped
+            manual_holdoff: Seconds after manual input before tracking resumes
+        """
+        self.turret = turret
+        self.alpha = alpha
+        self.beta = beta
+        self.kp = kp
+        self.degrees_per_pixel = degrees_per_pixel
+        self.center_x = center_x
+        self.lost_timeout_us = int(lost_timeout * 1000000)
+        self.manual_holdoff_us = int(manual_holdoff * 1000000)
+
+        self._lock = threading.Lock()
+        self._filters = {}
+        self.target_index = None
+        self.tracking = False
+
+        # Manual override: stick held outside the deadzone, or hold-off end time
+        self._manual_held = False
+        self._manual_until_us = None
+
+        # Tracking error statistics
+        self.frames = 0
+        self.ticks = 0
+        self.max_error = 0.0
+        self._error_sq_sum = 0.0
+        self._residual_sq_sum = 0.0
+        self._residual_samples = 0
+
+    def update_blocks(self, blocks, now_us=None):
+        """
+        Feed one camera frame of detected blocks.
+
+        Args:
+            blocks: Blocks from Pixy2.get_blocks()
+            now_us: Frame time (defaults to now)
+        """
+        if now_us is None:
+            now_us = ticks_us()
+        turret_angle = self.turret.get_cached_angle()
+
+        with self._lock:
+            self.frames += 1
+            best_index = None
+            best_area = 0
+            for block in blocks:
+                if block.width <= MIN_BLOCK_SIZE and block.height <= MIN_BLOCK_SIZE:
+                    continue
+                bearing = turret_angle + (block.x_center - self.center_x) * self.degrees_per_pixel
+                target = self._filters.get(block.tracking_index)
+                if target is None:
+                    self._filters[block.tracking_index] = TargetFilter(bearing, now_us)
+                else:
+                    residual = target.update(bearing, now_us, self.alpha, self.beta)
+                    self._residual_sq_sum += residual * residual
+                    self._residual_samples += 1
+                area = block.width * block.height
+                if area > best_area:
+                    best_index = block.tracking_index
+                    best_area = area
+
+            self._prune(now_us)
+            if self._manual_active(now_us):
+                # Keep the estimates warm but leave the turret to the operator
+                self.target_index = None
+            elif self.target_index not in self._filters:
+                # Stay on the current target while it is visible, else take the largest block
+                self.target_index = best_index
+
+    def _prune(self, now_us):
+        """Drop targets not seen for lost_timeout (call with the lock held)"""
+        for index in list(self._filters):
+            if ticks_diff(now_us, self._filters[index].last_us) > self.lost_timeout_us:
+                del self._filters[index]
+
+    def _manual_active(self, now_us):
+        """True while manual input holds off tracking (call with the lock held)"""
+        if self._manual_held:
+            return True
+        return self._manual_until_us is not None and ticks_diff(self._manual_until_us, now_us) > 0
+
+    def manual_input(self, active, now_us=None):
+        """
+        Report manual turret stick input.
+
+        A held stick sends no further events, so the override lasts from the
+        first active input until MANUAL_HOLDOFF after the stick returned to
+        the deadzone. The turret is not stopped: the operator's command
+        replaces the tracker's.
+
+        Args:
+            active: True if the stick is outside the deadzone
+            now_us: Input time (defaults to now)
+        """
+        if now_us is None:
+            now_us = ticks_us()
+        with self._lock:
+            if active:
+                self._manual_held = True
+                self.target_index = None
+                self.tracking = False
+            elif self._manual_held:
+                self._manual_held = False
+                self._manual_until_us = now_us + self.manual_holdoff_us
+
+    def drive_tick(self, now_us=None):
+        """Steer the turret toward the predicted target bearing"""
+        if now_us is None:
+            now_us = ticks_us()
+
+        with self._lock:
+            if self._manual_active(now_us):
+                return
+            target = self._filters.get(self.target_index)
+            if target is not None and ticks_diff(now_us, target.last_us) > self.lost_timeout_us:
+                del self._filters[self.target_index]
+                target = None
+            if target is None:
+                predicted = None
+            else:
+                predicted = target.predict(now_us)
+                velocity = target.velocity
+
+        turret = self.turret
+        if predicted is None:
+            if self.tracking:
+                self.tracking = False
+                self.target_index = None
+                turret.stop()
+            return
+
+        predicted = max(turret.min_angle, min(turret.max_angle, predicted))
+        error = predicted - turret.get_cached_angle()
+        speed = int(velocity + self.kp * error)
+        turret.run_speed(speed)
+        self.tracking = True
+
+        self.ticks += 1
+        self._error_sq_sum += error * error
+        if abs(error) > self.max_error:
+            self.max_error = abs(error)
+
+    def clear(self):
+        """Forget all targets (e.g. when the user takes manual control)"""
+        with self._lock:
+            self._filters.clear()
+            self.target_index = None
+        self.tracking = False
+
+    def get_target(self):
+        """
+        Get the current target estimate.
+
+        Returns:
+            tuple: (tracking_index, bearing, bearing rate) or None
+        """
+        with self._lock:
+            target = self._filters.get(self.target_index)
+            if target is None:
+                return None
+            return self.target_index, target.predict(ticks_us()), target.velocity
+
+    def get_tracking_stats(self):
+        """
+        Get tracking error statistics.
+
+        Returns:
+            dict: frames, ticks, rms/max bearing error at control ticks (degrees)
+                  and rms prediction residual at camera frames (degrees)
+        """
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "rms_error": (self._error_sq_sum / self.ticks) ** 0.5 if self.ticks else 0.0,
+            "max_error": self.max_error,
+            "rms_residual": ((self._residual_sq_sum / self._residual_samples) ** 0.5
+                             if self._residual_samples else 0.0),
+        }
+
+    def reset_tracking_stats(self):
+        """Reset tracking error statistics"""
+        self.frames = 0
+        self.ticks = 0
+        self.max_error = 0.0
+        self._error_sq_sum = 0.0
+        self._residual_sq_sum = 0.0
+        self._residual_samples = 0
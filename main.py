@@ -32,6 +32,9 @@ from DeviceManager import DeviceManager
 from RemoteController import RemoteController
 from TankDriveSystem import TankDriveSystem
 from Turret import Turret
+from TurretTracker import TurretTracker
+from Odometry import Odometry
+from DriveLoop import DriveLoop
 from pybricks.parameters import (Port, Stop, Direction, Button, Color,
                                  SoundFile, ImageFile, Align)
 
@@ -39,7 +42,6 @@ from pybricks.ev3devices import (Motor, TouchSensor, ColorSensor,
                                  InfraredSensor, UltrasonicSensor, GyroSensor)
 
 import sys
-import math
 from time import sleep
 
 
@@ -69,9 +71,23 @@ us_sensor = device_manager.try_init_device(UltrasonicSensor, Port.S2, "us_sensor
 tank_drive_system = TankDriveSystem(device_manager)
 tank_drive_system.initialize()
 
+# Initialize encoder odometry (pose is read via odometry.get_pose())
+odometry = Odometry(device_manager)
+
+# Closed-loop drive control. Heading hold (keeps straight commands straight)
+# is optional and off by default; R2 toggles it
+drive_loop = DriveLoop()
+drive_loop.add(tank_drive_system)
+
 # Initialize turret system
 turret = Turret(device_manager)
 
+# Turret samples its encoder in the drive loop to enforce soft limits in speed mode
+drive_loop.add(turret)
+
+# Camera-driven turret tracking (runs in the drive loop when the camera is available)
+turret_tracker = TurretTracker(turret)
+
 # Print device status
 device_manager.print_device_status()
 
@@ -118,9 +134,6 @@ def test_device_management():
 # Uncomment the line below to run device management tests
 # test_device_management()
 
-# Global variable for tracking turret angle
-last_angle = 0
-
 
 
 def lightoff(value):
@@ -160,41 +173,67 @@ def quit(value):
     # Stop turret and hold position
     if turret:
         turret.stop()
+    odometry.stop()
+    drive_loop.stop()
     device_manager.cleanup()
     value.stop()                                                  
 
 
 def driftLeft(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.drift_left(1000)
     robot_is_stopped = False
 
 def driftRight(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.drift_right(1000)
     robot_is_stopped = False
 
 
 def driftStop(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.stop()
     robot_is_stopped = True
 
 def moveForward(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.move_forward(1000)  # Full speed forward
     robot_is_stopped = False
 
 def moveBackward(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.move_backward(1000)  # Full speed backward
     robot_is_stopped = False
 
 def moveStop(value):
     global robot_is_stopped
+    tank_drive_system.flush_motions()
     tank_drive_system.stop()
     robot_is_stopped = True
 
+def queueMotions(value):
+    """Append a motion sequence received from the network remote controller"""
+    global robot_is_stopped
+    tank_drive_system.enqueue_motions(value.motion_sequence)
+    robot_is_stopped = False
+
+def preemptMotions(value):
+    """Replace queued and running motions with a sequence from the network"""
+    global robot_is_stopped
+    tank_drive_system.preempt_motions(value.motion_sequence)
+    robot_is_stopped = False
+
+def flushMotions(value):
+    """Drop all queued motions and stop"""
+    global robot_is_stopped
+    tank_drive_system.flush_motions()
+    robot_is_stopped = True
+
 def move(value): 
     """
     Moves the robot based on joystick input using direct speed/direction control.
@@ -228,6 +267,13 @@ def move(value):
     
     # Debug output removed for better performance
     
+    # Stick input takes over from any queued motion sequence, but a resting
+    # stick must not stop a sequence that is being executed
+    if not is_joystick_at_rest:
+        tank_drive_system.flush_motions()
+    elif tank_drive_system.is_motion_active():
+        return
+    
     # Use joystick control method: Y-axis = speed, X-axis = direction
     tank_drive_system.joystick_control(forward_speed, turn_speed)
     
@@ -237,107 +283,46 @@ def move(value):
 def watch(value):
     """Handle right joystick movement for turret control"""
     if turret:
-        # Apply aggressive deadzone filtering similar to tank drive
-        TURRET_DEADZONE = 50  # Large deadzone for reliable stop detection
+        # Manual turret input takes over from camera tracking until shortly
+        # after the stick is released (a held stick sends no further events)
+        turret_tracker.manual_input(turret.stick_active(value.r_left, value.r_forward))
         
-        # Apply deadzone and ensure true zero when joystick is at rest
-        if abs(value.r_left) < TURRET_DEADZONE:
-            x_axis = 0
+        if turret.aim_mode:
+            # Absolute aim: the stick direction selects the turret heading
+            turret.aim_control(value.r_left, value.r_forward)
         else:
-            x_axis = value.r_left
-            
-        if abs(value.r_forward) < TURRET_DEADZONE:
-            y_axis = 0
+            # Map right joystick to turret speed control; the turret applies the
+            # deadzone (with hysteresis) and ignores events that change only Y
+            # x_axis: left/right rotation with speed
+            # y_axis: currently unused
+            turret.speed_control(value.r_left, value.r_forward)
+
+def toggleAim(value):
+    """Switch the turret between speed mode and absolute aim mode"""
+    if turret.turret_motor:
+        aiming = turret.toggle_aim_mode()
+        print("Turret aim mode: {}".format("ON" if aiming else "OFF"))
+
+
+def toggleHeadingHold(value):
+    """Switch heading hold for straight driving on or off"""
+    if tank_drive_system.is_initialized():
+        if tank_drive_system.heading_hold_enabled:
+            tank_drive_system.disable_heading_hold()
         else:
-            y_axis = value.r_forward
-        
-        # Map right joystick to turret speed control
-        # x_axis: left/right rotation with speed
-        # y_axis: currently unused
-        turret.speed_control(x_axis, y_axis)
-
-    result = 0;
-    val_x = value.r_left * -1;
-    val_y = value.r_forward;
-    
-    if(abs(val_x) < 10 and abs(val_y) < 10):
-        return
-    if(val_x == 0):
-        return;
-    if(val_y == 0):
-        return;  # Prevent divide by zero in math.atan calculations
-
-    quadrant = 1;
-    if (val_x < 0 and val_y < 0):
-        quadrant = 3
-        #result_degrees = result_degrees_orig + 180
-        result = math.atan(abs(val_x) / abs(val_y))
-    elif(val_y < 0):
-        quadrant = 2
-        #result_degrees = result_degrees_orig + 90
-        result = math.atan(abs(val_y) / abs(val_x))
-    elif(val_x < 0):
-        quadrant = 4
-        #result_degrees = result_degrees_orig + 270
-        result = math.atan(abs(val_y) / abs(val_x))
-    else:
-        quadrant = 1
-        result = math.atan(abs(val_x) / abs(val_y))
-
-    result_degrees_orig = math.degrees(result)
-    result_degrees = result_degrees_orig
-
-    if(quadrant == 3):
-        result_degrees = result_degrees_orig + 180
-    elif(quadrant==2):
-        result_degrees = result_degrees_orig + 90
-    elif(quadrant == 4):
-        result_degrees = result_degrees_orig + 270
-
-    # TODO: This code is disabled - old implementation for angle tracking
-    # If re-enabling, need to define drive_motor properly
-    # 
-    # angle_shift = abs(result_degrees - last_angle);
-    # speed = 360;
-    # result_degrees_final = result_degrees;
-    # if(angle_shift > 180):
-    #     if(result_degrees > last_angle):
-    #         diff = result_degrees - last_angle;
-    #         diff = diff - 360;
-    #         result_degrees_final = last_angle + diff;
-    #     else:
-    #         diff = result_degrees - last_angle;
-    #         diff = diff + 360;
-    #         result_degrees_final = last_angle + diff;
-    # 
-    #     print("Shift is greater than 180:" + str(result_degrees_final))
-    #     speed = -1 * speed;
-    # 
-    # 
-    # if(angle_shift < 5):
-    #     return
-    # 
-    # print(str(result_degrees_final) + " from " + str(last_angle) + " shift: " + str(angle_shift) + " speed: " + str(speed))
-    # 
-    # # NOTE: drive_motor is not defined - would need to be initialized if this code is re-enabled
-    # # drive_motor.track_target(result_degrees_final)
-    # last_angle = result_degrees;
-    """
+            tank_drive_system.enable_heading_hold()
+        print("Heading hold: {}".format("ON" if tank_drive_system.heading_hold_enabled else "OFF"))
 
 
 def blockDetected(value):
-#    if(value.blocks == None or len(value.blocks) == 0):
-#        return;
+    """Feed detected blocks to the predictive turret tracker"""
     if not device_manager.is_device_available("pixy_camera"):
         return
-        
-    block = value.blocks[0];
-    if(block.width > 10 or block.height > 10):
-        scale_factor = block.x_center - 150;
-        device_manager.safe_device_call("turret_motor", "run", scale_factor);
-
+    
+    # Runs on the camera thread right after the frame was published
+    frame = value.get_frame()
+    turret_tracker.update_blocks(frame.blocks, frame.time_us)
 
-"""
 
 def main():
     """
@@ -360,6 +345,7 @@ def main():
         # Only set up pixy camera event handler if camera is available
         if device_manager.is_device_available("pixy_camera"):
             pixy_camera.onBlockDetected(blockDetected);
+            drive_loop.add(turret_tracker)
 
         # Only set up light controls if pixy camera is available
         if device_manager.is_device_available("pixy_camera"):
@@ -381,10 +367,14 @@ def main():
             controller.onUpArrowPressed(moveForward)
             controller.onDownArrowPressed(moveBackward)
             controller.onUDArrowReleased(moveStop)
+            
+            # R2 toggles heading hold
+            controller.onR2Button(toggleHeadingHold)
         else:
             print("Drive motors not available - arrow controls disabled")
             
         controller.onRightJoystickMove(watch)
+        controller.onL2Button(toggleAim)
         print("PS4 controller is ready for use!")
     else:
         print("PS4 controller not available - program running in manual mode")
@@ -393,6 +383,25 @@ def main():
     # Only start pixy camera if available
     if device_manager.is_device_available("pixy_camera"):
         pixy_camera.start()
+    
+    # Only track the robot pose if both drive motors are available
+    if odometry.is_available():
+        odometry.start()
+    
+    # Network remote controller: motion sequences run on the drive loop, so
+    # only listen for them if the tank drive is usable
+    if tank_drive_system.is_initialized():
+        remote_controller = RemoteController()
+        remote_controller.onMotionSequence(queueMotions)
+        remote_controller.onMotionPreempt(preemptMotions)
+        remote_controller.onMotionFlush(flushMotions)
+        # The listener blocks in accept(); it must not keep the program alive
+        remote_controller.daemon = True
+        remote_controller.start()
+    
+    # Only run the drive control loop if the tank drive or turret is usable
+    if tank_drive_system.is_initialized() or turret.turret_motor:
+        drive_loop.start()
         
     if __debug__:
         print ("Threads started")
@@ -401,8 +410,11 @@ def main():
             print("Left Stick Y-axis: Forward/backward speed")
             print("Left Stick X-axis: Turning speed left/right")
             print("Right Stick X-axis: Turret speed left/right")
+            print("Right Stick (aim mode): Point turret in stick direction")
+            print("L2: Toggle turret aim mode")
             print("Left/Right Arrows: Drift left/right")
             print("Up/Down Arrows: Move forward/backward")
+            print("R2: Toggle heading hold")
             print("Cross Button: Say hello")
             print("L1/R1: Light on/off (if camera available)")
             print("Options: Quit")
@@ -13,6 +13,8 @@ Intersection    -- Intersection data
 Branch          -- Branch data
 Barcode         -- Barcode data
 MainFeatures    -- Linetracking data
+SMBusTransport  -- I2C transport for Python on ev3dev
+I2CDeviceTransport -- I2C transport for Pybricks MicroPython
 
 
 Author  : Kees Smit
@@ -51,6 +53,12 @@ class Pixy2CommunicationError(Exception):
         self.errors = errors
         print(errors)
 
+class Pixy2CircuitOpenError(Pixy2CommunicationError):
+    """ Request skipped while the camera is not responding (does not print)."""
+    def __init__(self, message, errors):
+        Exception.__init__(self, message)
+        self.errors = errors
+
 class PlatformError(Exception):
     """ Custom error for non EV3 platform."""
     def __init__(self, message, errors):
@@ -61,46 +69,180 @@ class PlatformError(Exception):
 # Imports from Python standard library
 import os, sys
 from time import sleep
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # CPython: microsecond ticks from perf_counter
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+# Platform ('cp' = Python on ev3dev, 'mp' = Pybricks MicroPython), detected on
+# the first Pixy2() construction that needs the I2C bus, so importing this
+# module is cheap and works on any machine.
+PLF = None
+
+# Largest single I2C read (SMBus block transfers are limited to 32 bytes)
+I2C_MAX_READ = 32
+
+# Size of one Color Connected Components block in a get_blocks payload
+BLOCK_SIZE = 14
+
+# Sizes of line tracking features (an intersection always carries room for
+# LINE_MAX_INTERSECTION_LINES branches of 4 bytes after its 4 byte header)
+VECTOR_SIZE = 6
+LINE_MAX_INTERSECTION_LINES = 6
+INTERSECTION_SIZE = 4 + 4 * LINE_MAX_INTERSECTION_LINES
+BARCODE_SIZE = 4
+
+# Retry policy of pixy2_request
+MAX_REQUEST_ATTEMPTS = 5
+BUSY_BACKOFF = 0.001        # First wait after SER_ERROR_BUSY (seconds), doubled per retry
+MAX_BUSY_BACKOFF = 0.016
+FAIL_FAST_ERRORS = ('SER_ERROR_INVALID_REQUEST', 'SER_ERROR_TYPE_UNSUPPORTED')
+
+# Circuit breaker: after this many consecutive failed requests, requests fail
+# immediately (no bus traffic) until the cooldown has passed
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN_US = 1000000
+
+# Request statistics table: one preallocated slot per request type. All
+# Pixy2 request types are even and below 64, so type >> 1 is a unique slot.
+STATS_SLOTS = 32
+REQUEST_NAMES = {12: 'resolution', 14: 'version', 22: 'lamp', 32: 'blocks',
+                 48: 'linetracking', 54: 'mode', 58: 'next_turn', 60: 'default_turn'}
+
+# Constant request packets, encoded once
+# (sync 174, 193 / request type / payload length / payload)
+REQUEST_VERSION = bytes([174, 193, 14, 0])
+REQUEST_RESOLUTION = bytes([174, 193, 12, 1, 0])
+REQUEST_LINETRACKING = bytes([174, 193, 48, 2, 0, 7])
 
-# Check program is running on LEGO MINDSTORMS EV3
 BOARD_INFO_DIR = '/sys/class/board-info/'
 msg_plf_error = 'Wrong platform: can only run on LEGO MINDSTORMS EV3'
-try:
-    # Check if BOARD_INFO_DIR exists
-    os.listdir(BOARD_INFO_DIR)
-except:
-    raise PlatformError(msg_plf_error, 'PlatformError')
-
-boards = os.listdir(BOARD_INFO_DIR)
-for board in boards:
-    filename = BOARD_INFO_DIR + '/' + board + '/uevent'
-    with open(filename, 'r') as fn:
-        for line in fn.readlines():
-            (key, value) = line.strip().split('=')
-            if key == 'BOARD_INFO_MODEL':
-                if value != 'LEGO MINDSTORMS EV3':
-                    raise PlatformError(msg_plf_error, 'PlatformError')
-
-# Check current Python interpreter
-if sys.implementation.name == 'cpython':
-    # Running Python on ev3dev
-    PLF = 'cp'
-elif sys.implementation.name == 'pybricks-micropython':
-    # Running MicroPython on PyBricks
-    PLF = 'mp'
-else:
-    # Unknown Python interpreter
-    msg = 'Unknown Python Interpreter.'
-    raise Pixy2PythonInterpreterError(msg, 'Pixy2PythonInterpreterError')
-
-# Import additional modules (interpreter dependent)
-if PLF == 'cp':
-    from smbus import SMBus
-    from ev3dev2.sensor import INPUT_1, INPUT_2, INPUT_3, INPUT_4
-    from ev3dev2.port import LegoPort
-elif PLF == 'mp':
-    from pybricks.parameters import Port
-    from pybricks.iodevices import I2CDevice
+
+
+def detect_platform():
+    """ Check for LEGO MINDSTORMS EV3 and the Python interpreter, import
+    the interpreter dependent modules and return the platform ('cp'/'mp').
+
+    The result is cached; the /sys scan only runs once.
+    """
+    global PLF, SMBus, INPUT_1, INPUT_2, INPUT_3, INPUT_4, LegoPort, Port, I2CDevice
+    if PLF is not None:
+        return PLF
+
+    # Check program is running on LEGO MINDSTORMS EV3
+    try:
+        # Check if BOARD_INFO_DIR exists
+        boards = os.listdir(BOARD_INFO_DIR)
+    except:
+        raise PlatformError(msg_plf_error, 'PlatformError')
+
+    for board in boards:
+        filename = BOARD_INFO_DIR + '/' + board + '/uevent'
+        with open(filename, 'r') as fn:
+            for line in fn.readlines():
+                (key, value) = line.strip().split('=')
+                if key == 'BOARD_INFO_MODEL':
+                    if value != 'LEGO MINDSTORMS EV3':
+                        raise PlatformError(msg_plf_error, 'PlatformError')
+
+    # Check current Python interpreter
+    if sys.implementation.name == 'cpython':
+        # Running Python on ev3dev
+        platform = 'cp'
+    elif sys.implementation.name == 'pybricks-micropython':
+        # Running MicroPython on PyBricks
+        platform = 'mp'
+    else:
+        # Unknown Python interpreter
+        msg = 'Unknown Python Interpreter.'
+        raise Pixy2PythonInterpreterError(msg, 'Pixy2PythonInterpreterError')
+
+    # Import additional modules (interpreter dependent)
+    if platform == 'cp':
+        from smbus import SMBus
+        from ev3dev2.sensor import INPUT_1, INPUT_2, INPUT_3, INPUT_4
+        from ev3dev2.port import LegoPort
+    elif platform == 'mp':
+        from pybricks.parameters import Port
+        from pybricks.iodevices import I2CDevice
+
+    PLF = platform
+    return PLF
+
+
+
+# I2C transports. A transport has write(data), read(length) and close();
+# Pixy2 picks one at construction and never checks the platform again.
+class SMBusTransport:
+    """ Pixy2 I2C bus through python-smbus (Python on ev3dev)."""
+    def __init__(self, port, i2c_address):
+        # Set LEGO port for Pixy2
+        if port == 1:
+            pixy_port = LegoPort(INPUT_1)
+        elif port == 2:
+            pixy_port = LegoPort(INPUT_2)
+        elif port == 3:
+            pixy_port = LegoPort(INPUT_3)
+        elif port == 4:
+            pixy_port = LegoPort(INPUT_4)
+        else:
+            raise ValueError('Portnumber out of range (1, 4)')
+        # Set LEGO port mode to i2c
+        pixy_port.mode = 'other-i2c'
+        # Short wait for port to get ready
+        sleep(0.5)
+        self.i2c_address = i2c_address
+        self.bus = SMBus(port+2)
+
+    def write(self, data):
+        # python-smbus only accepts a list
+        self.bus.write_i2c_block_data(self.i2c_address, 0, list(data))
+
+    def read(self, length):
+        return self.bus.read_i2c_block_data(self.i2c_address, 0, length)
+
+    def close(self):
+        self.bus.close()
+
+
+class I2CDeviceTransport:
+    """ Pixy2 I2C bus through pybricks I2CDevice (Pybricks MicroPython)."""
+    def __init__(self, port, i2c_address):
+        # Set LEGO port for Pixy2
+        if port == 1:
+            ev3_port = Port.S1
+        elif port == 2:
+            ev3_port = Port.S2
+        elif port == 3:
+            ev3_port = Port.S3
+        elif port == 4:
+            ev3_port = Port.S4
+        else:
+            raise ValueError('Portnumber out of range (1, 4)')
+        self.device = I2CDevice(ev3_port, i2c_address)
+
+    def write(self, data):
+        self.device.write(reg=0x00, data=data)
+
+    def read(self, length):
+        return self.device.read(reg=0x00, length=length)
+
+    def close(self):
+        pass
+
+
+def open_transport(port, i2c_address):
+    """ Open the EV3 I2C transport for the detected platform."""
+    if detect_platform() == 'cp':
+        return SMBusTransport(port, i2c_address)
+    return I2CDeviceTransport(port, i2c_address)
 
 
 class Pixy2:
@@ -118,7 +260,7 @@ class Pixy2:
     get_blocks            -- Get data about detected signatures
     get_linetracking_data -- Get data for linetracking
     """
-    def __init__(self, port=1, i2c_address=0x54):
+    def __init__(self, port=1, i2c_address=0x54, transport=None):
         """ Initialising Pixy2 class.
 
         Keyword arguments:
@@ -126,86 +268,214 @@ class Pixy2:
                        (INT in range (1, 4)).
         i2c_address -- i2c address for communicating with Pixy2
                        (hexa-decimal, set in configuration Pixy2).
+        transport   -- I2C transport (write(data), read(length), close());
+                       defaults to the EV3 bus of the detected platform.
+                       Passing one skips platform detection.
         """
         self.i2c_address = i2c_address
-        if PLF == 'cp':
-            # Set LEGO port for Pixy2
-            if port == 1:
-                pixy_port = LegoPort(INPUT_1)
-            elif port == 2:
-                pixy_port = LegoPort(INPUT_2)
-            elif port == 3:
-                pixy_port = LegoPort(INPUT_3)
-            elif port == 4:
-                pixy_port = LegoPort(INPUT_4)
-            else:
-                raise ValueError('Portnumber out of range (1, 4)')
-            # Set LEGO port mode to i2c
-            pixy_port.mode = 'other-i2c'
-            # Short wait for port to get ready
-            sleep(0.5)
-            # Define Pixy2
-            self.pixy2 = SMBus(port+2)
-        elif PLF == 'mp':
-            # Set LEGO port for Pixy2
-            if port == 1:
-                ev3_port = Port.S1
-            elif port == 2:
-                ev3_port = Port.S2
-            elif port == 3:
-                ev3_port = Port.S3
-            elif port == 4:
-                ev3_port = Port.S4
-            else:
-                raise ValueError('Portnumber out of range (1, 4)')
-            # Define Pixy2
-            self.pixy2 = I2CDevice(ev3_port, i2c_address)
+        self.max_read = I2C_MAX_READ
+        # Reused buffers: chunked payloads and pooled Block records, so
+        # steady-state polling does not allocate
+        self._payload = bytearray(256)
+        self._block_pool = []
+        self._blocks = []
+        self._features = MainFeatures()
+        # Request templates for parameterized requests; only the payload
+        # bytes are rewritten per call (Pixy2 is used from one thread)
+        self._request_blocks = bytearray([174, 193, 32, 2, 0, 0])
+        self._request_lamp = bytearray([174, 193, 22, 2, 0, 0])
+        self._request_mode = bytearray([174, 193, 54, 1, 0])
+        self._request_next_turn = bytearray([174, 193, 58, 2, 0, 0])
+        self._request_default_turn = bytearray([174, 193, 60, 2, 0, 0])
+        # Request statistics per request type (fixed table, see STATS_SLOTS)
+        # and circuit breaker state
+        self.request_stats = [RequestStats() for _ in range(STATS_SLOTS)]
+        self._current_stats = self.request_stats[0]
+        self.consecutive_failures = 0
+        self._breaker_opened_us = None
+        if transport is None:
+            transport = open_transport(port, i2c_address)
+        self.transport = transport
+        # The transport is chosen once; its methods are bound directly, or
+        # through the instrumented wrappers while instrumentation is on
+        self.set_instrumentation(True)
 
     def pixy2_request(self, request, response_type):
-        """ Send request to Pixy2, return header on success or error on fail."""
-        times_tried = 0
-        while True:
-            times_tried += 1
-            if times_tried == 10:
-                # Tried sending 10 times without success, raise error
-                msg = 'Fault in serial communication.'
-                raise Pixy2CommunicationError(msg, 'Pixy2CommunicationError')
-            else:
-                # Send requeat to Pixy2
+        """ Send request to Pixy2, return header on success or error on fail.
+
+        SER_ERROR_BUSY is retried with a short exponential backoff, other
+        serial errors are retried immediately, and INVALID_REQUEST and
+        TYPE_UNSUPPORTED fail at once. After BREAKER_THRESHOLD consecutive
+        failed requests the camera is considered down: requests raise
+        without touching the bus until BREAKER_COOLDOWN_US has passed.
+        """
+        start = ticks_us()
+        stats = self.request_stats[(request[2] >> 1) % STATS_SLOTS]
+        stats.request_type = request[2]
+        stats.count += 1
+        # Transactions until the next request (payload reads) count here too
+        self._current_stats = stats
+
+        if self._breaker_opened_us is not None:
+            if ticks_diff(start, self._breaker_opened_us) < BREAKER_COOLDOWN_US:
+                stats.rejected += 1
+                # A fresh, non-printing error: re-raising one instance would
+                # keep growing its traceback
+                msg = 'Pixy2 not responding, request skipped.'
+                raise Pixy2CircuitOpenError(msg, 'Pixy2CircuitOpenError')
+            # Cooldown over: let this request probe the camera
+
+        backoff = BUSY_BACKOFF
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                # Send request to Pixy2
                 self._i2c_write(request)
                 # Read header of response
                 header = self._i2c_read(6)
                 # Check header for success or fail
                 err = self._check_header(header, response_type)
                 if err == 'NO_ERROR':
-                    # Successful request, break out of loop and return header
                     break
-                else:
-                    # Request not successful, try again
-                    pass
+                if err in FAIL_FAST_ERRORS:
+                    # Retrying cannot help, the request itself is rejected
+                    stats.failures += 1
+                    self._record_latency(stats, start)
+                    msg = 'Request rejected by Pixy2: {}'.format(err)
+                    raise Pixy2DataError(msg, err)
+                if attempt >= MAX_REQUEST_ATTEMPTS:
+                    msg = 'Fault in serial communication.'
+                    raise Pixy2CommunicationError(msg, 'Pixy2CommunicationError')
+                stats.retries += 1
+                if err == 'SER_ERROR_BUSY':
+                    sleep(backoff)
+                    backoff = min(backoff * 2, MAX_BUSY_BACKOFF)
+        except Pixy2DataError as e:
+            if e.errors in FAIL_FAST_ERRORS:
+                raise
+            self._request_failed(stats, start)
+            raise
+        except Exception:
+            self._request_failed(stats, start)
+            raise
+
+        self.consecutive_failures = 0
+        self._breaker_opened_us = None
+        self._record_latency(stats, start)
         return header
 
-    def _i2c_write(self, data):
-        """ Write data to Pixy2."""
-        if PLF == 'cp':
-            self.pixy2.write_i2c_block_data(self.i2c_address, 0, data)
-        elif PLF == 'mp':
-            self.pixy2.write(reg=0x00, data=bytes(data))
-        else:
-            msg = 'Unknown Python Interpreter.'
-            raise Pixy2PythonInterpreterError(msg, 'Pixy2PythonInterpreterError')
-
-    def _i2c_read(self, length):
-        """ Read data from Pixy2."""
-        if PLF == 'cp':
-            response = self.pixy2.read_i2c_block_data(self.i2c_address, 0, length)
-        elif PLF == 'mp':
-            response = self.pixy2.read(reg=0x00, length=length)
+    def _request_failed(self, stats, start):
+        """ Count a failed request and open the circuit breaker if needed."""
+        stats.failures += 1
+        self._record_latency(stats, start)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= BREAKER_THRESHOLD:
+            self._breaker_opened_us = ticks_us()
+
+    def _record_latency(self, stats, start):
+        """ Add the time since start to the request statistics."""
+        latency = ticks_diff(ticks_us(), start)
+        stats.total_us += latency
+        if latency > stats.max_us:
+            stats.max_us = latency
+
+    def get_request_stats(self):
+        """ Get statistics per request type.
+
+        Returns a dict: request type -> dict with name, count, retries,
+        failures, rejected, avg_us and max_us (request round trip up to the
+        response header), transactions, bytes, bus_us (time in I2C
+        transactions, including payload reads) and max_transaction_us.
+        """
+        result = {}
+        for stats in self.request_stats:
+            if stats.count == 0:
+                continue
+            result[stats.request_type] = {
+                'name': REQUEST_NAMES.get(stats.request_type, 'unknown'),
+                'count': stats.count,
+                'retries': stats.retries,
+                'failures': stats.failures,
+                'rejected': stats.rejected,
+                'avg_us': stats.total_us // stats.count,
+                'max_us': stats.max_us,
+                'transactions': stats.transactions,
+                'bytes': stats.bytes,
+                'bus_us': stats.bus_us,
+                'max_transaction_us': stats.max_transaction_us,
+            }
+        return result
+
+    def get_bus_time(self):
+        """ Total time spent in I2C transactions (us) since the last reset."""
+        total = 0
+        for stats in self.request_stats:
+            total += stats.bus_us
+        return total
+
+    def reset_request_stats(self):
+        """ Clear the request statistics."""
+        for stats in self.request_stats:
+            stats.reset()
+
+    def set_instrumentation(self, enabled):
+        """ Turn per-transaction byte and bus time counting on or off.
+
+        When off, the transport methods are called directly.
+        """
+        if enabled:
+            self._i2c_write = self._instrumented_write
+            self._i2c_read = self._instrumented_read
         else:
-            msg = 'Unknown Python Interpreter.'
-            raise Pixy2PythonInterpreterError(msg, 'Pixy2PythonInterpreterError')
+            self._i2c_write = self.transport.write
+            self._i2c_read = self.transport.read
+
+    def _instrumented_write(self, data):
+        """ Write data to Pixy2 and count the transaction."""
+        start = ticks_us()
+        self.transport.write(data)
+        self._record_transaction(len(data), ticks_diff(ticks_us(), start))
+
+    def _instrumented_read(self, length):
+        """ Read data from Pixy2 and count the transaction."""
+        start = ticks_us()
+        response = self.transport.read(length)
+        self._record_transaction(length, ticks_diff(ticks_us(), start))
         return response
 
+    def _record_transaction(self, nbytes, elapsed):
+        """ Add one I2C transaction to the current request type."""
+        stats = self._current_stats
+        stats.transactions += 1
+        stats.bytes += nbytes
+        stats.bus_us += elapsed
+        if elapsed > stats.max_transaction_us:
+            stats.max_transaction_us = elapsed
+
+    def is_circuit_open(self):
+        """ True while requests are being skipped after repeated failures."""
+        return self._breaker_opened_us is not None
+
+    def close(self):
+        """ Release the I2C bus."""
+        self.transport.close()
+
+    def _read_payload(self, length):
+        """ Read a whole payload, in as few I2C transactions as allowed."""
+        if length == 0:
+            return b''
+        if length <= self.max_read:
+            return self._i2c_read(length)
+        # Assemble the chunks in the reusable buffer (payload length <= 255)
+        payload = self._payload
+        pos = 0
+        while pos < length:
+            n = min(self.max_read, length - pos)
+            payload[pos:pos+n] = self._i2c_read(n)
+            pos += n
+        return payload
+
     def _check_header(self, header, packet_type):
         """ Check if data packet type is correct, raise exception when not."""
         err = 'NO_ERROR'
@@ -224,7 +494,10 @@ class Pixy2:
         elif header[2] == 3:
             # Serial error
             e = self._i2c_read(1)
-            err = [k for k, v in serial_errors.items() if v == e[0]]
+            err = 'SER_ERROR_UNKNOWN'
+            for k, v in serial_errors.items():
+                if v == e[0]:
+                    err = k
         elif header[2] != packet_type:
             # Read wrong type of packet
             msg = "Read wrong type of packet: {} instead of {}".format(
@@ -237,9 +510,8 @@ class Pixy2:
         """ Queries and receives the firmware and hardware version Pixy2."""
         pixy2_version = Pixy2Version()
         # Request data
-        data = [174, 193, 14, 0]
         response_type = 15
-        header = self.pixy2_request(data, response_type)
+        header = self.pixy2_request(REQUEST_VERSION, response_type)
         # Read and parse data on successful request
         data = self._i2c_read(7)
         pixy2_version.hardware = data[1] << 8 | data[0]
@@ -252,9 +524,8 @@ class Pixy2:
     def get_resolution(self):
         """ Gets the width and height of the current frame."""
         resolution = PixyResolution()
-        data = [174, 193, 12, 1, 0]
         response_type = 13
-        self.pixy2_request(data, response_type)
+        self.pixy2_request(REQUEST_RESOLUTION, response_type)
         # Read and parse data on successful request
         data = self._i2c_read(4)
         resolution.width = data[1] << 8 | data[0]
@@ -263,136 +534,143 @@ class Pixy2:
 
     def set_lamp(self, upper, lower):
         """ Turn on/off upper and lower LED's of Pixy2 (0=off, 1=on)."""
-        data = [174, 193, 22, 2, upper, lower]
+        request = self._request_lamp
+        request[4] = upper
+        request[5] = lower
         response_type = 1
-        self.pixy2_request(data, response_type)
+        self.pixy2_request(request, response_type)
 
     def set_mode(self, mode):
         """ Set linetracking mode for Pixy2."""
-        data = [174, 193, 54, 1, mode]
+        request = self._request_mode
+        request[4] = mode
         response_type = 1
-        self.pixy2_request(data, response_type)
+        self.pixy2_request(request, response_type)
 
     def get_blocks(self, sigmap, max_blocks):
-        """ Get blockdata for sigmap."""
-        blocks = []
+        """ Get blockdata for sigmap.
+
+        The returned list and its Block records are reused by the next
+        get_blocks() call; copy what must outlive the frame.
+        """
         # Request data
-        data = [174, 193, 32, 2, sigmap, max_blocks]
+        request = self._request_blocks
+        request[4] = sigmap
+        request[5] = max_blocks
         response_type = 33
-        header = self.pixy2_request(data, response_type)
+        header = self.pixy2_request(request, response_type)
         length_of_payload = header[3]
-        nr_detected_blocks = int(length_of_payload/14)
-        # Read and parse data
+        nr_detected_blocks = int(length_of_payload/BLOCK_SIZE)
+        # Read all blocks at once and decode them in place into pooled records
+        data = self._read_payload(nr_detected_blocks * BLOCK_SIZE)
+        pool = self._block_pool
+        while len(pool) < nr_detected_blocks:
+            pool.append(Block())
+        blocks = self._blocks
+        blocks.clear()
         for b in range(0, nr_detected_blocks):
-            data = self._i2c_read(14)
-            blocks.append(Block())
-            blocks[b].sig = data[1] << 8 | data[0]
-            blocks[b].x_center = data[3] << 8 | data[2]
-            blocks[b].y_center = data[5] << 8 | data[4]
-            blocks[b].width= data[7] << 8 | data[6]
-            blocks[b].height = data[9] << 8 | data[8]
-            blocks[b].angle = data[11] << 8 | data[10]
-            blocks[b].tracking_index = data[12]
-            blocks[b].age = data[13]
+            blocks.append(pool[b].decode(data, b * BLOCK_SIZE))
 
         return nr_detected_blocks, blocks
 
 
     def get_linetracking_data(self):
-        """ Get linetracking data from Pixy2."""
-
-        mainfeatures = MainFeatures()
-        vector = Vector()
-        intersection = Intersection()
-        branch = Branch()
-        barcode = Barcode()
-        payload_read = 0
+        """ Get linetracking data from Pixy2.
 
+        The returned MainFeatures and its records are reused by the next
+        get_linetracking_data() call; copy what must outlive the frame.
+        """
         # Request
-        data = [174,193, 48, 2, 0, 7]
         response_type = 49
-        header = self.pixy2_request(data, response_type)
-
-        # Parse header info
-        mainfeatures.length_of_payload = header[3]
-
-        # Read payload data
-        while payload_read < mainfeatures.length_of_payload:
-            # Read feature type and length
-            data = self._i2c_read(2)
-            feature_type = data[0]
-            feature_length = data[1]
-            # Read feature data
+        header = self.pixy2_request(REQUEST_LINETRACKING, response_type)
+        length = header[3]
+        # Read all features at once and decode them into pooled records
+        data = self._read_payload(length)
+        features = self._features
+        features.clear()
+        features.error = False
+        features.length_of_payload = length
+
+        # Each feature: type, length, then all records of that type
+        pos = 0
+        while pos + 2 <= length:
+            feature_type = data[pos]
+            o = pos + 2
+            end = o + data[pos+1]
+            if end > length:
+                # Truncated feature
+                features.error = True
+                break
             if feature_type == 1:
                 # Feature type is 'vector'
-                data = self._i2c_read(feature_length)
-                vector.x0 = data[0]
-                vector.y0 = data[1]
-                vector.x1 = data[2]
-                vector.y1 = data[3]
-                vector.index = data[4]
-                vector.flags = data[5]
-                mainfeatures.add_vector(vector)
+                while o + VECTOR_SIZE <= end:
+                    features.next_vector().decode(data, o)
+                    o += VECTOR_SIZE
             elif feature_type == 2:
-                # feature type is 'intersection'
-                data = self._i2c_read(feature_length)
-                intersection.x = data[0]
-                intersection.y = data[1]
-                intersection.nr_of_branches = data[2]
-                for i in range(0, intersection.nr_of_branches):
-                    i4 = i*4
-                    branch.index = data[i4+0]
-                    branch.angle = data[14+1]
-                    branch.angle_byte1 = data[i4+2]
-                    branch.angle_byte2 = data[i4+3]
-                    intersection.add_branch(branch)
-                mainfeatures.add_intersection(intersection)
+                # Feature type is 'intersection'
+                while o + INTERSECTION_SIZE <= end:
+                    features.next_intersection().decode(data, o)
+                    o += INTERSECTION_SIZE
             elif feature_type == 4:
                 # Feature type is 'barcode'
-                data = self._i2c_read(feature_length)
-                barcode.x = data[0]
-                barcode.y = data[1]
-                barcode.flags = data[2]
-                barcode.code = data[3]
-                mainfeatures.add_barcode(barcode)
+                while o + BARCODE_SIZE <= end:
+                    features.next_barcode().decode(data, o)
+                    o += BARCODE_SIZE
             else:
                 # Unknown feature type
-                mainfeatures.error = True
-
-            payload_read += feature_length + 2
+                features.error = True
+            pos = end
 
         # Return data
-        return mainfeatures
+        return features
 
     def set_next_turn(self, angle):
         """ Set direction for turn at next intersection."""
-        if angle >= 0:
-            data = [174, 193, 58, 2, angle, 0]
-        else:
-            if PLF == 'cp':
-                angle_bytes = angle.to_bytes(2, 'little', signed=True)
-            elif PLF == 'mp':
-                angle_bytes = angle.to_bytes(2, 'little', True)
-            data = [174, 193, 58, 2, angle_bytes[0], angle_bytes[1]]
+        request = self._encode_angle(self._request_next_turn, angle)
         response_type = 1
-        self.pixy2_request(data, response_type)
+        self.pixy2_request(request, response_type)
 
     def set_default_turn(self, angle):
         """ Set default direction for turn at an intersection."""
-        if angle >= 0:
-            data = [174, 193, 60, 2, angle, 0]
-        else:
-            if PLF == 'cp':
-                angle_bytes = angle.to_bytes(2, 'little', signed=True)
-            elif PLF == 'mp':
-                angle_bytes = angle.to_bytes(2, 'little', True)
-            data = [174, 193, 60, 2, angle_bytes[0], angle_bytes[1]]
+        request = self._encode_angle(self._request_default_turn, angle)
         response_type = 1
-        self.pixy2_request(data, response_type)
+        self.pixy2_request(request, response_type)
+
+    def _encode_angle(self, request, angle):
+        """ Write angle (degrees, -180 to 180) as signed 16-bit little endian
+        into the payload of a turn request template."""
+        angle = int(angle) & 0xFFFF
+        request[4] = angle & 0xFF
+        request[5] = angle >> 8
+        return request
 
 
 # Pixy2 specific datatypes
 
+class RequestStats:
+    """ Latency, retry and I2C transaction counters for one request type."""
+    __slots__ = ('request_type', 'count', 'retries', 'failures', 'rejected',
+                 'total_us', 'max_us', 'transactions', 'bytes', 'bus_us',
+                 'max_transaction_us')
+
+    def __init__(self):
+        self.request_type = None
+        self.reset()
+
+    def reset(self):
+        """ Zero all counters."""
+        self.count = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_us = 0
+        self.max_transaction_us = 0
+
+
 class Pixy2PacketReference:
     """ Packet reference for Pixy2 serial communication."""
     def __init__(self, request_data, request_type, response_type):
@@ -437,6 +715,9 @@ class PixyResolution:
 
 class Block:
     """ Datablock with detected signature."""
+    __slots__ = ('sig', 'x_center', 'y_center', 'width', 'height', 'angle',
+                 'tracking_index', 'age')
+
     def __init__(self):
         self.sig = None
         self.x_center = None
@@ -447,6 +728,32 @@ class Block:
         self.tracking_index = None
         self.age = None
 
+    def decode(self, data, o):
+        """ Fill the block in place from 14 payload bytes at offset o."""
+        self.sig = data[o+1] << 8 | data[o]
+        self.x_center = data[o+3] << 8 | data[o+2]
+        self.y_center = data[o+5] << 8 | data[o+4]
+        self.width = data[o+7] << 8 | data[o+6]
+        self.height = data[o+9] << 8 | data[o+8]
+        # Color code angle is a signed 16-bit value (-180 to 180)
+        angle = data[o+11] << 8 | data[o+10]
+        self.angle = angle - 0x10000 if angle & 0x8000 else angle
+        self.tracking_index = data[o+12]
+        self.age = data[o+13]
+        return self
+
+    def copy_from(self, other):
+        """ Copy the fields of another block into this one."""
+        self.sig = other.sig
+        self.x_center = other.x_center
+        self.y_center = other.y_center
+        self.width = other.width
+        self.height = other.height
+        self.angle = other.angle
+        self.tracking_index = other.tracking_index
+        self.age = other.age
+        return self
+
     def __str__(self):
         desc = 'sig: {}\nx: {}\ny: {}\nwidth:  {}\nheight: {}'.format(
             self.sig, self.x_center, self.y_center, self.width, self.height)
@@ -454,6 +761,8 @@ class Block:
 
 class Vector:
     """ Vector data for linetracking."""
+    __slots__ = ('x0', 'y0', 'x1', 'y1', 'index', 'flags')
+
     def __init__(self):
         self.x0 = 0
         self.y0 = 0
@@ -462,40 +771,95 @@ class Vector:
         self.index = 0
         self.flags = 0
 
+    def decode(self, data, o):
+        """ Fill the vector in place from 6 payload bytes at offset o."""
+        self.x0 = data[o]
+        self.y0 = data[o+1]
+        self.x1 = data[o+2]
+        self.y1 = data[o+3]
+        self.index = data[o+4]
+        self.flags = data[o+5]
+        return self
+
 
 class Intersection:
     """ Intersection data for linetracking."""
+    __slots__ = ('x', 'y', 'nr_of_branches', 'branches', '_branch_pool')
+
     def __init__(self):
         self.x = 0
         self.y = 0
         self.nr_of_branches = 0
         self.branches = []
+        self._branch_pool = []
 
     def add_branch(self, branch):
         """ Add branch to intersection."""
         b = Branch()
         b.index = branch.index
         b.angle = branch.angle
+        b.angle_byte1 = branch.angle_byte1
+        b.angle_byte2 = branch.angle_byte2
         self.branches.append(b)
 
+    def decode(self, data, o):
+        """ Fill the intersection in place from the payload at offset o.
+
+        Header x, y, number of branches, reserved; then 4 bytes per
+        branch from offset 4.
+        """
+        self.x = data[o]
+        self.y = data[o+1]
+        n = min(data[o+2], LINE_MAX_INTERSECTION_LINES)
+        self.nr_of_branches = n
+        pool = self._branch_pool
+        while len(pool) < n:
+            pool.append(Branch())
+        branches = self.branches
+        branches.clear()
+        for i in range(n):
+            branches.append(pool[i].decode(data, o + 4 + i*4))
+        return self
+
 
 class Branch:
     """ Data for branch of intersection."""
+    __slots__ = ('index', 'angle', 'angle_byte1', 'angle_byte2')
+
     def __init__(self):
         self.index = 0
         self.angle = 0
         self.angle_byte1 = 0
         self.angle_byte2 = 0
 
+    def decode(self, data, o):
+        """ Fill the branch in place: index, reserved, signed 16-bit angle."""
+        self.index = data[o]
+        self.angle_byte1 = data[o+2]
+        self.angle_byte2 = data[o+3]
+        angle = data[o+3] << 8 | data[o+2]
+        self.angle = angle - 0x10000 if angle & 0x8000 else angle
+        return self
+
 
 class Barcode:
     """ Date of detected barcode."""
+    __slots__ = ('x', 'y', 'flags', 'code')
+
     def __init__(self):
         self.x = 0
         self.y = 0
         self.flags = 0
         self.code = 0
 
+    def decode(self, data, o):
+        """ Fill the barcode in place from 4 payload bytes at offset o."""
+        self.x = data[o]
+        self.y = data[o+1]
+        self.flags = data[o+2]
+        self.code = data[o+3]
+        return self
+
 
 class MainFeatures:
     """ Data for linetracking."""
@@ -508,6 +872,40 @@ class MainFeatures:
         self.vectors = []
         self.intersections = []
         self.barcodes = []
+        # Records reused by get_linetracking_data
+        self._vector_pool = []
+        self._intersection_pool = []
+        self._barcode_pool = []
+
+    def next_vector(self):
+        """ Append a pooled vector record and return it."""
+        i = self.number_of_vectors
+        pool = self._vector_pool
+        if i == len(pool):
+            pool.append(Vector())
+        self.vectors.append(pool[i])
+        self.number_of_vectors = i + 1
+        return pool[i]
+
+    def next_intersection(self):
+        """ Append a pooled intersection record and return it."""
+        i = self.number_of_intersections
+        pool = self._intersection_pool
+        if i == len(pool):
+            pool.append(Intersection())
+        self.intersections.append(pool[i])
+        self.number_of_intersections = i + 1
+        return pool[i]
+
+    def next_barcode(self):
+        """ Append a pooled barcode record and return it."""
+        i = self.number_of_barcodes
+        pool = self._barcode_pool
+        if i == len(pool):
+            pool.append(Barcode())
+        self.barcodes.append(pool[i])
+        self.number_of_barcodes = i + 1
+        return pool[i]
 
     def add_vector(self, vector):
         v = Vector()
@@ -522,16 +920,11 @@ class MainFeatures:
 
     def add_intersection(self, intersection):
         ints = Intersection()
-        b = Branch()
         ints.x = intersection.x
         ints.y = intersection.y
         ints.nr_of_branches = intersection.nr_of_branches
         for branch in intersection.branches:
-            b.index = branch.index
-            b.angle = branch.angle
-            b.angle_byte1 = branch.angle_byte1
-            b.angle_byte2 = branch.angle_byte2
-            ints.add_branch(b)
+            ints.add_branch(branch)
         self.intersections.append(ints)
         self.number_of_intersections += 1
 
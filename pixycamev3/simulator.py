@@ -0,0 +1,241 @@
+""" Simulated Pixy2 I2C transport
+
+SimulatedPixy2Transport speaks the Pixy2 serial protocol without a camera:
+it answers the requests Pixy2 writes with responses built from scripted or
+recorded frames. Pass it as the transport of Pixy2 (or Pixy2Camera) to run
+and benchmark the driver on any machine.
+
+Public classes:
+SimFrame                -- Blocks and line features of one camera frame
+SimulatedPixy2Transport -- Transport answering from SimFrames
+
+Public functions:
+load_frames -- Read recorded frames from a JSON lines file
+"""
+import json
+from time import sleep
+from pixycamev3.pixy2 import (ticks_us, VECTOR_SIZE, INTERSECTION_SIZE, BARCODE_SIZE,
+                              LINE_MAX_INTERSECTION_LINES)
+
+# Pixy2 frame rate (color connected components and line tracking)
+SIM_FRAME_PERIOD_US = 16667
+
+# Serial error codes
+SER_ERROR_GENERAL = 255
+SER_ERROR_BUSY = 254
+SER_ERROR_INVALID_REQUEST = 253
+
+
+class SimFrame:
+    """ Blocks and line features of one camera frame.
+
+    Keyword arguments:
+    blocks        -- (sig, x, y, width, height, angle, tracking_index, age) tuples
+    vectors       -- (x0, y0, x1, y1, index, flags) tuples
+    intersections -- (x, y, [(index, angle), ...]) tuples
+    barcodes      -- (x, y, flags, code) tuples
+    """
+    __slots__ = ('blocks', 'vectors', 'intersections', 'barcodes')
+
+    def __init__(self, blocks=(), vectors=(), intersections=(), barcodes=()):
+        self.blocks = list(blocks)
+        self.vectors = list(vectors)
+        self.intersections = list(intersections)
+        self.barcodes = list(barcodes)
+
+
+def load_frames(path):
+    """ Read recorded frames, one JSON object per line with the SimFrame
+    keyword arguments as keys."""
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                frames.append(SimFrame(**json.loads(line)))
+    return frames
+
+
+def _int16(value):
+    """ Little endian bytes of a signed 16-bit value."""
+    value &= 0xFFFF
+    return [value & 0xFF, value >> 8]
+
+
+class SimulatedPixy2Transport:
+    """ Pixy2 transport answering requests from simulated frames.
+
+    Frames advance with every get_blocks or line tracking request, or with
+    time when frame_period_us is set. After the last frame the simulation
+    loops (loop=True) or keeps showing the last frame.
+
+    Keyword arguments:
+    frames          -- list of SimFrame (default: one empty frame)
+    width, height   -- frame resolution reported by get_resolution
+    latency_us      -- simulated time per I2C transaction
+    byte_us         -- simulated time per transferred byte
+    frame_period_us -- advance frames with time instead of per request
+    loop            -- restart at the first frame after the last one
+    clock           -- function returning microseconds (default ticks_us)
+    """
+    def __init__(self, frames=None, width=316, height=208, latency_us=0,
+                 byte_us=0, frame_period_us=None, loop=True, clock=None):
+        self.frames = frames if frames else [SimFrame()]
+        self.width = width
+        self.height = height
+        self.latency_us = latency_us
+        self.byte_us = byte_us
+        self.frame_period_us = frame_period_us
+        self.loop = loop
+        self.clock = clock if clock is not None else ticks_us
+        self._start_us = None
+        self.frame_index = -1
+        self.pending = bytearray()
+        self.errors = []
+        # State set by the driver
+        self.lamp = (0, 0)
+        self.mode = 0
+        self.next_turn = None
+        self.default_turn = None
+        # Bus statistics
+        self.transactions = 0
+        self.bytes = 0
+        self.requests = []
+        self.closed = False
+
+    def inject_error(self, code=SER_ERROR_BUSY, count=1):
+        """ Answer the next count requests with a serial error."""
+        self.errors.extend([code] * count)
+
+    def frame(self):
+        """ The frame the camera currently shows."""
+        return self.frames[max(self.frame_index, 0)]
+
+    def _advance(self):
+        """ Move to the frame for a new frame request."""
+        if self.frame_period_us is not None:
+            now = self.clock()
+            if self._start_us is None:
+                self._start_us = now
+            index = (now - self._start_us) // self.frame_period_us
+        else:
+            index = self.frame_index + 1
+        if self.loop:
+            index %= len(self.frames)
+        else:
+            index = min(index, len(self.frames) - 1)
+        self.frame_index = index
+        return self.frames[index]
+
+    def _transaction(self, nbytes):
+        """ Count a transaction and spend its simulated bus time."""
+        self.transactions += 1
+        self.bytes += nbytes
+        delay_us = self.latency_us + nbytes * self.byte_us
+        if delay_us:
+            sleep(delay_us / 1000000)
+
+    def write(self, data):
+        self._transaction(len(data))
+        request_type = data[2]
+        payload = data[4:4 + data[3]]
+        self.requests.append(request_type)
+        if self.errors:
+            self._respond(3, [self.errors.pop(0)])
+            return
+        handler = self._handlers.get(request_type)
+        if handler is None:
+            self._respond(3, [SER_ERROR_INVALID_REQUEST])
+        else:
+            handler(self, payload)
+
+    def read(self, length):
+        self._transaction(length)
+        data = bytes(self.pending[:length])
+        del self.pending[:length]
+        # An idle bus reads as zeros
+        return data + bytes(length - len(data))
+
+    def close(self):
+        self.closed = True
+
+    def _respond(self, response_type, payload):
+        """ Queue a response packet (no checksum, as read over I2C)."""
+        self.pending = bytearray([175, 193, response_type, len(payload), 0, 0])
+        self.pending.extend(payload)
+
+    def _result(self):
+        """ Queue a result response (type 1, int32 0)."""
+        self._respond(1, [0, 0, 0, 0])
+
+    def _version(self, payload):
+        # Hardware 0x2200, firmware 3.0.18, type 0
+        self._respond(15, [0x00, 0x22, 3, 0, 18, 0, 0])
+
+    def _resolution(self, payload):
+        self._respond(13, _int16(self.width) + _int16(self.height))
+
+    def _lamp(self, payload):
+        self.lamp = (payload[0], payload[1])
+        self._result()
+
+    def _set_mode(self, payload):
+        self.mode = payload[0]
+        self._result()
+
+    def _next_turn(self, payload):
+        self.next_turn = (payload[1] << 8 | payload[0]) - (0x10000 if payload[1] & 0x80 else 0)
+        self._result()
+
+    def _default_turn(self, payload):
+        self.default_turn = (payload[1] << 8 | payload[0]) - (0x10000 if payload[1] & 0x80 else 0)
+        self._result()
+
+    def _blocks(self, payload):
+        sigmap = payload[0]
+        max_blocks = payload[1]
+        data = []
+        count = 0
+        for sig, x, y, width, height, angle, index, age in self._advance().blocks:
+            if count >= max_blocks:
+                break
+            # Bits 0-6 select signatures 1-7, bit 7 all color codes
+            if not sigmap & (1 << (sig - 1) if sig <= 7 else 0x80):
+                continue
+            data += _int16(sig) + _int16(x) + _int16(y) + _int16(width) + _int16(height)
+            data += _int16(angle) + [index, age]
+            count += 1
+        self._respond(33, data)
+
+    def _linetracking(self, payload):
+        frame = self._advance()
+        # One feature per type holding all its records; intersections
+        # always have room for LINE_MAX_INTERSECTION_LINES branches
+        data = []
+        if frame.vectors:
+            data += [1, VECTOR_SIZE * len(frame.vectors)]
+            for vector in frame.vectors:
+                data += list(vector)
+        if frame.intersections:
+            data += [2, INTERSECTION_SIZE * len(frame.intersections)]
+            for x, y, branches in frame.intersections:
+                data += [x, y, len(branches), 0]
+                for index, angle in branches:
+                    data += [index, 0] + _int16(angle)
+                data += [0] * (4 * (LINE_MAX_INTERSECTION_LINES - len(branches)))
+        if frame.barcodes:
+            data += [4, BARCODE_SIZE * len(frame.barcodes)]
+            for x, y, flags, code in frame.barcodes:
+                data += [x, y, flags, code]
+        self._respond(49, data)
+
+    _handlers = {
+        14: _version,
+        12: _resolution,
+        22: _lamp,
+        54: _set_mode,
+        58: _next_turn,
+        60: _default_turn,
+        32: _blocks,
+        48: _linetracking,
+    }
@@ -14,6 +14,7 @@ class MockMotor:
         self._running = False
         self._target_angle = None
         self._target_speed = None
+        self._stall_angles = (-90, 90)  # Mechanical end-stops for run_until_stalled
         
     def run(self, speed):
         """Mock run method"""
@@ -27,6 +28,14 @@ class MockMotor:
         self._angle = angle  # Simulate reaching target
         self._running = False
         
+    def run_until_stalled(self, speed, then=None, duty_limit=None):
+        """Mock run_until_stalled method (stops at the matching end-stop)"""
+        low, high = self._stall_angles
+        self._angle = low if speed < 0 else high
+        self._speed = 0
+        self._running = False
+        return self._angle
+        
     def stop(self, stop_type=None):
         """Mock stop method"""
         self._speed = 0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the BlockTracker class using pytest
+"""
+
+import pytest
+from BlockTracker import BlockTracker
+from Pixy2Camera import Pixy2Camera
+from pixycamev3.simulator import SimFrame, SimulatedPixy2Transport
+
+class FakeBlock:
+    """Minimal Pixy2 block"""
+
+    def __init__(self, sig, tracking_index, x_center=100, y_center=80, width=20, height=20):
+        self.sig = sig
+        self.tracking_index = tracking_index
+        self.x_center = x_center
+        self.y_center = y_center
+        self.width = width
+        self.height = height
+        self.angle = 0
+        self.age = 1
+
+@pytest.fixture
+def tracker():
+    tracker = BlockTracker(move_threshold=2, lost_frames=2)
+    tracker.events = []
+    for event in ("appeared", "moved", "disappeared"):
+        tracker.on(event, lambda t, event=event: t.events.append(
+            (event, t.changed.sig, t.changed.tracking_index)))
+    return tracker
+
+class TestBlockTracker:
+
+    def test_appear(self, tracker):
+        """Test new blocks are added per signature and announced once"""
+        tracker.update([FakeBlock(1, 5), FakeBlock(2, 6)])
+        tracker.update([FakeBlock(1, 5), FakeBlock(2, 6)])
+
+        assert tracker.events == [("appeared", 1, 5), ("appeared", 2, 6)]
+        assert tracker.count == 2
+        assert tracker.get(2, 6).first_frame == 1
+        assert list(tracker.get_signature(1)) == [5]
+
+    def test_move_threshold(self, tracker):
+        """Test only changes of at least move_threshold pixels fire moved"""
+        tracker.update([FakeBlock(1, 5, x_center=100)])
+        tracker.update([FakeBlock(1, 5, x_center=101)])
+        tracker.update([FakeBlock(1, 5, x_center=103)])
+        tracker.update([FakeBlock(1, 5, x_center=103, height=30)])
+
+        assert tracker.events[1:] == [("moved", 1, 5), ("moved", 1, 5)]
+        assert tracker.get(1, 5).x_center == 103
+        assert tracker.get(1, 5).height == 30
+
+    def test_disappear_after_lost_frames(self, tracker):
+        """Test a block is reported gone only after lost_frames missing frames"""
+        tracker.update([FakeBlock(1, 5), FakeBlock(1, 7)])
+        tracker.update([FakeBlock(1, 7)])
+        assert tracker.get(1, 5) is not None
+
+        tracker.update([FakeBlock(1, 7)])
+        assert tracker.events[-1] == ("disappeared", 1, 5)
+        assert tracker.get(1, 5) is None
+        assert tracker.count == 1
+
+    def test_brief_dropout(self, tracker):
+        """Test a block missing for fewer than lost_frames frames keeps its entry"""
+        tracker.update([FakeBlock(1, 5)])
+        tracker.update([])
+        tracker.update([FakeBlock(1, 5)])
+        tracker.update([])
+
+        assert tracker.events == [("appeared", 1, 5)]
+        assert tracker.get(1, 5).missed == 1
+
+    def test_signature_events(self, tracker):
+        """Test signature specific events only fire for their signature"""
+        changes = []
+        tracker.on("appeared_2", lambda t: changes.append(t.changed.tracking_index))
+        tracker.update([FakeBlock(1, 5), FakeBlock(2, 6), FakeBlock(2, 8)])
+
+        assert changes == [6, 8]
+
+    def test_objects_are_reused(self, tracker):
+        """Test objects of disappeared blocks are reused for new blocks"""
+        tracker.update([FakeBlock(1, 5)])
+        obj = tracker.get(1, 5)
+        tracker.update([])
+        tracker.update([])
+        tracker.update([FakeBlock(3, 9)])
+
+        assert tracker.get(3, 9) is obj
+
+    def test_clear(self, tracker):
+        """Test clear() forgets blocks without events"""
+        tracker.update([FakeBlock(1, 5)])
+        tracker.clear()
+
+        assert tracker.count == 0
+        assert tracker.get(1, 5) is None
+        assert tracker.events == [("appeared", 1, 5)]
+
+class TestPixy2CameraTracking:
+
+    def test_multi_signature_events(self):
+        """Test the camera fetches all signatures and fires per-signature events"""
+        frames = [SimFrame(blocks=[(1, 100, 80, 20, 20, 0, 1, 1), (2, 200, 80, 20, 20, 0, 2, 1),
+                                   (3, 50, 50, 20, 20, 0, 3, 1)]),
+                  SimFrame(blocks=[(2, 210, 80, 20, 20, 0, 2, 2)])]
+        camera = Pixy2Camera(transport=SimulatedPixy2Transport(frames, loop=False),
+                             sigmap=0b011, max_blocks=4)
+        camera.tracker.lost_frames = 1
+        appeared = []
+        moved = []
+        gone = []
+        camera.onBlockAppeared(lambda t: appeared.append(t.changed.sig))
+        camera.onBlockMoved(lambda t: moved.append(t.changed.x_center), sig=2)
+        camera.onBlockDisappeared(lambda t: gone.append(t.changed.sig), sig=1)
+
+        camera.poll()
+        camera.poll()
+
+        assert appeared == [1, 2]
+        assert moved == [210]
+        assert gone == [1]
+
+# Tests can be run with: pytest tests/test_block_tracker.py
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the DriveLoop class using pytest
+"""
+
+import pytest
+from DriveLoop import DriveLoop
+from MotionQueue import drive_distance
+from TankDriveSystem import TankDriveSystem
+
+class CountingSystem:
+    """Drive system stand-in that counts its ticks and can fail"""
+
+    def __init__(self):
+        self.ticks = 0
+        self.stops = 0
+        self.error = None
+
+    def drive_tick(self):
+        self.ticks += 1
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        self.stops += 1
+
+class TestDriveLoop:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_motors):
+        """Set up test fixtures"""
+        self.device_manager, self.left_motor, self.right_motor = device_manager_with_motors
+        self.tank_drive = TankDriveSystem(self.device_manager)
+        self.tank_drive.initialize()
+        self.other = CountingSystem()
+        self.loop = DriveLoop()
+        self.loop.add(self.tank_drive)
+        self.loop.add(self.other)
+
+    def fail_encoder(self):
+        def angle():
+            raise OSError(5, "EIO")
+        self.left_motor.angle = angle
+
+    def test_tick_calls_every_system(self):
+        """Test one pass ticks every registered system"""
+        self.loop.tick()
+        self.loop.tick()
+        assert self.other.ticks == 2
+        assert self.loop.ticks == 2
+
+    def test_failing_system_is_stopped(self):
+        """Test a raising system is stopped, ending its motion, while the others keep ticking"""
+        self.tank_drive.enqueue_motions([drive_distance(500, 500)])
+        self.loop.tick()
+        assert self.left_motor._speed == -500
+
+        self.fail_encoder()
+        self.loop.tick()
+        self.loop.tick()
+
+        assert self.left_motor._speed == 0
+        assert self.right_motor._speed == 0
+        assert not self.tank_drive.is_motion_active()
+        assert self.other.ticks == 3
+        assert self.loop.errors == 1
+
+    def test_repeated_failures_reported_once(self, capsys):
+        """Test a system failing on every tick is reported and stopped once until it recovers"""
+        self.other.error = OSError(5, "EIO")
+        for _ in range(3):
+            self.loop.tick()
+        assert self.loop.errors == 3
+        assert self.other.stops == 1
+        assert capsys.readouterr().out.count("EXCEPTION") == 1
+
+        self.other.error = None
+        self.loop.tick()
+        self.other.error = OSError(5, "EIO")
+        self.loop.tick()
+        assert self.other.stops == 2
+        assert capsys.readouterr().out.count("EXCEPTION") == 1
+
+# Tests can be run with: pytest tests/test_drive_loop.py
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the offline drive simulator using pytest
+"""
+
+import math
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from TankDriveSystem import TankDriveSystem
+from tools.drive_simulator import (StickTrace, step_trace, param_grid, simulate,
+                                   mix_joystick, mix_steering, apply_deadzone,
+                                   MIX_STEERING)
+
+class TestDriveSimulator:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_motors):
+        """Set up test fixtures"""
+        self.device_manager, self.mock_left_motor, self.mock_right_motor = device_manager_with_motors
+        self.tank_drive = TankDriveSystem(self.device_manager)
+        self.tank_drive.initialize()
+        self.rng = random.Random(1)
+
+    def test_joystick_mixing_matches_tank_drive(self):
+        """Test vectorized joystick mixing reproduces TankDriveSystem exactly"""
+        inputs = [(self.rng.randint(-1500, 1500), self.rng.randint(-1500, 1500)) for _ in range(200)]
+        inputs += [(0, 0), (1000, 1000), (-1000, 1000)]
+        forward = np.array([f for f, _ in inputs], dtype=float)
+        turn = np.array([t for _, t in inputs], dtype=float)
+        left, right = mix_joystick(forward, turn, self.tank_drive.turn_mix_factor)
+
+        for i, (f, t) in enumerate(inputs):
+            self.tank_drive.joystick_control(f, t)
+            assert left[i] == pytest.approx(self.mock_left_motor._speed)
+            assert right[i] == pytest.approx(self.mock_right_motor._speed)
+
+    def test_steering_mixing_matches_tank_drive(self):
+        """Test vectorized steering mixing reproduces move_with_steering exactly"""
+        inputs = [(self.rng.randint(-1000, 1000), self.rng.randint(-1000, 1000)) for _ in range(200)]
+        inputs += [(500, 0), (500, 20), (-700, -1000)]
+        drive = np.array([d for d, _ in inputs], dtype=float)
+        steer = np.array([s for _, s in inputs], dtype=float)
+        left, right = mix_steering(drive, steer, self.tank_drive.steering_sensitivity)
+
+        for i, (d, s) in enumerate(inputs):
+            self.tank_drive.move_with_steering(d, s)
+            assert left[i] == self.mock_left_motor._speed
+            assert right[i] == self.mock_right_motor._speed
+
+    def test_deadzone(self):
+        """Test stick deadzone and sign inversion from main.move"""
+        forward, turn = apply_deadzone(np.array([150.0, 300.0]), np.array([-250.0, 50.0]), 200)
+        assert list(forward) == [0.0, -300.0]
+        assert list(turn) == [250.0, 0.0]
+
+    def test_straight_trace_drives_straight(self):
+        """Test a pure forward stick keeps heading and lateral position"""
+        result = simulate(step_trace(forward=800, left=0))
+        assert result.y[0] == pytest.approx(0.0)
+        assert result.heading[0] == pytest.approx(0.0)
+        assert abs(result.x[0]) > 100
+        assert math.isinf(result.metrics["min_turn_radius_mm"][0])
+
+    def test_grid_shapes_and_turn_radius(self):
+        """Test a parameter grid yields one result per combination and mixing affects radius"""
+        grid = param_grid(turn_mix_factor=[0.4, 0.8], deadzone=[100, 200, 300])
+        result = simulate(step_trace(forward=800, left=400, duration=4.0), grid, record_trajectory=True)
+
+        assert len(result) == 6
+        assert result.trajectory.shape == (6, 200, 3)
+        radius = result.metrics["mean_turn_radius_mm"]
+        # Index 0: factor 0.4, deadzone 100 / index 3: factor 0.8, deadzone 100
+        assert radius[3] < radius[0]
+
+    def test_slew_limit_slows_response(self):
+        """Test a slew limit increases the rise time"""
+        result = simulate(step_trace(forward=800), {"slew_limit": [0, 1000]})
+        rise = result.metrics["rise_time_s"]
+        assert rise[1] > rise[0]
+
+    def test_steering_mode(self):
+        """Test the steering mixing mode runs"""
+        result = simulate(step_trace(forward=800, left=300), {"steering_sensitivity": [1.0, 3.0]},
+                          mode=MIX_STEERING)
+        assert len(result) == 2
+
+    def test_trace_from_csv(self, tmp_path):
+        """Test loading a recorded trace"""
+        path = tmp_path / "session.csv"
+        path.write_text("t,l_forward,l_left\n0.0,0,0\n0.02,500,-300\n0.04,500,-300\n")
+        trace = StickTrace.from_csv(str(path))
+        assert len(trace) == 3
+        assert trace.l_left[1] == -300
+
+# Tests can be run with: pytest tests/test_drive_simulator.py
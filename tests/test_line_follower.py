@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the LineFollower class using pytest
+"""
+
+import pytest
+from TankDriveSystem import TankDriveSystem
+from LineFollower import LineFollower
+from pixycamev3.pixy2 import Pixy2
+from pixycamev3.simulator import SimFrame, SimulatedPixy2Transport
+
+def line_frame(x1, intersection=False):
+    """Frame with a primary vector whose head is at column x1"""
+    intersections = [(x1, 5, [(1, 90), (2, -90)])] if intersection else []
+    return SimFrame(vectors=[(39, 51, x1, 5, 1, 0)], intersections=intersections)
+
+class TestLineFollower:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_motors):
+        """Set up test fixtures"""
+        self.device_manager, self.left_motor, self.right_motor = device_manager_with_motors
+        self.tank_drive = TankDriveSystem(self.device_manager)
+        self.tank_drive.initialize()
+
+    def follower(self, frames, **kwargs):
+        self.transport = SimulatedPixy2Transport(frames, loop=False)
+        return LineFollower(self.tank_drive, Pixy2(transport=self.transport), **kwargs)
+
+    def test_centered_line_drives_straight(self):
+        """Test a centered line drives both tracks forward at base speed"""
+        follower = self.follower([line_frame(39)], base_speed=400)
+
+        assert follower.step(0)
+        assert self.left_motor._speed == -400
+        assert self.right_motor._speed == -400
+
+    def test_line_to_the_right(self):
+        """Test a line right of center speeds up the left track and slows down"""
+        follower = self.follower([line_frame(59)], base_speed=400, kp=10, kd=0)
+        follower.step(0)
+
+        # Error 20 px: correction 200, speed 400 * (1 - 0.5 * 20 / 39)
+        assert -self.left_motor._speed > -self.right_motor._speed
+        assert -self.left_motor._speed - -self.right_motor._speed == pytest.approx(400, abs=1)
+        assert -self.left_motor._speed + -self.right_motor._speed < 800
+
+    def test_derivative_damps_correction(self):
+        """Test a shrinking error reduces the correction"""
+        follower = self.follower([line_frame(59), line_frame(49)], kp=10, kd=1.0)
+        follower.step(0)
+        follower.step(16667)
+
+        # P: 10 * 10 px = 100, D: 1.0 * -10 px / 0.016667 s = -600
+        # The net correction turns left, against the remaining error
+        assert self.left_motor._speed - self.right_motor._speed == pytest.approx(1000, abs=2)
+
+    def test_lost_line_stops(self):
+        """Test the robot stops once the line has been missing for the timeout"""
+        follower = self.follower([line_frame(39), SimFrame()], lost_timeout=0.1)
+        follower.step(0)
+        assert not follower.step(50000)
+        assert self.left_motor._speed != 0
+
+        follower.step(150000)
+        assert self.left_motor._speed == 0
+        assert follower.get_stats()["lost_stops"] == 1
+
+    def test_turn_plan_at_intersections(self):
+        """Test the next planned turn is sent once per intersection"""
+        frames = [line_frame(39), line_frame(39, True), line_frame(39, True),
+                  line_frame(39), line_frame(39, True)]
+        follower = self.follower(frames, turn_plan=[90, 0, -90])
+        follower.start_turn_plan()
+        assert self.transport.next_turn == 90
+
+        turns = []
+        for i in range(5):
+            follower.step(i * 16667)
+            turns.append(self.transport.next_turn)
+
+        assert turns == [90, 0, 0, 0, -90]
+        assert follower.intersections == 2
+
+    def test_camera_error_counts_as_no_line(self):
+        """Test a camera error is counted and does not raise"""
+        follower = self.follower([line_frame(39)])
+        self.transport.inject_error(253)
+
+        assert not follower.step(0)
+        assert follower.errors == 1
+
+    def test_heading_hold_paused_while_following(self):
+        """Test heading hold does not fight the PD output and is restored afterwards"""
+        self.tank_drive.enable_heading_hold()
+        follower = self.follower([line_frame(39)], base_speed=400)
+        follower.begin()
+        assert not self.tank_drive.heading_hold_enabled
+
+        follower.step(0)
+        self.left_motor._angle = 100
+        self.tank_drive.drive_tick()
+        assert self.left_motor._speed == self.right_motor._speed == -400
+
+        follower.end()
+        assert self.tank_drive.heading_hold_enabled
+        assert self.left_motor._speed == 0
+
+    def test_run_restores_heading_hold(self):
+        """Test a stopped run leaves heading hold as it found it"""
+        self.tank_drive.enable_heading_hold()
+        follower = self.follower([line_frame(39)])
+        follower.stop()
+        follower.run()
+        assert self.tank_drive.heading_hold_enabled
+
+        self.tank_drive.disable_heading_hold()
+        follower.run()
+        assert not self.tank_drive.heading_hold_enabled
+
+    def test_lap_stats(self):
+        """Test loop timing and lateral error statistics"""
+        follower = self.follower([line_frame(49), line_frame(29)])
+        follower.start_lap(0)
+        follower.step(0)
+        follower.step(16667)
+
+        stats = follower.get_stats(1000000)
+        assert stats["elapsed_s"] == 1.0
+        assert stats["frames"] == 2
+        assert stats["loop_rate"] == pytest.approx(2.0)
+        assert stats["line_frames"] == 2
+        assert stats["rms_error"] == pytest.approx(10.0)
+        assert stats["max_error"] == 10.0
+        assert stats["max_loop_us"] >= stats["avg_loop_us"]
+
+        follower.start_lap()
+        assert follower.get_stats()["frames"] == 0
+
+# Tests can be run with: pytest tests/test_line_follower.py
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the motion primitive queue using pytest
+"""
+
+import math
+import pytest
+from MotionQueue import (DRIVE, PIVOT, ARC, WAIT, drive_distance, pivot_angle,
+                         arc, wait, parse_motion_sequence)
+from TankDriveSystem import TankDriveSystem
+
+class TestParseMotionSequence:
+
+    def test_parse_all_kinds(self):
+        """Test parsing a sequence with every primitive kind"""
+        primitives = parse_motion_sequence("drive:300:500; pivot:-90:400;arc:200:45:600;wait:250")
+
+        assert [p.kind for p in primitives] == [DRIVE, PIVOT, ARC, WAIT]
+        assert primitives[0].distance == 300 and primitives[0].speed == 500
+        assert primitives[1].angle == -90 and primitives[1].speed == 400
+        assert primitives[2].distance == 200 and primitives[2].angle == 45
+        assert primitives[3].duration == 250
+
+    def test_parse_empty(self):
+        """Test an empty sequence parses to no primitives"""
+        assert parse_motion_sequence("") == []
+
+    @pytest.mark.parametrize("text", ["jump:10", "drive:10", "drive:a:b", "wait:1:2"])
+    def test_parse_invalid(self, text):
+        """Test malformed steps raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_motion_sequence(text)
+
+class TestMotionQueue:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_motors):
+        """Set up test fixtures"""
+        self.device_manager, self.mock_left_motor, self.mock_right_motor = device_manager_with_motors
+        self.tank_drive = TankDriveSystem(self.device_manager)
+        self.tank_drive.initialize()
+        self.degrees_per_mm = 360.0 / (math.pi * self.tank_drive.wheel_diameter)
+
+    def advance(self, left_mm, right_mm):
+        """Advance the mock encoders by a forward travel in mm (forward is negative)"""
+        self.mock_left_motor._angle -= left_mm * self.degrees_per_mm
+        self.mock_right_motor._angle -= right_mm * self.degrees_per_mm
+
+    def test_drive_distance_runs_until_encoder_target(self):
+        """Test a drive primitive runs until the encoders reach the target"""
+        self.tank_drive.enqueue_motion(drive_distance(100, 500))
+        self.tank_drive.drive_tick()
+
+        assert self.mock_left_motor._speed == -500
+        assert self.mock_right_motor._speed == -500
+
+        self.advance(60, 60)
+        self.tank_drive.drive_tick()
+        assert self.tank_drive.is_motion_active()
+
+        self.advance(41, 41)
+        self.tank_drive.drive_tick()
+        assert not self.tank_drive.is_motion_active()
+        assert self.tank_drive.completed_motions == 1
+        assert self.mock_left_motor._speed == 0
+        assert self.mock_right_motor._speed == 0
+
+    def test_backward_drive(self):
+        """Test a negative distance drives backward"""
+        self.tank_drive.enqueue_motion(drive_distance(-100, 500))
+        self.tank_drive.drive_tick()
+
+        assert self.mock_left_motor._speed == 500
+        assert self.mock_right_motor._speed == 500
+
+    def test_pivot_left(self):
+        """Test a positive pivot runs the tracks in opposite directions"""
+        self.tank_drive.enqueue_motion(pivot_angle(90, 400))
+        self.tank_drive.drive_tick()
+
+        assert self.mock_left_motor._speed == 400
+        assert self.mock_right_motor._speed == -400
+
+    def test_arc_speed_ratio(self):
+        """Test an arc runs the outer track at speed and scales the inner one"""
+        half_track = self.tank_drive.track_width / 2
+        radius = 2 * half_track
+        self.tank_drive.enqueue_motion(arc(radius, -90, 600))
+        self.tank_drive.drive_tick()
+
+        # Right turn: left track is the outer one
+        assert self.mock_left_motor._speed == -600
+        assert self.mock_right_motor._speed == pytest.approx(-600 * (radius - half_track) / (radius + half_track), abs=1)
+
+    def test_sequence_runs_back_to_back(self):
+        """Test the next primitive starts in the same tick the previous one ends"""
+        self.tank_drive.enqueue_motions([drive_distance(50, 500), pivot_angle(-45, 300)])
+        self.tank_drive.drive_tick()
+        self.advance(50, 50)
+        self.tank_drive.drive_tick()
+
+        assert self.tank_drive.completed_motions == 1
+        assert self.mock_left_motor._speed == -300
+        assert self.mock_right_motor._speed == 300
+
+    def test_wait_primitive(self):
+        """Test a zero length wait completes on the next tick"""
+        self.tank_drive.enqueue_motions([wait(0), drive_distance(50, 500)])
+        self.tank_drive.drive_tick()
+        assert self.mock_left_motor._speed == 0
+
+        self.tank_drive.drive_tick()
+        assert self.tank_drive.completed_motions == 1
+        assert self.mock_left_motor._speed == -500
+
+    def test_flush_stops_motion(self):
+        """Test flushing drops the queue and stops the robot"""
+        self.tank_drive.enqueue_motions([drive_distance(500, 500), pivot_angle(90, 300)])
+        self.tank_drive.drive_tick()
+        self.tank_drive.flush_motions()
+
+        assert not self.tank_drive.is_motion_active()
+        assert self.mock_left_motor._speed == 0
+        assert self.mock_right_motor._speed == 0
+
+    def test_preempt_replaces_sequence(self):
+        """Test preempting replaces the running primitive on the next tick"""
+        self.tank_drive.enqueue_motions([drive_distance(500, 500), drive_distance(500, 500)])
+        self.tank_drive.drive_tick()
+        self.tank_drive.preempt_motions([pivot_angle(90, 300)])
+        self.tank_drive.drive_tick()
+
+        assert self.mock_left_motor._speed == 300
+        assert self.mock_right_motor._speed == -300
+        assert self.tank_drive.completed_motions == 0
+
+    def test_stalled_motion_times_out(self):
+        """Test a primitive whose encoders never move is abandoned after its timeout"""
+        self.tank_drive.enqueue_motion(drive_distance(100, 500))
+        self.tank_drive.drive_tick()
+        self.tank_drive._motion_timeout_us = 0
+        self.tank_drive.drive_tick()
+
+        assert self.tank_drive.motion_timeouts == 1
+        assert not self.tank_drive.is_motion_active()
+
+# Tests can be run with: pytest tests/test_motion_queue.py
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for Odometry class using pytest
+"""
+
+import math
+import pytest
+from Odometry import Odometry, table_sin, table_cos
+
+class TestOdometry:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_motors):
+        """Set up test fixtures"""
+        self.device_manager, self.mock_left_motor, self.mock_right_motor = device_manager_with_motors
+        self.odometry = Odometry(self.device_manager, wheel_diameter=40.0, track_width=100.0)
+
+    def drive_encoders(self, left_delta, right_delta):
+        """Advance both mock encoders (forward is negative on this robot)"""
+        self.mock_left_motor._angle -= left_delta
+        self.mock_right_motor._angle -= right_delta
+
+    @pytest.mark.parametrize("angle", [0, 1, 30, 45.5, 89.9, 90, 135, 180, 225, 270, 315, 359.5, -45, 720])
+    def test_table_trig_matches_math(self, angle):
+        """Test table based sine/cosine against the math module"""
+        assert table_sin(angle) == pytest.approx(math.sin(math.radians(angle)), abs=1e-4)
+        assert table_cos(angle) == pytest.approx(math.cos(math.radians(angle)), abs=1e-4)
+
+    def test_initial_pose(self):
+        """Test odometry starts at the origin"""
+        assert self.odometry.is_available()
+        assert self.odometry.get_pose() == (0.0, 0.0, 0.0)
+
+    def test_straight_forward(self):
+        """Test one wheel revolution forward moves one circumference along x"""
+        self.drive_encoders(360, 360)
+        self.odometry.sample()
+
+        x, y, heading = self.odometry.get_pose()
+        assert x == pytest.approx(math.pi * 40.0)
+        assert y == pytest.approx(0.0)
+        assert heading == pytest.approx(0.0)
+
+    def test_pivot_in_place(self):
+        """Test opposite track motion rotates without translating"""
+        # Arc length per track for a 90 degree pivot: pi/2 * (W/2)
+        wheel_degrees = (math.pi / 2 * 50.0) / (math.pi * 40.0) * 360
+        self.drive_encoders(-wheel_degrees, wheel_degrees)
+        self.odometry.sample()
+
+        x, y, heading = self.odometry.get_pose()
+        assert x == pytest.approx(0.0, abs=1e-6)
+        assert y == pytest.approx(0.0, abs=1e-6)
+        assert heading == pytest.approx(90.0)
+
+    def test_incremental_arc(self):
+        """Test integrating many small samples around a quarter circle"""
+        radius = 200.0
+        steps = 90
+        outer = (radius + 50.0) * (math.pi / 2) / steps
+        inner = (radius - 50.0) * (math.pi / 2) / steps
+        degrees_per_mm = 360 / (math.pi * 40.0)
+        for _ in range(steps):
+            self.drive_encoders(inner * degrees_per_mm, outer * degrees_per_mm)
+            self.odometry.sample()
+
+        x, y, heading = self.odometry.get_pose()
+        assert x == pytest.approx(radius, rel=1e-3)
+        assert y == pytest.approx(radius, rel=1e-3)
+        assert heading == pytest.approx(90.0)
+        assert self.odometry.samples == steps
+
+    def test_reset(self):
+        """Test reset sets the pose and rebases the encoders"""
+        self.drive_encoders(500, 200)
+        self.odometry.reset(10, 20, 450)
+        self.odometry.sample()
+
+        assert self.odometry.get_pose() == (10.0, 20.0, 90.0)
+
+    def test_get_pose_is_snapshot(self):
+        """Test get_pose returns a stable snapshot that later samples don't mutate"""
+        self.drive_encoders(100, 100)
+        self.odometry.sample()
+        pose = self.odometry.get_pose()
+
+        self.drive_encoders(100, 100)
+        self.odometry.sample()
+
+        assert pose != self.odometry.get_pose()
+        assert pose[0] == pytest.approx(math.pi * 40.0 * 100 / 360)
+
+    def test_without_motors(self, device_manager_empty):
+        """Test odometry without drive motors does nothing"""
+        odometry = Odometry(device_manager_empty)
+        assert not odometry.is_available()
+        assert odometry.sample() is False
+        assert odometry.get_pose() == (0.0, 0.0, 0.0)
+
+# Tests can be run with: pytest tests/test_odometry.py
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the parallel parameter sweep using pytest
+"""
+
+import csv
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tools.drive_simulator import param_grid, simulate, simulate_turret, step_trace
+from tools.parameter_sweep import (parse_values, parse_assignments, random_search,
+                                   score_chunk, run_sweep, write_results)
+
+SESSION_CSV = "t,l_forward,l_left,r_left\n" + "".join(
+    "{:.2f},{},{},{}\n".format(i * 0.02, 0 if i < 5 else 600, 0, 0 if i < 10 else -800)
+    for i in range(60))
+
+class TestParameterSweep:
+
+    @pytest.fixture
+    def session_path(self, tmp_path):
+        """Write a small recorded session"""
+        path = tmp_path / "session.csv"
+        path.write_text(SESSION_CSV)
+        return str(path)
+
+    def test_parse_values(self):
+        """Test linspace and list grid specs"""
+        assert list(parse_values("0:100:3")) == [0.0, 50.0, 100.0]
+        assert list(parse_values("1,2.5")) == [1.0, 2.5]
+
+    def test_unknown_parameter(self):
+        """Test an unknown parameter name is rejected"""
+        with pytest.raises(ValueError):
+            parse_assignments(["wheel_size=1,2"], parse_values)
+
+    def test_random_search_in_range(self):
+        """Test random samples stay inside their ranges and are reproducible"""
+        first = random_search({"deadzone": (50, 300)}, 100, seed=3)
+        second = random_search({"deadzone": (50, 300)}, 100, seed=3)
+        assert np.all((first["deadzone"] >= 50) & (first["deadzone"] <= 300))
+        assert np.array_equal(first["deadzone"], second["deadzone"])
+
+    def test_turret_simulation(self):
+        """Test the turret follows the right stick and reports soft-limit overruns"""
+        trace = step_trace(forward=0, left=0, duration=3.0)
+        trace.r_left = np.full(len(trace), 60.0)
+        result = simulate_turret(trace, {"turret_max_speed": [30, 360]})
+        assert 0 < result.x[0] < result.x[1]
+        violation = result.metrics["turret_limit_violation_deg"]
+        assert violation[0] == 0.0
+        assert violation[1] > 0.0
+
+    def test_turret_deadzone_hysteresis(self):
+        """Test a stick resting between the exit and entry deadzones keeps the turret running"""
+        trace = step_trace(forward=0, left=0, duration=1.0)
+        trace.r_left = np.full(len(trace), 45.0)
+        trace.r_left[:5] = 60.0
+        result = simulate_turret(trace, {"turret_deadzone_exit": [40, 50]})
+        assert result.x[0] > 2 * result.x[1] > 0
+
+    def test_turret_slows_at_soft_limit(self):
+        """Test the soft-limit slow-down keeps the overrun to motor lag"""
+        trace = step_trace(forward=0, left=0, duration=3.0)
+        trace.r_left = np.full(len(trace), 100.0)
+        result = simulate_turret(trace, {"turret_limit_zone": [20, 1e-6]})
+        violation = result.metrics["turret_limit_violation_deg"]
+        assert 0 < violation[0] < violation[1]
+
+    def test_reference_scores_matching_params_best(self):
+        """Test a session recorded with known parameters ranks those parameters first"""
+        trace = step_trace(forward=800, left=300, duration=3.0)
+        recorded = simulate(trace, {"turn_mix_factor": [0.6]}, record_trajectory=True)
+        trace.reference = {"x": recorded.trajectory[0, :, 0], "y": recorded.trajectory[0, :, 1]}
+
+        combinations = {"turn_mix_factor": np.array([0.3, 0.6, 0.9])}
+        score, metrics = score_chunk(combinations, [trace])
+        assert np.argmin(score) == 1
+        assert metrics["path_error_mm"][1] == pytest.approx(0.0, abs=1e-6)
+
+    def test_pool_matches_in_process(self, session_path):
+        """Test pooled chunks produce the same scores as an in-process run"""
+        combinations = param_grid(deadzone=[100, 200, 300], turret_max_speed=[180, 360])
+        serial, _ = run_sweep(combinations, [session_path], workers=1, chunk_size=2)
+        pooled, metrics = run_sweep(combinations, [session_path], workers=2, chunk_size=2)
+        assert np.allclose(serial, pooled)
+        assert "turret_tracking_rms" in metrics
+
+    def test_ranked_table(self, tmp_path, session_path):
+        """Test the results table is written best first"""
+        combinations = param_grid(deadzone=[100, 300])
+        score, metrics = run_sweep(combinations, [session_path], workers=1)
+        out = tmp_path / "results.csv"
+        write_results(str(out), combinations, score, metrics)
+
+        with open(str(out)) as f:
+            rows = list(csv.DictReader(f))
+        assert [row["rank"] for row in rows] == ["1", "2"]
+        assert float(rows[0]["score"]) <= float(rows[1]["score"])
+
+# Tests can be run with: pytest tests/test_parameter_sweep.py
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the Pixy2 driver using pytest
+"""
+
+import pytest
+import pixycamev3.pixy2 as pixy2
+from pixycamev3.simulator import SimFrame, SimulatedPixy2Transport, load_frames, SER_ERROR_BUSY
+from pixycamev3.pixy2 import (Pixy2, PlatformError, Pixy2CommunicationError, Pixy2DataError,
+                              Pixy2ConnectionError, MAX_REQUEST_ATTEMPTS, BREAKER_THRESHOLD,
+                              STATS_SLOTS)
+
+def block_bytes(sig, x, y, width, height, angle, index, age):
+    """Encode one block as in a get_blocks payload"""
+    angle &= 0xFFFF
+    return bytes([sig & 0xFF, sig >> 8, x & 0xFF, x >> 8, y & 0xFF, y >> 8,
+                  width & 0xFF, width >> 8, height & 0xFF, height >> 8,
+                  angle & 0xFF, angle >> 8, index, age])
+
+class ScriptedTransport:
+    """Transport that records writes and serves reads from a byte script"""
+
+    def __init__(self, responses=b""):
+        self.written = []
+        self.reads = []
+        self.buffer = bytearray(responses)
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def read(self, length):
+        self.reads.append(length)
+        data = self.buffer[:length]
+        del self.buffer[:length]
+        return data
+
+class TestPixy2Platform:
+
+    def test_import_does_not_detect_platform(self):
+        """Test importing the driver does not scan the platform"""
+        assert pixy2.PLF is None
+
+    def test_transport_skips_detection(self):
+        """Test a Pixy2 with an explicit transport works off-brick"""
+        transport = ScriptedTransport(bytes([175, 193, 13, 4, 0, 0, 60, 1, 208, 0]))
+        pixy = Pixy2(transport=transport)
+        resolution = pixy.get_resolution()
+
+        assert resolution.width == 316
+        assert resolution.height == 208
+        assert transport.written == [bytes([174, 193, 12, 1, 0])]
+        assert pixy2.PLF is None
+
+    @pytest.mark.skipif(pixy2.os.path.isdir(pixy2.BOARD_INFO_DIR), reason="Running on an EV3")
+    def test_detection_on_first_construction(self):
+        """Test platform detection happens when the bus is first needed"""
+        with pytest.raises(PlatformError):
+            Pixy2()
+
+class TestPixy2Blocks:
+
+    def test_get_blocks_bulk_read(self):
+        """Test all blocks are read in as few payload transactions as possible"""
+        payload = b"".join(block_bytes(1, 10 * i, 100 + i, 20, 30, 0, i, 5) for i in range(5))
+        transport = ScriptedTransport(bytes([175, 193, 33, len(payload), 0, 0]) + payload)
+        pixy = Pixy2(transport=transport)
+
+        count, blocks = pixy.get_blocks(1, 5)
+
+        assert count == 5
+        assert transport.reads == [6, 32, 32, 6]
+        assert [b.x_center for b in blocks] == [0, 10, 20, 30, 40]
+        assert blocks[4].y_center == 104
+        assert blocks[3].tracking_index == 3
+        assert blocks[2].age == 5
+
+    def test_get_blocks_single_read(self):
+        """Test a payload within the I2C limit is read in one transaction"""
+        payload = block_bytes(2, 300, 150, 40, 50, 0, 7, 9) * 2
+        transport = ScriptedTransport(bytes([175, 193, 33, len(payload), 0, 0]) + payload)
+        count, blocks = Pixy2(transport=transport).get_blocks(3, 2)
+
+        assert count == 2
+        assert transport.reads == [6, 28]
+        assert blocks[1].sig == 2 and blocks[1].x_center == 300
+
+    def test_get_blocks_none_detected(self):
+        """Test an empty frame does no payload read"""
+        transport = ScriptedTransport(bytes([175, 193, 33, 0, 0, 0]))
+        count, blocks = Pixy2(transport=transport).get_blocks(1, 1)
+
+        assert count == 0
+        assert blocks == []
+        assert transport.reads == [6]
+
+class TestPixy2BlockPool:
+
+    def frame(self, *blocks):
+        payload = b"".join(blocks)
+        return bytes([175, 193, 33, len(payload), 0, 0]) + payload
+
+    def test_blocks_reused_across_frames(self):
+        """Test steady-state polling refills the same Block records and list"""
+        transport = ScriptedTransport(self.frame(block_bytes(1, 10, 20, 5, 5, 0, 1, 1)) +
+                                      self.frame(block_bytes(1, 30, 40, 5, 5, 0, 1, 2)))
+        pixy = Pixy2(transport=transport)
+
+        _, first = pixy.get_blocks(1, 1)
+        first_block = first[0]
+        _, second = pixy.get_blocks(1, 1)
+
+        assert second is first
+        assert second[0] is first_block
+        assert first_block.x_center == 30
+        assert first_block.age == 2
+
+    def test_pool_grows_and_list_shrinks(self):
+        """Test the pool grows on demand and the list holds only this frame's blocks"""
+        transport = ScriptedTransport(self.frame(*[block_bytes(1, i, 0, 5, 5, 0, i, 0) for i in range(3)]) +
+                                      self.frame(block_bytes(1, 99, 0, 5, 5, 0, 9, 0)))
+        pixy = Pixy2(transport=transport)
+
+        assert pixy.get_blocks(1, 3)[0] == 3
+        count, blocks = pixy.get_blocks(1, 3)
+        assert count == 1
+        assert len(blocks) == 1
+        assert blocks[0].x_center == 99
+
+    def test_signed_angle(self):
+        """Test the color code angle decodes as a signed 16-bit value"""
+        transport = ScriptedTransport(self.frame(block_bytes(10, 0, 0, 5, 5, -45, 0, 0),
+                                                 block_bytes(10, 0, 0, 5, 5, 170, 1, 0)))
+        _, blocks = Pixy2(transport=transport).get_blocks(255, 2)
+        assert blocks[0].angle == -45
+        assert blocks[1].angle == 170
+
+    def test_slotted_records(self):
+        """Test records have no per-instance dict"""
+        for record in (pixy2.Block(), pixy2.Vector(), pixy2.Intersection(), pixy2.Branch(), pixy2.Barcode()):
+            assert not hasattr(record, "__dict__")
+
+class TestPixy2Requests:
+
+    ACK = bytes([175, 193, 1, 4, 0, 0])
+
+    @pytest.mark.parametrize("angle,expected", [
+        (0, [0, 0]),
+        (90, [90, 0]),
+        (-90, [0xA6, 0xFF]),
+        (-180, [0x4C, 0xFF]),
+    ])
+    def test_turn_angle_encoding(self, angle, expected):
+        """Test turn angles are sent as signed 16-bit little endian"""
+        transport = ScriptedTransport(self.ACK * 2)
+        pixy = Pixy2(transport=transport)
+        pixy.set_next_turn(angle)
+        pixy.set_default_turn(angle)
+
+        assert transport.written[0] == bytes([174, 193, 58, 2] + expected)
+        assert transport.written[1] == bytes([174, 193, 60, 2] + expected)
+
+    def test_parameterized_requests_reuse_templates(self):
+        """Test parameterized requests are written into reusable templates"""
+        transport = ScriptedTransport(self.ACK * 2)
+        pixy = Pixy2(transport=transport)
+        template = pixy._request_lamp
+        pixy.set_lamp(1, 0)
+        pixy.set_lamp(0, 1)
+
+        assert transport.written == [bytes([174, 193, 22, 2, 1, 0]), bytes([174, 193, 22, 2, 0, 1])]
+        assert pixy._request_lamp is template
+
+    def test_get_blocks_request(self):
+        """Test the sigmap and max_blocks are sent in the request"""
+        transport = ScriptedTransport(bytes([175, 193, 33, 0, 0, 0]))
+        Pixy2(transport=transport).get_blocks(7, 3)
+        assert transport.written == [bytes([174, 193, 32, 2, 7, 3])]
+
+class TestPixy2Retry:
+
+    OK = bytes([175, 193, 13, 4, 0, 0, 60, 1, 208, 0])
+
+    @staticmethod
+    def serial_error(code):
+        """Header of a serial error response followed by the error byte"""
+        return bytes([175, 193, 3, 1, 0, 0, code])
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        """Record backoff sleeps instead of waiting"""
+        self.sleeps = []
+        monkeypatch.setattr(pixy2, "sleep", self.sleeps.append)
+
+    def test_busy_backs_off(self):
+        """Test SER_ERROR_BUSY is retried with a growing backoff"""
+        transport = ScriptedTransport(self.serial_error(254) * 2 + self.OK)
+        pixy = Pixy2(transport=transport)
+
+        assert pixy.get_resolution().width == 316
+        assert self.sleeps == [0.001, 0.002]
+        stats = pixy.get_request_stats()[12]
+        assert stats["count"] == 1
+        assert stats["retries"] == 2
+        assert stats["failures"] == 0
+
+    def test_general_error_retried_without_backoff(self):
+        """Test other serial errors are retried at once"""
+        transport = ScriptedTransport(self.serial_error(255) + self.OK)
+        assert Pixy2(transport=transport).get_resolution().height == 208
+        assert self.sleeps == []
+
+    @pytest.mark.parametrize("code", [253, 252])
+    def test_fail_fast(self, code):
+        """Test invalid and unsupported requests are not retried"""
+        transport = ScriptedTransport(self.serial_error(code) + self.OK)
+        pixy = Pixy2(transport=transport)
+
+        with pytest.raises(Pixy2DataError):
+            pixy.get_resolution()
+        assert len(transport.written) == 1
+        assert pixy.consecutive_failures == 0
+
+    def test_gives_up_after_max_attempts(self):
+        """Test persistent errors raise after the attempt limit"""
+        transport = ScriptedTransport(self.serial_error(255) * MAX_REQUEST_ATTEMPTS)
+        pixy = Pixy2(transport=transport)
+
+        with pytest.raises(Pixy2CommunicationError):
+            pixy.get_resolution()
+        assert len(transport.written) == MAX_REQUEST_ATTEMPTS
+        assert pixy.get_request_stats()[12]["failures"] == 1
+
+    def test_circuit_breaker(self):
+        """Test a dead camera is skipped without bus traffic after repeated failures"""
+        transport = ScriptedTransport(bytes(6) * BREAKER_THRESHOLD)
+        pixy = Pixy2(transport=transport)
+
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(Pixy2ConnectionError):
+                pixy.get_resolution()
+        assert pixy.is_circuit_open()
+
+        writes = len(transport.written)
+        with pytest.raises(Pixy2CommunicationError):
+            pixy.get_resolution()
+        assert len(transport.written) == writes
+        assert pixy.get_request_stats()[12]["rejected"] == 1
+
+    def test_circuit_open_errors_are_fresh(self, capsys):
+        """Test skipped requests raise new, silent errors whose traceback does not grow"""
+        transport = ScriptedTransport(bytes(6) * BREAKER_THRESHOLD)
+        pixy = Pixy2(transport=transport)
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(Pixy2ConnectionError):
+                pixy.get_resolution()
+        capsys.readouterr()
+
+        errors = []
+        for _ in range(3):
+            with pytest.raises(Pixy2CommunicationError) as info:
+                pixy.get_resolution()
+            errors.append(info.value)
+
+        assert errors[0] is not errors[1]
+        assert traceback_depth(errors[2]) == traceback_depth(errors[0])
+        assert capsys.readouterr().out == ""
+
+    def test_circuit_closes_after_cooldown(self, monkeypatch):
+        """Test a request after the cooldown probes the camera and closes the circuit"""
+        transport = ScriptedTransport(bytes(6) * BREAKER_THRESHOLD + self.OK)
+        pixy = Pixy2(transport=transport)
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(Pixy2ConnectionError):
+                pixy.get_resolution()
+
+        monkeypatch.setattr(pixy2, "BREAKER_COOLDOWN_US", 0)
+        assert pixy.get_resolution().width == 316
+        assert not pixy.is_circuit_open()
+
+def traceback_depth(error):
+    """Number of frames in an exception's traceback"""
+    depth = 0
+    tb = error.__traceback__
+    while tb is not None:
+        depth += 1
+        tb = tb.tb_next
+    return depth
+
+class TestPixy2Simulator:
+
+    FRAMES = [
+        SimFrame(blocks=[(1, 100, 50, 20, 20, 0, 1, 10), (2, 200, 60, 30, 30, 0, 2, 10)]),
+        SimFrame(blocks=[(1, 110, 50, 20, 20, -45, 1, 11)]),
+    ]
+
+    def test_requests_and_state(self):
+        """Test the simulator answers info requests and records driver commands"""
+        transport = SimulatedPixy2Transport(width=320, height=200)
+        pixy = Pixy2(transport=transport)
+
+        assert pixy.get_resolution().width == 320
+        assert pixy.get_version().hardware == 0x2200
+        pixy.set_lamp(1, 0)
+        pixy.set_next_turn(-30)
+        pixy.close()
+
+        assert transport.lamp == (1, 0)
+        assert transport.next_turn == -30
+        assert transport.closed
+
+    def test_blocks_follow_frames(self):
+        """Test frames advance per request and loop"""
+        pixy = Pixy2(transport=SimulatedPixy2Transport(self.FRAMES))
+
+        assert pixy.get_blocks(3, 8)[0] == 2
+        count, blocks = pixy.get_blocks(3, 8)
+        assert count == 1
+        assert blocks[0].x_center == 110
+        assert blocks[0].angle == -45
+        assert pixy.get_blocks(3, 8)[0] == 2
+
+    def test_sigmap_and_max_blocks(self):
+        """Test blocks are filtered by signature map and limited in number"""
+        pixy = Pixy2(transport=SimulatedPixy2Transport(self.FRAMES[:1]))
+
+        count, blocks = pixy.get_blocks(2, 8)
+        assert count == 1
+        assert blocks[0].sig == 2
+        assert pixy.get_blocks(3, 1)[0] == 1
+
+    def test_frames_follow_clock(self):
+        """Test frames advance with time when a frame period is set"""
+        now = [0]
+        transport = SimulatedPixy2Transport(self.FRAMES, frame_period_us=1000,
+                                            loop=False, clock=lambda: now[0])
+        pixy = Pixy2(transport=transport)
+
+        assert pixy.get_blocks(3, 8)[0] == 2
+        assert pixy.get_blocks(3, 8)[0] == 2
+        now[0] = 5000
+        assert pixy.get_blocks(3, 8)[0] == 1
+
+    def test_injected_busy(self, monkeypatch):
+        """Test injected serial errors exercise the retry policy"""
+        monkeypatch.setattr(pixy2, "sleep", lambda seconds: None)
+        transport = SimulatedPixy2Transport(self.FRAMES)
+        transport.inject_error(SER_ERROR_BUSY, 2)
+        pixy = Pixy2(transport=transport)
+
+        assert pixy.get_blocks(3, 8)[0] == 2
+        assert pixy.get_request_stats()[32]["retries"] == 2
+
+    def test_linetracking(self):
+        """Test line features are encoded in the Pixy2 line tracking format"""
+        frame = SimFrame(vectors=[(10, 50, 40, 5, 3, 0)], barcodes=[(20, 30, 0, 7)])
+        features = Pixy2(transport=SimulatedPixy2Transport([frame])).get_linetracking_data()
+
+        assert features.number_of_vectors == 1
+        assert features.vectors[0].x1 == 40
+        assert features.vectors[0].index == 3
+        assert features.barcodes[0].code == 7
+
+    def test_load_frames(self, tmp_path):
+        """Test recorded frames are read from JSON lines"""
+        path = tmp_path / "frames.jsonl"
+        path.write_text('{"blocks": [[1, 100, 50, 20, 20, 0, 1, 10]]}\n\n'
+                        '{"vectors": [[10, 50, 40, 5, 3, 0]]}\n')
+        frames = load_frames(str(path))
+
+        assert len(frames) == 2
+        assert frames[0].blocks[0][1] == 100
+        assert frames[1].vectors[0][2] == 40
+
+class TestPixy2LineTracking:
+
+    FRAME = SimFrame(vectors=[(10, 50, 40, 5, 3, 0), (60, 50, 70, 0, 4, 1)],
+                     intersections=[(30, 20, [(3, 90), (4, -90), (5, 0)])],
+                     barcodes=[(20, 30, 0, 7), (25, 35, 1, 12)])
+
+    def test_features_are_distinct(self):
+        """Test every vector, intersection and barcode is its own record"""
+        features = Pixy2(transport=SimulatedPixy2Transport([self.FRAME])).get_linetracking_data()
+
+        assert not features.error
+        assert features.number_of_vectors == 2
+        assert [v.index for v in features.vectors] == [3, 4]
+        assert [b.code for b in features.barcodes] == [7, 12]
+
+    def test_intersection_branches(self):
+        """Test branch records start at offset 4 and carry signed angles"""
+        features = Pixy2(transport=SimulatedPixy2Transport([self.FRAME])).get_linetracking_data()
+        intersection = features.intersections[0]
+
+        assert (intersection.x, intersection.y) == (30, 20)
+        assert intersection.nr_of_branches == 3
+        assert [b.index for b in intersection.branches] == [3, 4, 5]
+        assert [b.angle for b in intersection.branches] == [90, -90, 0]
+
+    def test_bulk_read(self):
+        """Test the payload is read in bulk instead of per feature"""
+        transport = SimulatedPixy2Transport([self.FRAME])
+        pixy = Pixy2(transport=transport)
+        pixy.get_linetracking_data()
+
+        # Request and header, then 14 + 30 + 10 payload bytes in two reads
+        assert transport.transactions == 2 + 2
+
+    def test_records_are_reused(self):
+        """Test repeated calls decode into the same pooled records"""
+        empty = SimFrame(vectors=[(1, 2, 3, 4, 9, 0)])
+        pixy = Pixy2(transport=SimulatedPixy2Transport([self.FRAME, empty]))
+        first = pixy.get_linetracking_data()
+        vector = first.vectors[0]
+        second = pixy.get_linetracking_data()
+
+        assert second is first
+        assert second.vectors[0] is vector
+        assert vector.index == 9
+        assert second.number_of_vectors == 1
+        assert second.intersections == []
+
+    def test_unknown_and_truncated_features(self):
+        """Test malformed payloads set the error flag"""
+        unknown = bytes([175, 193, 49, 4, 0, 0, 8, 2, 0, 0])
+        features = Pixy2(transport=ScriptedTransport(unknown)).get_linetracking_data()
+        assert features.error
+
+        truncated = bytes([175, 193, 49, 4, 0, 0, 1, 6, 1, 2])
+        features = Pixy2(transport=ScriptedTransport(truncated)).get_linetracking_data()
+        assert features.error
+        assert features.number_of_vectors == 0
+
+class TestPixy2RequestStats:
+
+    FRAME = SimFrame(blocks=[(1, 10 * i, 50, 20, 20, 0, i, 1) for i in range(4)])
+
+    def test_transactions_and_bytes(self):
+        """Test every I2C transaction of a request is counted, payload reads included"""
+        pixy = Pixy2(transport=SimulatedPixy2Transport([self.FRAME]))
+        pixy.get_blocks(1, 4)
+        pixy.get_resolution()
+
+        stats = pixy.get_request_stats()
+        blocks = stats[32]
+        # Request, header, then 56 payload bytes in two reads
+        assert blocks["name"] == "blocks"
+        assert blocks["transactions"] == 4
+        assert blocks["bytes"] == 6 + 6 + 56
+        assert stats[12]["transactions"] == 3
+        assert stats[12]["bytes"] == 5 + 6 + 4
+
+    def test_bus_time(self):
+        """Test time in I2C transactions is accumulated per request type"""
+        pixy = Pixy2(transport=SimulatedPixy2Transport([self.FRAME], latency_us=1000))
+        pixy.get_blocks(1, 4)
+
+        blocks = pixy.get_request_stats()[32]
+        assert blocks["bus_us"] >= 4000
+        assert blocks["max_transaction_us"] >= 1000
+        assert pixy.get_bus_time() == blocks["bus_us"]
+
+    def test_fixed_table(self):
+        """Test the statistics table is preallocated and reset in place"""
+        pixy = Pixy2(transport=SimulatedPixy2Transport([self.FRAME]))
+        table = list(pixy.request_stats)
+        pixy.get_blocks(1, 4)
+        pixy.reset_request_stats()
+
+        assert len(pixy.request_stats) == STATS_SLOTS
+        assert pixy.request_stats == table
+        assert pixy.get_request_stats() == {}
+
+    def test_instrumentation_off(self):
+        """Test the transport is called directly without instrumentation"""
+        transport = SimulatedPixy2Transport([self.FRAME])
+        pixy = Pixy2(transport=transport)
+        pixy.set_instrumentation(False)
+        pixy.get_blocks(1, 4)
+
+        assert pixy._i2c_read == transport.read
+        stats = pixy.get_request_stats()[32]
+        assert stats["count"] == 1
+        assert stats["transactions"] == 0
+
+# Tests can be run with: pytest tests/test_pixy2.py
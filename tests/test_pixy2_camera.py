@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the Pixy2Camera poller using pytest
+"""
+
+import pytest
+import Pixy2Camera as Pixy2Camera_module
+from Pixy2Camera import Pixy2Camera, FRAME_PERIOD_US, IDLE_FRAMES
+from pixycamev3.simulator import SimFrame, SimulatedPixy2Transport
+from tests.test_pixy2 import block_bytes, ScriptedTransport
+
+def blocks_frame(nr_blocks):
+    """Encode a get_blocks response with nr_blocks blocks"""
+    payload = b"".join(block_bytes(1, 100 + i, 80, 20, 20, 0, i, 3) for i in range(nr_blocks))
+    return bytes([175, 193, 33, len(payload), 0, 0]) + payload
+
+class TestPixy2CameraPoll:
+
+    def test_poll_triggers_on_blocks(self):
+        """Test block_detected fires with the frame's blocks"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(1)))
+        seen = []
+        camera.onBlockDetected(lambda cam: seen.append(cam.blocks[0].x_center))
+
+        assert camera.poll()
+        assert seen == [100]
+
+    def test_poll_without_blocks(self):
+        """Test an empty frame does not fire block_detected"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(0)))
+        seen = []
+        camera.onBlockDetected(seen.append)
+
+        assert not camera.poll()
+        assert seen == []
+
+    def test_poll_counts_errors(self):
+        """Test a camera error is counted instead of ending the thread"""
+        camera = Pixy2Camera(transport=ScriptedTransport(bytes(6)))
+
+        assert not camera.poll()
+        assert camera.errors == 1
+
+    def test_poll_simulated_camera(self):
+        """Test the poller against the simulated camera"""
+        frames = [SimFrame(blocks=[(1, 120, 80, 30, 30, 0, 4, 1)]), SimFrame()]
+        camera = Pixy2Camera(transport=SimulatedPixy2Transport(frames))
+        camera.light(1)
+
+        assert camera.poll()
+        assert camera.get_frame().blocks[0].tracking_index == 4
+        assert not camera.poll()
+        assert camera.pixy.transport.lamp == (1, 1)
+
+class TestPixy2CameraFrames:
+
+    def test_frame_is_a_copy(self):
+        """Test the published frame does not alias the driver's pooled blocks"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(2) + blocks_frame(1)))
+        camera.poll()
+        frame = camera.get_frame()
+        first = frame.blocks[0]
+
+        assert frame.number == 1
+        assert [b.x_center for b in frame.blocks] == [100, 101]
+        assert first is not camera.pixy._blocks[0]
+
+        camera.pixy._blocks[0].x_center = 999
+        assert first.x_center == 100
+
+    def test_double_buffer_swap(self):
+        """Test frames alternate between two buffers published by reference"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(1) * 3))
+        camera.poll()
+        first = camera.get_frame()
+        camera.poll()
+        second = camera.get_frame()
+        camera.poll()
+
+        assert second is not first
+        assert camera.get_frame() is first
+        assert first.number == 3
+        assert first.seq == 4
+        assert second.seq % 2 == 0
+
+    def test_callback_sees_published_frame(self):
+        """Test block_detected runs after the frame was published"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(1)))
+        numbers = []
+        camera.onBlockDetected(lambda cam: numbers.append(cam.get_frame().number))
+
+        camera.poll()
+        assert numbers == [1]
+
+    def test_error_keeps_last_frame(self):
+        """Test a failed poll leaves the last published frame in place"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(1) + bytes(6)))
+        camera.poll()
+        camera.poll()
+
+        assert camera.get_frame().number == 1
+        assert len(camera.get_frame().blocks) == 1
+
+    def test_snapshot(self):
+        """Test a snapshot is an independent copy of the latest frame"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(2) + blocks_frame(0)))
+        camera.poll()
+        number, time_us, blocks = camera.snapshot()
+        camera.poll()
+
+        assert number == 1
+        assert time_us is not None
+        assert [b.x_center for b in blocks] == [100, 101]
+        assert camera.snapshot()[2] == []
+
+    def test_snapshot_yields_to_writer(self, monkeypatch):
+        """Test a snapshot of a frame being written yields instead of spinning"""
+        camera = Pixy2Camera(transport=ScriptedTransport(blocks_frame(1)))
+        camera.poll()
+        frame = camera.get_frame()
+        frame.seq += 1
+        yields = []
+
+        def writer_finishes(seconds):
+            yields.append(seconds)
+            frame.seq += 1
+        monkeypatch.setattr(Pixy2Camera_module, "sleep", writer_finishes)
+
+        assert camera.snapshot()[0] == 1
+        assert yields == [0]
+
+class TestPixy2CameraSchedule:
+
+    @pytest.fixture
+    def camera(self):
+        return Pixy2Camera(transport=ScriptedTransport())
+
+    def test_idle_rate_before_first_block(self, camera):
+        """Test the poller starts at the idle rate"""
+        assert camera.next_poll(0, 1000, False) == IDLE_FRAMES * FRAME_PERIOD_US
+        assert not camera.tracking
+
+    def test_every_frame_while_tracking(self, camera):
+        """Test every frame is polled while blocks are seen"""
+        assert camera.next_poll(0, 1000, True) == FRAME_PERIOD_US
+        assert camera.tracking
+
+    def test_backoff_after_idle_timeout(self, camera):
+        """Test the poller keeps the frame rate briefly after losing the target, then backs off"""
+        camera.next_poll(0, 1000, True)
+        deadline = camera.next_poll(FRAME_PERIOD_US, FRAME_PERIOD_US + 1000, False)
+        assert deadline == 2 * FRAME_PERIOD_US
+
+        now = 1000 + camera.idle_timeout_us
+        deadline = camera.next_poll(now - 1000, now, False)
+        assert deadline == now - 1000 + IDLE_FRAMES * FRAME_PERIOD_US
+        assert not camera.tracking
+
+    def test_slow_poll_skips_to_next_frame(self, camera):
+        """Test a poll that overran the next slot stays on the frame grid"""
+        deadline = camera.next_poll(0, int(2.5 * FRAME_PERIOD_US), True)
+
+        assert deadline == 3 * FRAME_PERIOD_US
+        assert camera.overruns == 1
+
+    def test_poll_stats(self, camera):
+        """Test the achieved poll rate and busy share are reported"""
+        camera.reset_poll_stats()
+        camera._stats_start_us -= 1000000
+        camera.polls = 60
+        camera.busy_us = 250000
+
+        stats = camera.get_poll_stats()
+        assert stats["poll_rate"] == pytest.approx(60, rel=0.01)
+        assert stats["busy_share"] == pytest.approx(0.25, rel=0.01)
+
+        camera.reset_poll_stats()
+        assert camera.get_poll_stats()["polls"] == 0
+
+    def test_bus_time_breakdown(self):
+        """Test the poll statistics include the time spent on the I2C bus"""
+        frames = [SimFrame(blocks=[(1, 120, 80, 30, 30, 0, 4, 1)])]
+        camera = Pixy2Camera(transport=SimulatedPixy2Transport(frames, latency_us=500))
+        camera.reset_poll_stats()
+        camera.poll()
+
+        stats = camera.get_poll_stats()
+        assert stats["bus_us"] >= 3 * 500
+        assert 0 < stats["bus_share"] <= 1
+
+        camera.reset_poll_stats()
+        assert camera.get_poll_stats()["bus_us"] == 0
+
+# Tests can be run with: pytest tests/test_pixy2_camera.py
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for steering calibration using pytest
+"""
+
+import pytest
+from tests.mock_ev3_devices import MockMotor, MockPort
+from SteeringCalibration import SteeringCalibration, calibrate_steering, END_STOP_MARGIN
+from CarDriveSystem import CarDriveSystem
+
+class TestSteeringCalibration:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager, tmp_path):
+        """Set up test fixtures"""
+        self.steer_motor = MockMotor(MockPort.B)
+        self.steer_motor._stall_angles = (-130, 70)
+        device_manager.devices["steer_motor"] = self.steer_motor
+        device_manager.available_devices.append("steer_motor")
+
+        self.car_drive = CarDriveSystem(device_manager)
+        self.car_drive.calibration_file = str(tmp_path / "steering_calibration.txt")
+        self.car_drive.initialize()
+
+    def test_calibrate_finds_center(self):
+        """Test the sweep centers the steering between the end-stops and zeroes it"""
+        calibration = calibrate_steering(self.steer_motor)
+
+        assert self.steer_motor._target_angle == -30
+        assert self.steer_motor._angle == 0
+        assert calibration.left_limit == -(100 - END_STOP_MARGIN)
+        assert calibration.right_limit == 100 - END_STOP_MARGIN
+
+    def test_clamp(self):
+        """Test steering angles are clamped to the calibrated range"""
+        calibration = SteeringCalibration(-80, 90)
+        assert calibration.half_range == 80
+        assert calibration.clamp(-200) == -80
+        assert calibration.clamp(200) == 90
+        assert calibration.clamp(10) == 10
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved calibration loads back unchanged"""
+        path = str(tmp_path / "cal.txt")
+        assert SteeringCalibration(-95, 95).save(path)
+
+        loaded = SteeringCalibration.load(path)
+        assert loaded.left_limit == -95
+        assert loaded.right_limit == 95
+
+    def test_load_missing_or_invalid(self, tmp_path):
+        """Test missing or corrupt files load as None"""
+        assert SteeringCalibration.load(str(tmp_path / "missing.txt")) is None
+
+        path = tmp_path / "bad.txt"
+        path.write_text("left_limit=abc\n")
+        assert SteeringCalibration.load(str(path)) is None
+
+        path.write_text("left_limit=10\nright_limit=20\n")
+        assert SteeringCalibration.load(str(path)) is None
+
+    def test_first_boot_calibrates_and_caches(self):
+        """Test the first boot sweeps the end-stops and writes the cache file"""
+        assert self.car_drive.load_or_calibrate_steering()
+        assert self.car_drive.is_steering_calibrated()
+        assert SteeringCalibration.load(self.car_drive.calibration_file) is not None
+
+    def test_later_boot_uses_cache(self):
+        """Test a cached calibration is used without re-sweeping"""
+        SteeringCalibration(-60, 60).save(self.car_drive.calibration_file)
+        self.steer_motor._angle = 5
+        self.steer_motor.run_until_stalled = None  # Any sweep would fail
+
+        assert self.car_drive.load_or_calibrate_steering()
+        assert self.car_drive.steering_calibration.half_range == 60
+        assert self.steer_motor._angle == 0
+
+    def test_force_recalibration(self):
+        """Test force ignores the cached file"""
+        SteeringCalibration(-60, 60).save(self.car_drive.calibration_file)
+        assert self.car_drive.load_or_calibrate_steering(force=True)
+        assert self.car_drive.steering_calibration.half_range == 100 - END_STOP_MARGIN
+
+    def test_missing_steer_motor(self, device_manager_empty):
+        """Test calibration is skipped without a steering motor"""
+        car_drive = CarDriveSystem(device_manager_empty)
+        assert not car_drive.load_or_calibrate_steering()
+        assert not car_drive.is_steering_calibrated()
+
+    def test_center_steering(self):
+        """Test centering targets encoder zero once calibrated"""
+        self.car_drive.load_or_calibrate_steering()
+        self.steer_motor._angle = 40
+        self.car_drive.center_steering(200)
+
+        assert self.steer_motor._target_angle == 0
+        assert self.steer_motor._target_speed == 200
+
+    def test_status_availability(self, device_manager):
+        """Test status reports device availability before init and after a refresh"""
+        car_drive = CarDriveSystem(device_manager)
+        assert car_drive.get_status_record().steer_motor
+        assert "steering" in car_drive.get_status()["available_operations"]
+
+        seq = car_drive.get_status_record().seq
+        car_drive.refresh_status()
+        assert car_drive.get_status_record().seq == seq
+
+        device_manager.devices["steer_motor"] = None
+        assert car_drive.get_status()["devices"]["steer_motor"]
+        car_drive.refresh_status()
+        status = car_drive.get_status()
+        assert not status["devices"]["steer_motor"]
+        assert "steering" not in status["available_operations"]
+        assert car_drive.get_status_record().seq > seq
+
+class TestPositionSteering:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager):
+        """Set up test fixtures"""
+        self.steer_motor = MockMotor(MockPort.B)
+        device_manager.devices["steer_motor"] = self.steer_motor
+        device_manager.available_devices.append("steer_motor")
+
+        self.car_drive = CarDriveSystem(device_manager)
+        self.car_drive.initialize()
+        self.car_drive.steering_calibration = SteeringCalibration(-100, 100)
+        self.calls = []
+        original = self.steer_motor.run_target
+
+        def record(speed, angle, stop_type=None, wait=True):
+            self.calls.append((angle, wait))
+            original(speed, angle, stop_type, wait)
+        self.steer_motor.run_target = record
+
+    def test_stick_maps_to_angle(self):
+        """Test stick input selects a steering angle with a non-blocking target"""
+        self.car_drive.move_with_steering(0, 500)
+        assert self.calls == [(50, False)]
+        assert self.steer_motor._speed == 0
+
+        self.car_drive.move_with_steering(0, -1000)
+        assert self.calls[-1] == (-100, False)
+
+    def test_hysteresis_suppresses_small_changes(self):
+        """Test targets within the hysteresis band are not reissued"""
+        self.car_drive.move_with_steering(0, 500)
+        self.car_drive.move_with_steering(0, 520)
+        self.car_drive.move_with_steering(0, 480)
+        assert len(self.calls) == 1
+
+        self.car_drive.move_with_steering(0, 560)
+        assert self.calls[-1] == (56, False)
+
+    def test_center_and_limits_always_sent(self):
+        """Test returning to center or a limit is sent even within the hysteresis band"""
+        self.car_drive.move_with_steering(0, 20)
+        self.car_drive.move_with_steering(0, 0)
+        assert self.calls == [(2, False), (0, False)]
+
+        self.car_drive.move_with_steering(0, 980)
+        self.car_drive.move_with_steering(0, 1000)
+        assert self.calls[-2:] == [(98, False), (100, False)]
+
+        self.car_drive.move_with_steering(0, 1000)
+        assert len(self.calls) == 4
+
+    def test_open_loop_steering_resets_target(self):
+        """Test open-loop steering forces the next position target to be issued"""
+        self.car_drive.move_with_steering(0, 500)
+        self.car_drive.turn_left(300)
+        self.car_drive.move_with_steering(0, 500)
+        assert len(self.calls) == 2
+
+    def test_uncalibrated_uses_speed(self):
+        """Test steering falls back to open-loop speed without calibration"""
+        self.car_drive.steering_calibration = None
+        self.car_drive.move_with_steering(0, 300)
+        assert self.steer_motor._speed == 600
+        assert self.calls == []
+
+# Tests can be run with: pytest tests/test_steering_calibration.py
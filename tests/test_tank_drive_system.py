@@ -5,6 +5,7 @@ Unit tests for TankDriveSystem class using pytest
 """
 
 import pytest
+from tests.mock_ev3_devices import MockMotor, MockPort
 from TankDriveSystem import TankDriveSystem
 
 class TestTankDriveSystem:
@@ -191,6 +192,145 @@ class TestTankDriveSystem:
         assert abs(self.mock_left_motor._speed) <= 1000
         assert abs(self.mock_right_motor._speed) <= 1000
     
+    def test_set_motor_speeds_records_skew(self):
+        """Test paired motor update records left/right skew"""
+        self.tank_drive.reset_skew_stats()
+        self.tank_drive.set_motor_speeds(-500, -500)
+        self.tank_drive.set_motor_speeds(-300, -600)
+        
+        stats = self.tank_drive.get_skew_stats()
+        assert stats["samples"] == 2
+        assert stats["last_us"] >= 0
+        assert stats["max_us"] >= stats["last_us"]
+        assert self.mock_left_motor._speed == -300
+        assert self.mock_right_motor._speed == -600
+    
+    def test_paired_update_with_single_motor(self, device_manager_empty):
+        """Test paired motor update falls back to the available motor only"""
+        left_motor = MockMotor(MockPort.A)
+        device_manager_empty.devices["drive_L_motor"] = left_motor
+        device_manager_empty.available_devices.append("drive_L_motor")
+        
+        tank_drive = TankDriveSystem(device_manager_empty)
+        tank_drive.initialize()
+        tank_drive.set_motor_speeds(400, 400)
+        
+        assert left_motor._speed == 400
+        assert tank_drive.get_skew_stats()["samples"] == 0
+    
+    def test_heading_hold_slows_leading_track(self):
+        """Test heading hold trims speeds when the left track runs ahead"""
+        self.tank_drive.enable_heading_hold(kp=2.0, ki=0.0)
+        self.tank_drive.move_forward(500)
+        self.tank_drive.drive_tick()  # Takes the encoder reference
+        
+        # Forward is negative on this robot: left track travelled 20 degrees further
+        self.mock_left_motor._angle -= 120
+        self.mock_right_motor._angle -= 100
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == -460
+        assert self.mock_right_motor._speed == -540
+        assert self.tank_drive.commanded_left_speed == -500
+        assert self.tank_drive.get_heading_hold_stats()["ticks"] == 1
+    
+    def test_heading_hold_reverse(self):
+        """Test heading hold correction also works when driving backward"""
+        self.tank_drive.enable_heading_hold(kp=2.0, ki=0.0)
+        self.tank_drive.move_backward(500)
+        self.tank_drive.drive_tick()
+        
+        self.mock_left_motor._angle += 100
+        self.mock_right_motor._angle += 120
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == 540
+        assert self.mock_right_motor._speed == 460
+    
+    def test_heading_hold_correction_is_limited(self):
+        """Test heading hold never exceeds its maximum correction"""
+        self.tank_drive.enable_heading_hold(kp=10.0, ki=0.0, max_correction=100)
+        self.tank_drive.move_forward(500)
+        self.tank_drive.drive_tick()
+        
+        self.mock_left_motor._angle -= 500
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == -400
+        assert self.mock_right_motor._speed == -600
+    
+    def test_heading_hold_ignores_turns(self):
+        """Test heading hold leaves non-straight commands alone"""
+        self.tank_drive.enable_heading_hold()
+        self.tank_drive.set_motor_speeds(-300, -600)
+        self.mock_left_motor._angle -= 50
+        self.tank_drive.drive_tick()
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == -300
+        assert self.mock_right_motor._speed == -600
+        assert self.tank_drive.get_heading_hold_stats()["ticks"] == 0
+    
+    def test_heading_hold_yields_to_stop_during_tick(self):
+        """Test a stop issued while the tick reads the encoders is not overwritten"""
+        self.tank_drive.enable_heading_hold(kp=2.0, ki=0.0)
+        self.tank_drive.move_forward(500)
+        self.tank_drive.drive_tick()
+        self.mock_left_motor._angle -= 120
+        
+        # Controller thread stops the robot between the two encoder reads
+        read_angle = self.mock_right_motor.angle
+        def angle_then_stop():
+            self.tank_drive.stop()
+            return read_angle()
+        self.mock_right_motor.angle = angle_then_stop
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == 0
+        assert self.mock_right_motor._speed == 0
+        assert self.tank_drive.get_heading_hold_stats()["ticks"] == 0
+    
+    def test_heading_hold_disabled_by_default(self):
+        """Test drive tick does nothing unless heading hold is enabled"""
+        self.tank_drive.move_forward(500)
+        self.mock_left_motor._angle -= 100
+        self.tank_drive.drive_tick()
+        self.tank_drive.drive_tick()
+        
+        assert self.mock_left_motor._speed == -500
+        assert self.mock_right_motor._speed == -500
+    
+    def test_status_record_tracks_commands(self):
+        """Test the status record is updated in place on command changes"""
+        record = self.tank_drive.get_status_record()
+        assert record.initialized
+        assert record.left_motor and record.right_motor
+        
+        self.tank_drive.move_forward(500)
+        assert record.mode == "forward"
+        assert record.left_speed == -500 and record.right_speed == -500
+        seq = record.seq
+        
+        # Repeating the same command must not bump seq
+        self.tank_drive.move_forward(500)
+        assert record.seq == seq
+        
+        self.tank_drive.stop()
+        assert record.mode == "stopped"
+        assert record.seq > seq
+        assert self.tank_drive.get_status_record() is record
+    
+    def test_get_status_from_record(self):
+        """Test get_status reports the record contents"""
+        self.tank_drive.drift_left(400)
+        status = self.tank_drive.get_status()
+        
+        assert status["drive_system_type"] == "tank_drive"
+        assert status["devices"] == {"left_motor": True, "right_motor": True}
+        assert "differential_steering" in status["available_operations"]
+        assert status["mode"] == "drift"
+        assert status["left_speed"] == 400
+    
     def test_without_motors(self, device_manager):
         """Test tank drive system without motors available"""
         # Create tank drive with empty device manager (no motors added)
@@ -5,6 +5,7 @@ Unit tests for Turret class using pytest
 """
 
 import pytest
+import threading
 from tests.mock_ev3_devices import MockMotor, MockPort
 from DeviceManager import DeviceManager
 from Turret import Turret
@@ -128,6 +129,22 @@ class TestTurret:
         self.turret.home_turret()
         assert self.mock_motor._angle == 0
     
+    def test_status_record(self):
+        """Test the turret status record follows the commanded state"""
+        record = self.turret.get_status_record()
+        assert record.available
+        
+        self.turret.speed_control(60, 0)
+        assert record.mode == "speed"
+        assert record.speed == 216
+        
+        self.turret.move_to_angle(30)
+        assert record.mode == "position"
+        assert record.target_angle == 30
+        
+        self.turret.stop()
+        assert self.turret.get_status()["mode"] == "holding"
+    
     def test_speed_control_without_motor(self, device_manager_empty):
         """Test speed control when motor is not available"""
         # Create turret without motor
@@ -137,6 +154,179 @@ class TestTurret:
         turret_no_motor.speed_control(50, 0)
         turret_no_motor.stop()
     
+    def test_speed_control_stops_at_soft_limit(self):
+        """Test speed mode holds at a soft limit but may move away from it"""
+        self.mock_motor._angle = 90
+        self.turret.drive_tick()
+        
+        self.turret.speed_control(100, 0)
+        assert self.mock_motor._speed == 0
+        assert self.turret.get_status_record().mode == "holding"
+        
+        self.turret.speed_control(-100, 0)
+        assert self.mock_motor._speed == -360
+    
+    def test_speed_control_decelerates_near_limit(self):
+        """Test speed is reduced inside the slowdown zone"""
+        self.mock_motor._angle = 80
+        self.turret.drive_tick()
+        
+        self.turret.speed_control(100, 0)
+        assert self.mock_motor._speed == 180
+    
+    def test_drive_tick_enforces_limit_while_stick_held(self):
+        """Test a held stick stops at the limit without further events"""
+        self.turret.speed_control(100, 0)
+        assert self.mock_motor._speed == 360
+        
+        self.mock_motor._angle = 75
+        self.turret.drive_tick()
+        assert self.mock_motor._speed == 270
+        
+        self.mock_motor._angle = 91
+        self.turret.drive_tick()
+        assert self.mock_motor._speed == 0
+    
+    def test_stop_between_tick_read_and_write(self):
+        """Test a centered stick while drive_tick is writing is not overwritten"""
+        self.turret.speed_control(100, 0)
+        original = self.turret.limit_speed
+        controller = threading.Thread(target=self.turret.speed_control, args=(0, 0))
+        
+        def release_stick(speed):
+            # The controller thread centers the stick inside the tick's write
+            self.turret.limit_speed = original
+            controller.start()
+            controller.join(0.05)
+            return original(speed)
+        self.turret.limit_speed = release_stick
+        self.mock_motor._angle = 75
+        self.turret.drive_tick()
+        controller.join()
+        
+        assert self.mock_motor._speed == 0
+        assert self.turret.commanded_speed == 0
+        assert self.turret.requested_speed == 0
+    
+    def test_speed_control_uses_cached_angle(self):
+        """Test speed mode does not read the encoder per event"""
+        self.mock_motor._angle = 90  # Not sampled yet
+        self.turret.speed_control(100, 0)
+        assert self.mock_motor._speed == 360
+    
+    def test_repeated_hold_not_resent(self):
+        """Test a resting stick commands HOLD once, not on every event"""
+        self.turret.speed_control(0, 0)
+        self.turret.speed_control(10, 0)
+        self.turret.speed_control(-20, 0)
+        assert self.turret.motor_commands == 1
+    
+    def test_y_only_changes_ignored(self):
+        """Test events that only change the Y axis do not reach the motor"""
+        self.turret.speed_control(80, 0)
+        self.turret.speed_control(80, 40)
+        self.turret.speed_control(80, -90)
+        assert self.turret.motor_commands == 1
+        assert self.mock_motor._speed == 288
+    
+    def test_deadzone_hysteresis(self):
+        """Test the stick must pass the deadzone to start but only below the exit threshold to stop"""
+        self.turret.speed_control(45, 0)
+        assert self.mock_motor._speed == 0
+        
+        self.turret.speed_control(55, 0)
+        assert self.mock_motor._speed == 198
+        
+        self.turret.speed_control(45, 0)
+        assert self.mock_motor._speed == 162
+        
+        self.turret.speed_control(35, 0)
+        assert self.mock_motor._speed == 0
+        assert self.turret.get_status_record().mode == "holding"
+    
+    def test_first_command_always_sent(self):
+        """Test the commanded state starts unknown so the first command reaches the motor"""
+        assert self.turret.commanded_speed is None
+        self.mock_motor._running = True
+        self.turret.speed_control(0, 0)
+        assert self.mock_motor._running == False
+    
+    @pytest.mark.parametrize("x_axis,y_axis,expected", [
+        (0, 100, 0),
+        (100, 0, 90),
+        (-100, 0, -90),
+        (70, 70, 45),
+        (0, -100, 180),
+    ])
+    def test_stick_to_heading(self, x_axis, y_axis, expected):
+        """Test stick direction to heading conversion"""
+        assert self.turret.stick_to_heading(x_axis, y_axis) == pytest.approx(expected)
+    
+    def test_nearest_heading_shortest_path(self):
+        """Test the equivalent heading closest to the turret is chosen"""
+        self.turret.set_angle_limits(-400, 400)
+        self.turret.cached_angle = 300
+        assert self.turret.nearest_heading(-30) == pytest.approx(330)
+        
+        self.turret.set_angle_limits(-90, 90)
+        self.turret.cached_angle = 0
+        assert self.turret.nearest_heading(170) == 90
+    
+    def test_aim_control(self):
+        """Test aim mode sends a non-blocking target toward the stick direction"""
+        self.turret.set_aim_mode(True)
+        self.turret.aim_control(100, 100, now_us=0)
+        
+        assert self.mock_motor._target_angle == 45
+        assert self.turret.get_status_record().mode == "aiming"
+        assert self.turret.get_status_record().target_angle == 45
+    
+    def test_aim_control_ignores_small_deflection(self):
+        """Test a centered stick keeps the last aim target"""
+        self.turret.set_aim_mode(True)
+        self.turret.aim_control(100, 0, now_us=0)
+        self.turret.aim_control(20, 10, now_us=100000)
+        assert self.mock_motor._target_angle == 90
+    
+    def test_aim_updates_rate_limited(self):
+        """Test target updates are rate limited and the last one is applied on the next tick"""
+        self.turret.set_aim_mode(True)
+        self.turret.aim_control(0, 100, now_us=0)
+        commands = self.turret.motor_commands
+        
+        self.turret.aim_control(100, 100, now_us=10000)
+        assert self.turret.motor_commands == commands
+        
+        self.turret._apply_aim(60000)
+        assert self.mock_motor._target_angle == 45
+        assert self.turret.motor_commands == commands + 1
+    
+    def test_aim_heading_computed_once_per_update(self):
+        """Test events held back by the rate limit do not compute a heading"""
+        self.turret.set_aim_mode(True)
+        headings = []
+        original = self.turret.stick_to_heading
+        
+        def record(x_axis, y_axis):
+            headings.append((x_axis, y_axis))
+            return original(x_axis, y_axis)
+        self.turret.stick_to_heading = record
+        
+        self.turret.aim_control(0, 100, now_us=0)
+        for x_axis in range(10, 100, 10):
+            self.turret.aim_control(x_axis, 100, now_us=x_axis * 100)
+        self.turret._apply_aim(60000)
+        
+        assert headings == [(0, 100), (90, 100)]
+    
+    def test_aim_small_changes_suppressed(self):
+        """Test targets within the aim threshold are not resent"""
+        self.turret.set_aim_mode(True)
+        self.turret.aim_control(0, 100, now_us=0)
+        commands = self.turret.motor_commands
+        self.turret.aim_control(2, 100, now_us=100000)
+        assert self.turret.motor_commands == commands
+    
     def test_required_drive_system_methods(self):
         """Test that required DriveSystem methods are implemented"""
         # These should not raise exceptions (placeholder implementations)
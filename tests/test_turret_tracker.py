@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the predictive turret tracker using pytest
+"""
+
+import pytest
+from Turret import Turret
+from TurretTracker import TurretTracker, TargetFilter
+
+class FakeBlock:
+    """Minimal Pixy2 block"""
+
+    def __init__(self, x_center, tracking_index=1, width=20, height=20):
+        self.x_center = x_center
+        self.tracking_index = tracking_index
+        self.width = width
+        self.height = height
+
+class TestTargetFilter:
+
+    def test_converges_on_constant_velocity(self):
+        """Test the alpha-beta filter learns a constant bearing rate"""
+        target = TargetFilter(0.0, 0)
+        for frame in range(1, 40):
+            target.update(frame * 3.0, frame * 100000, 0.5, 0.2)
+
+        assert target.velocity == pytest.approx(30.0, abs=0.5)
+        assert target.predict(40 * 100000) == pytest.approx(120.0, abs=1.0)
+
+class TestTurretTracker:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, device_manager_with_turret):
+        """Set up test fixtures"""
+        self.device_manager, self.mock_motor = device_manager_with_turret
+        self.turret = Turret(self.device_manager)
+        self.tracker = TurretTracker(self.turret, degrees_per_pixel=0.2, center_x=158)
+
+    def test_drives_toward_target(self):
+        """Test a block right of center turns the turret right"""
+        self.tracker.update_blocks([FakeBlock(208)], now_us=0)
+        self.tracker.drive_tick(now_us=10000)
+
+        # 50 px * 0.2 = 10 degrees of error
+        assert self.mock_motor._speed == int(self.tracker.kp * 10)
+        assert self.tracker.tracking
+
+    def test_predicts_between_frames(self):
+        """Test the turret leads a moving target between camera frames"""
+        for frame in range(10):
+            self.tracker.update_blocks([FakeBlock(158 + frame * 10)], now_us=frame * 100000)
+
+        self.tracker.drive_tick(now_us=900000)
+        speed_at_frame = self.mock_motor._speed
+        self.tracker.drive_tick(now_us=950000)
+        assert self.mock_motor._speed > speed_at_frame
+
+    def test_keeps_current_target(self):
+        """Test the tracker stays on its target when a larger block appears"""
+        self.tracker.update_blocks([FakeBlock(100, tracking_index=1)], now_us=0)
+        self.tracker.update_blocks([FakeBlock(100, tracking_index=1),
+                                    FakeBlock(250, tracking_index=2, width=80, height=80)], now_us=100000)
+        assert self.tracker.target_index == 1
+
+    def test_ignores_small_blocks(self):
+        """Test blocks at or below the minimum size are ignored"""
+        self.tracker.update_blocks([FakeBlock(250, width=5, height=10)], now_us=0)
+        assert self.tracker.target_index is None
+
+    def test_lost_target_stops_turret(self):
+        """Test the turret holds once the target has not been seen for the timeout"""
+        self.tracker.update_blocks([FakeBlock(250)], now_us=0)
+        self.tracker.drive_tick(now_us=10000)
+        assert self.mock_motor._speed != 0
+
+        self.tracker.drive_tick(now_us=2000000)
+        assert self.mock_motor._speed == 0
+        assert not self.tracker.tracking
+
+    def test_prediction_respects_limits(self):
+        """Test the predicted bearing is clamped to the turret limits"""
+        self.turret.set_angle_limits(-5, 5)
+        self.tracker.update_blocks([FakeBlock(308)], now_us=0)
+        self.tracker.drive_tick(now_us=0)
+        assert self.mock_motor._speed == int(self.tracker.kp * 5)
+
+    def test_held_stick_overrides_tracking(self):
+        """Test a stick held outside the deadzone keeps the tracker off the turret"""
+        self.tracker.update_blocks([FakeBlock(250)], now_us=0)
+        self.tracker.drive_tick(now_us=0)
+        assert self.tracker.tracking
+
+        self.tracker.manual_input(True, now_us=10000)
+        self.turret.speed_control(-80, 0)
+        assert not self.tracker.tracking
+
+        # No further stick events while the stick is held
+        for frame in range(1, 30):
+            self.tracker.update_blocks([FakeBlock(250)], now_us=frame * 100000)
+            self.tracker.drive_tick(now_us=frame * 100000)
+        assert self.mock_motor._speed == -288
+        assert not self.tracker.tracking
+        assert self.tracker.target_index is None
+
+    def test_tracking_resumes_after_holdoff(self):
+        """Test tracking resumes only after the hold-off following the stick release"""
+        self.tracker.manual_input(True, now_us=0)
+        self.tracker.manual_input(False, now_us=100000)
+
+        self.tracker.update_blocks([FakeBlock(250)], now_us=500000)
+        self.tracker.drive_tick(now_us=500000)
+        assert not self.tracker.tracking
+
+        now = 100000 + self.tracker.manual_holdoff_us
+        self.tracker.update_blocks([FakeBlock(250)], now_us=now)
+        self.tracker.drive_tick(now_us=now)
+        assert self.tracker.tracking
+
+    def test_stick_active_uses_mode_deadzone(self):
+        """Test manual input is detected with the deadzone of the turret mode"""
+        assert not self.turret.stick_active(45, 0)
+        assert self.turret.stick_active(-50, 0)
+        assert not self.turret.stick_active(0, 90)
+
+        self.turret.set_aim_mode(True)
+        assert self.turret.stick_active(0, 90)
+        assert not self.turret.stick_active(30, 30)
+
+    def test_tracking_stats(self):
+        """Test tracking error statistics"""
+        self.tracker.update_blocks([FakeBlock(208)], now_us=0)
+        self.tracker.drive_tick(now_us=0)
+        stats = self.tracker.get_tracking_stats()
+
+        assert stats["frames"] == 1
+        assert stats["ticks"] == 1
+        assert stats["rms_error"] == pytest.approx(10.0)
+        assert stats["max_error"] == pytest.approx(10.0)
+
+        self.tracker.reset_tracking_stats()
+        assert self.tracker.get_tracking_stats()["ticks"] == 0
+
+# Tests can be run with: pytest tests/test_turret_tracker.py
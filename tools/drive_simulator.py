@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+
+"""
+Offline drive kinematics simulator for tuning TankDriveSystem
+
+Runs on a desktop with CPython and NumPy, not on the brick. The simulator
+replays recorded or synthetic left-stick traces through the same stick
+processing as main.move() and the same track mixing as
+TankDriveSystem.joystick_control() / move_with_steering(). It then
+integrates a differential-drive model with first-order motor lag.
+
+Parameters are passed as NumPy arrays (one entry per combination), and each
+time step is evaluated for all combinations at once. Thousands of parameter
+sets over a minute-long trace finish in seconds.
+
+Trace CSV format (header required, extra columns are ignored):
+    t,l_forward,l_left
+    0.000,0,0
+    0.016,-640,120
+t is in seconds; l_forward/l_left are PS4Controller values (-1000 to 1000).
+Optional columns: r_left (right stick X, -100 to 100) drives the turret
+model. x, y, heading and turret_angle hold a reference recorded on the
+robot (odometry / turret encoder) that tools/parameter_sweep.py scores
+against.
+
+Usage:
+    python3 tools/drive_simulator.py session.csv
+    python3 tools/drive_simulator.py --synthetic
+"""
+
+import csv
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Odometry import WHEEL_DIAMETER_MM, TRACK_WIDTH_MM, FORWARD_DIRECTION
+
+# Mixing modes
+MIX_JOYSTICK = "joystick"   # TankDriveSystem.joystick_control (used by main.move)
+MIX_STEERING = "steering"   # TankDriveSystem.move_with_steering
+
+# Defaults mirror the values used on the robot
+DEFAULT_PARAMS = {
+    "deadzone": 200.0,              # LARGE_DEADZONE in main.move
+    "turn_mix_factor": 0.8,         # TankDriveSystem.turn_mix_factor
+    "steering_sensitivity": 2.0,    # TankDriveSystem.steering_sensitivity
+    "max_speed": 1000.0,            # validate_speed limit (deg/s)
+    "slew_limit": 0.0,              # Max command change in deg/s per second (0 = off)
+    "motor_time_constant": 0.08,    # First-order motor response in seconds
+}
+
+# Defaults mirror Turret.speed_control() and Turret.limit_speed()
+DEFAULT_TURRET_PARAMS = {
+    "turret_deadzone": 50.0,        # Turret.deadzone (stick needed to start)
+    "turret_deadzone_exit": 40.0,   # Turret.deadzone_exit (stick below this stops)
+    "turret_max_speed": 360.0,      # Turret.max_speed (deg/s)
+    "turret_limit_zone": 20.0,      # LIMIT_SLOWDOWN_ZONE in Turret (degrees)
+    "turret_min_limit_speed": 30.0, # MIN_LIMIT_SPEED in Turret (deg/s)
+    "turret_slew_limit": 0.0,       # Max speed change in deg/s per second (0 = off)
+    "turret_time_constant": 0.05,   # First-order motor response in seconds
+    "turret_min_angle": -90.0,      # Turret.min_angle
+    "turret_max_angle": 90.0,       # Turret.max_angle
+}
+
+# Optional reference columns of a recorded session
+REFERENCE_COLUMNS = ("x", "y", "heading", "turret_angle")
+
+# Track speed above which a combination counts as moving for the metrics (deg/s)
+MOVING_THRESHOLD = 20.0
+# Yaw rate below which the robot counts as driving straight (rad/s)
+STRAIGHT_YAW_RATE = 0.02
+
+
+class StickTrace:
+    """
+    Left-stick input over time.
+
+    Attributes:
+        t: Sample times in seconds, shape (N,)
+        l_forward: PS4Controller l_forward values, shape (N,)
+        l_left: PS4Controller l_left values, shape (N,)
+        r_left: PS4Controller r_left values for the turret, shape (N,)
+        reference: Column name -> recorded reference values, shape (N,)
+    """
+
+    def __init__(self, t, l_forward, l_left, name="trace", r_left=None, reference=None):
+        self.t = np.asarray(t, dtype=float)
+        self.l_forward = np.asarray(l_forward, dtype=float)
+        self.l_left = np.asarray(l_left, dtype=float)
+        if r_left is None:
+            self.r_left = np.zeros_like(self.t)
+        else:
+            self.r_left = np.asarray(r_left, dtype=float)
+        self.reference = {k: np.asarray(v, dtype=float) for k, v in (reference or {}).items()}
+        self.name = name
+        shapes = [self.l_forward.shape, self.l_left.shape, self.r_left.shape]
+        shapes += [v.shape for v in self.reference.values()]
+        if any(shape != self.t.shape for shape in shapes):
+            raise ValueError("Trace columns must have the same length")
+        if len(self.t) < 2:
+            raise ValueError("Trace needs at least two samples")
+
+    def __len__(self):
+        return len(self.t)
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a trace recorded as CSV (see module docstring)"""
+        t, forward, left, right = [], [], [], []
+        reference = {}
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            has_right = "r_left" in columns
+            for name in REFERENCE_COLUMNS:
+                if name in columns:
+                    reference[name] = []
+            for row in reader:
+                t.append(float(row["t"]))
+                forward.append(float(row["l_forward"]))
+                left.append(float(row["l_left"]))
+                if has_right:
+                    right.append(float(row["r_left"]))
+                for name in reference:
+                    reference[name].append(float(row[name]))
+        return cls(t, forward, left, name=os.path.basename(path),
+                   r_left=right if has_right else None, reference=reference)
+
+
+def step_trace(forward=800, left=0, duration=3.0, dt=0.02, start=0.5, name="step"):
+    """Stick at rest, then held at (forward, left) from start seconds on"""
+    t = np.arange(0.0, duration, dt)
+    on = t >= start
+    return StickTrace(t, np.where(on, forward, 0.0), np.where(on, left, 0.0), name)
+
+
+def sine_sweep_trace(forward=700, amplitude=800, duration=10.0, dt=0.02,
+                     f_start=0.1, f_end=2.0, name="sine_sweep"):
+    """Constant forward push with a chirp on the turn axis"""
+    t = np.arange(0.0, duration, dt)
+    phase = 2 * math.pi * (f_start * t + (f_end - f_start) * t * t / (2 * duration))
+    return StickTrace(t, np.full_like(t, forward), amplitude * np.sin(phase), name)
+
+
+def random_trace(duration=20.0, dt=0.02, hold=0.5, seed=0, name="random"):
+    """Piecewise-constant random stick positions held for `hold` seconds"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(0.0, duration, dt)
+    segments = int(math.ceil(duration / hold)) + 1
+    forward = rng.uniform(-1000, 1000, segments)
+    left = rng.uniform(-1000, 1000, segments)
+    index = (t / hold).astype(int)
+    return StickTrace(t, forward[index], left[index], name)
+
+
+def param_grid(**ranges):
+    """
+    Cartesian product of parameter values.
+
+    Example: param_grid(deadzone=[100, 200], turn_mix_factor=[0.6, 0.8])
+
+    Returns:
+        dict: Parameter name -> flat array with one entry per combination
+    """
+    names = list(ranges)
+    mesh = np.meshgrid(*[np.asarray(ranges[n], dtype=float) for n in names], indexing="ij")
+    return {name: values.ravel() for name, values in zip(names, mesh)}
+
+
+def _expand_params(params, defaults=DEFAULT_PARAMS):
+    """Fill in defaults and broadcast every parameter to shape (P,)"""
+    merged = dict(defaults)
+    merged.update(params or {})
+    arrays = {k: np.atleast_1d(np.asarray(v, dtype=float)) for k, v in merged.items()}
+    count = max(len(v) for v in arrays.values())
+    for k, v in arrays.items():
+        if len(v) not in (1, count):
+            raise ValueError("Parameter {} has {} values, expected 1 or {}".format(k, len(v), count))
+        arrays[k] = np.broadcast_to(v, (count,))
+    return arrays, count
+
+
+def apply_deadzone(l_forward, l_left, deadzone):
+    """
+    Vectorized main.move() stick processing.
+
+    Returns:
+        tuple: (forward_speed, turn_speed) as passed to joystick_control
+    """
+    forward = np.where(np.abs(l_forward) < deadzone, 0.0, -1.0 * l_forward)
+    turn = np.where(np.abs(l_left) < deadzone, 0.0, -1.0 * l_left)
+    return forward, turn
+
+
+def mix_joystick(forward_speed, turn_speed, turn_mix_factor, max_speed=1000.0):
+    """
+    Vectorized TankDriveSystem.joystick_control() mixing.
+
+    Returns:
+        tuple: (left_speed, right_speed) motor commands
+    """
+    forward_speed = np.clip(forward_speed, -1000, 1000)
+    turn_speed = np.clip(turn_speed, -1000, 1000)
+    turn_factor = turn_speed * turn_mix_factor
+    left = -forward_speed - turn_factor
+    right = -forward_speed + turn_factor
+    return np.clip(left, -max_speed, max_speed), np.clip(right, -max_speed, max_speed)
+
+
+def mix_steering(drive_speed, steer_angle, steering_sensitivity):
+    """
+    Vectorized TankDriveSystem.move_with_steering() mixing.
+
+    Returns:
+        tuple: (left_speed, right_speed) motor commands
+    """
+    drive_speed = np.clip(drive_speed, -1000, 1000)
+    steer_angle = np.clip(steer_angle, -1000, 1000)
+    base = -drive_speed
+    steer = np.clip(steer_angle / 1000.0 * steering_sensitivity, -1.0, 1.0)
+    straight = np.abs(steer) < 0.05
+    left_turn = steer < 0
+    left = np.where(left_turn, np.trunc(base * (1 + steer)), np.trunc(base * (1 - steer / 2)))
+    right = np.where(left_turn, np.trunc(base * (1 - steer / 2)), np.trunc(base * (1 + steer)))
+    return np.where(straight, base, left), np.where(straight, base, right)
+
+
+class SimResult:
+    """
+    Simulation output for P parameter combinations.
+
+    Attributes:
+        params: Parameter name -> array of shape (P,)
+        x, y, heading: Final pose (mm, mm, degrees), shape (P,)
+        trajectory: Optional (P, N, 3) array of x, y, heading per sample
+        metrics: Metric name -> array of shape (P,)
+    """
+
+    def __init__(self, params, x, y, heading, metrics, trajectory=None):
+        self.params = params
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.metrics = metrics
+        self.trajectory = trajectory
+
+    def __len__(self):
+        return len(self.x)
+
+
+def simulate(trace, params=None, mode=MIX_JOYSTICK, wheel_diameter=WHEEL_DIAMETER_MM,
+             track_width=TRACK_WIDTH_MM, record_trajectory=False):
+    """
+    Run a stick trace through the drive model for every parameter combination.
+
+    Args:
+        trace: StickTrace to replay
+        params: Parameter name -> scalar or array (see DEFAULT_PARAMS)
+        mode: MIX_JOYSTICK or MIX_STEERING
+        wheel_diameter: Drive sprocket diameter in mm
+        track_width: Distance between the tracks in mm
+        record_trajectory: Keep the full (P, N, 3) pose history
+
+    Returns:
+        SimResult: Final poses, metrics and optional trajectories
+    """
+    params, count = _expand_params(params)
+    mm_per_degree = math.pi * wheel_diameter / 360.0
+    samples = len(trace)
+    dt_all = np.diff(trace.t, append=trace.t[-1] + (trace.t[-1] - trace.t[-2]))
+
+    forward, turn = apply_deadzone(trace.l_forward[None, :], trace.l_left[None, :],
+                                   params["deadzone"][:, None])
+    if mode == MIX_JOYSTICK:
+        cmd_left, cmd_right = mix_joystick(forward, turn, params["turn_mix_factor"][:, None],
+                                           params["max_speed"][:, None])
+    elif mode == MIX_STEERING:
+        cmd_left, cmd_right = mix_steering(forward, turn, params["steering_sensitivity"][:, None])
+        limit = params["max_speed"][:, None]
+        cmd_left = np.clip(cmd_left, -limit, limit)
+        cmd_right = np.clip(cmd_right, -limit, limit)
+    else:
+        raise ValueError("Unknown mixing mode: {}".format(mode))
+
+    slew = params["slew_limit"]
+    tau = np.maximum(params["motor_time_constant"], 1e-6)
+
+    out_left = np.zeros(count)
+    out_right = np.zeros(count)
+    speed_left = np.zeros(count)
+    speed_right = np.zeros(count)
+    x = np.zeros(count)
+    y = np.zeros(count)
+    theta = np.zeros(count)
+
+    path_length = np.zeros(count)
+    tracking_sq = np.zeros(count)
+    command_change = np.zeros(count)
+    min_radius = np.full(count, np.inf)
+    radius_sum = np.zeros(count)
+    radius_samples = np.zeros(count)
+    rise_time = np.full(count, np.nan)
+    first_command = np.full(count, np.nan)
+    trajectory = np.empty((count, samples, 3)) if record_trajectory else None
+
+    for k in range(samples):
+        dt = dt_all[k]
+        target_left = cmd_left[:, k]
+        target_right = cmd_right[:, k]
+
+        # Optional command slew limiting (what the brick would apply before run())
+        if np.any(slew > 0):
+            step = np.where(slew > 0, slew * dt, np.inf)
+            target_left = out_left + np.clip(target_left - out_left, -step, step)
+            target_right = out_right + np.clip(target_right - out_right, -step, step)
+        command_change += np.abs(target_left - out_left) + np.abs(target_right - out_right)
+        out_left = target_left
+        out_right = target_right
+
+        # First-order motor response
+        alpha = 1.0 - np.exp(-dt / tau)
+        speed_left += (out_left - speed_left) * alpha
+        speed_right += (out_right - speed_right) * alpha
+
+        # Differential-drive kinematics (motor degrees/s -> mm/s)
+        v_left = FORWARD_DIRECTION * speed_left * mm_per_degree
+        v_right = FORWARD_DIRECTION * speed_right * mm_per_degree
+        v = (v_left + v_right) * 0.5
+        omega = (v_right - v_left) / track_width
+        mid = theta + omega * dt * 0.5
+        x += v * dt * np.cos(mid)
+        y += v * dt * np.sin(mid)
+        theta += omega * dt
+        path_length += np.abs(v) * dt
+
+        # Metrics
+        tracking_sq += ((out_left - speed_left) ** 2 + (out_right - speed_right) ** 2) * dt
+        turning = (np.abs(omega) > STRAIGHT_YAW_RATE) & (np.abs(v) > MOVING_THRESHOLD * mm_per_degree)
+        radius = np.where(turning, np.abs(v) / np.where(turning, np.abs(omega), 1.0), np.inf)
+        min_radius = np.minimum(min_radius, radius)
+        radius_sum += np.where(turning, radius, 0.0)
+        radius_samples += turning
+
+        commanded = np.maximum(np.abs(out_left), np.abs(out_right))
+        started = np.isnan(first_command) & (commanded > MOVING_THRESHOLD)
+        first_command = np.where(started, trace.t[k], first_command)
+        reached = (np.isnan(rise_time) & ~np.isnan(first_command) &
+                   (np.abs(speed_left) >= 0.9 * np.abs(out_left)) &
+                   (np.abs(speed_right) >= 0.9 * np.abs(out_right)) &
+                   (commanded > MOVING_THRESHOLD))
+        rise_time = np.where(reached, trace.t[k] + dt - first_command, rise_time)
+
+        if record_trajectory:
+            trajectory[:, k, 0] = x
+            trajectory[:, k, 1] = y
+            trajectory[:, k, 2] = np.degrees(theta)
+
+    duration = trace.t[-1] - trace.t[0] + dt_all[-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_radius = np.where(radius_samples > 0, radius_sum / radius_samples, np.inf)
+    metrics = {
+        "path_length_mm": path_length,
+        "min_turn_radius_mm": min_radius,
+        "mean_turn_radius_mm": mean_radius,
+        "rise_time_s": rise_time,
+        "tracking_rms": np.sqrt(tracking_sq / duration),
+        "command_change_per_s": command_change / duration,
+    }
+    return SimResult(params, x, y, np.degrees(theta) % 360.0, metrics, trajectory)
+
+
+def simulate_turret(trace, params=None, record_trajectory=False):
+    """
+    Run the right-stick X axis through the Turret speed mode model.
+
+    Like Turret.speed_control(), the stick must leave turret_deadzone to
+    start the turret and fall below turret_deadzone_exit to stop it. Like
+    Turret.drive_tick(), the soft limits are re-applied every step from the
+    last sampled angle: the speed toward a limit drops linearly inside
+    turret_limit_zone (not below turret_min_limit_speed) and is zero at the
+    limit. Limit violations therefore only come from motor lag.
+
+    Args:
+        trace: StickTrace whose r_left column drives the turret
+        params: Parameter name -> scalar or array (see DEFAULT_TURRET_PARAMS)
+        record_trajectory: Keep the full (P, N) angle history
+
+    Returns:
+        SimResult: x holds the final turret angle (y and heading are zero),
+                   trajectory is (P, N) angles when recorded
+    """
+    params, count = _expand_params(
+        {k: v for k, v in (params or {}).items() if k in DEFAULT_TURRET_PARAMS},
+        DEFAULT_TURRET_PARAMS)
+    samples = len(trace)
+    dt_all = np.diff(trace.t, append=trace.t[-1] + (trace.t[-1] - trace.t[-2]))
+
+    stick = trace.r_left
+    max_speed = params["turret_max_speed"]
+    deadzone = params["turret_deadzone"]
+    deadzone_exit = params["turret_deadzone_exit"]
+    limit_zone = np.maximum(params["turret_limit_zone"], 1e-6)
+    min_limit_speed = params["turret_min_limit_speed"]
+
+    slew = params["turret_slew_limit"]
+    tau = np.maximum(params["turret_time_constant"], 1e-6)
+    min_angle = params["turret_min_angle"]
+    max_angle = params["turret_max_angle"]
+
+    requested = np.zeros(count)
+    output = np.zeros(count)
+    speed = np.zeros(count)
+    angle = np.zeros(count)
+    tracking_sq = np.zeros(count)
+    overshoot = np.zeros(count)
+    command_change = np.zeros(count)
+    trajectory = np.empty((count, samples)) if record_trajectory else None
+
+    for k in range(samples):
+        dt = dt_all[k]
+        # Deadzone with hysteresis: the threshold depends on whether the turret runs
+        threshold = np.where(requested != 0, deadzone_exit, deadzone)
+        requested = np.where(np.abs(stick[k]) < threshold, 0.0,
+                             np.clip(np.trunc(stick[k] / 100.0 * max_speed), -max_speed, max_speed))
+
+        # Soft limits from the sampled angle
+        remaining = np.where(requested > 0, max_angle - angle, angle - min_angle)
+        allowed = np.where(remaining < limit_zone,
+                           np.maximum(min_limit_speed, np.trunc(max_speed * remaining / limit_zone)),
+                           np.inf)
+        target = np.where(remaining <= 0, 0.0, np.clip(requested, -allowed, allowed))
+        if np.any(slew > 0):
+            step = np.where(slew > 0, slew * dt, np.inf)
+            target = output + np.clip(target - output, -step, step)
+        command_change += np.abs(target - output)
+        output = target
+        speed += (output - speed) * (1.0 - np.exp(-dt / tau))
+        angle += speed * dt
+        tracking_sq += (output - speed) ** 2 * dt
+        overshoot = np.maximum(overshoot, np.maximum(angle - max_angle, min_angle - angle))
+        if record_trajectory:
+            trajectory[:, k] = angle
+
+    duration = trace.t[-1] - trace.t[0] + dt_all[-1]
+    metrics = {
+        "turret_tracking_rms": np.sqrt(tracking_sq / duration),
+        "turret_limit_violation_deg": np.maximum(overshoot, 0.0),
+        "turret_command_change_per_s": command_change / duration,
+    }
+    zeros = np.zeros(count)
+    return SimResult(params, angle, zeros, zeros, metrics, trajectory)
+
+
+def print_summary(result, limit=10):
+    """Print the first `limit` combinations with their metrics"""
+    names = list(result.params)
+    metric_names = list(result.metrics)
+    print(", ".join(names + ["x", "y", "heading"] + metric_names))
+    for i in range(min(limit, len(result))):
+        values = [result.params[n][i] for n in names]
+        values += [result.x[i], result.y[i], result.heading[i]]
+        values += [result.metrics[m][i] for m in metric_names]
+        print(", ".join("{:.3g}".format(v) for v in values))
+
+
+def main(argv):
+    if len(argv) > 1 and argv[1] != "--synthetic":
+        traces = [StickTrace.from_csv(path) for path in argv[1:]]
+    else:
+        traces = [step_trace(left=400), sine_sweep_trace(), random_trace()]
+
+    grid = param_grid(
+        deadzone=np.linspace(50, 300, 11),
+        turn_mix_factor=np.linspace(0.3, 1.2, 10),
+        slew_limit=[0, 2000, 4000, 8000],
+        motor_time_constant=[0.05, 0.08, 0.12],
+    )
+    for trace in traces:
+        start = time.perf_counter()
+        result = simulate(trace, grid)
+        elapsed = time.perf_counter() - start
+        print("{}: {} combinations x {} samples in {:.2f}s".format(
+            trace.name, len(result), len(trace), elapsed))
+        print_summary(result, limit=5)
+        print("")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+"""
+Parallel parameter sweep over the offline drive simulator
+
+Spreads a grid or random search of TankDriveSystem and Turret parameters
+across a process pool, scores every configuration against recorded sessions
+and writes a ranked CSV table (best configuration first).
+
+Each worker receives a chunk of parameter combinations and evaluates the
+chunk for all sessions with the vectorized simulator, so a pool of N
+processes runs N NumPy batches side by side.
+
+Scoring (lower is better, summed over all sessions):
+- Sessions with x/y reference columns: RMS position error in mm between the
+  simulated and the recorded path, plus heading error in degrees if present.
+- Sessions without a drive reference: rise time (s) * 1000 + tracking RMS
+  + command changes per second / 100 (rewards fast, smooth response).
+- Sessions with a turret_angle reference: RMS turret angle error in degrees.
+  Otherwise, when the session has right-stick input: turret tracking RMS.
+  Any turret soft-limit violation adds 10 points per degree.
+
+Usage:
+    python3 tools/parameter_sweep.py session1.csv session2.csv \\
+        --grid deadzone=50:300:11 turn_mix_factor=0.3:1.2:10 \\
+        --workers 8 --out sweep_results.csv
+    python3 tools/parameter_sweep.py session.csv --random 5000 \\
+        --range deadzone=50:300 slew_limit=0:8000 turret_max_speed=120:720
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.drive_simulator import (StickTrace, DEFAULT_PARAMS, DEFAULT_TURRET_PARAMS,
+                                   MIX_JOYSTICK, param_grid, simulate, simulate_turret,
+                                   step_trace, sine_sweep_trace, random_trace)
+
+# Parameters the sweep knows how to vary
+SWEEP_PARAMETERS = tuple(DEFAULT_PARAMS) + tuple(DEFAULT_TURRET_PARAMS)
+
+# Combinations evaluated per worker task (bounds trajectory memory per task)
+DEFAULT_CHUNK_SIZE = 256
+
+# Penalty per degree of turret soft-limit violation
+LIMIT_VIOLATION_WEIGHT = 10.0
+
+# Sessions are loaded once per worker process by _init_worker
+_worker_sessions = None
+_worker_mode = MIX_JOYSTICK
+
+
+def parse_values(spec):
+    """
+    Parse a grid spec: 'start:stop:count' (inclusive linspace) or 'v1,v2,...'.
+
+    Returns:
+        numpy.ndarray: Parameter values
+    """
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(v) for v in spec.split(",")])
+
+
+def parse_assignments(items, parser):
+    """Parse name=spec command line items into a dict"""
+    result = {}
+    for item in items or []:
+        name, _, spec = item.partition("=")
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError("Unknown parameter: {} (known: {})".format(name, ", ".join(SWEEP_PARAMETERS)))
+        result[name] = parser(spec)
+    return result
+
+
+def random_search(ranges, count, seed=0):
+    """
+    Uniform random samples inside the given ranges.
+
+    Args:
+        ranges: Parameter name -> (low, high)
+        count: Number of combinations
+        seed: Random seed
+
+    Returns:
+        dict: Parameter name -> array of shape (count,)
+    """
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(low, high, count) for name, (low, high) in ranges.items()}
+
+
+def _parse_range(spec):
+    low, high = spec.split(":")
+    return float(low), float(high)
+
+
+def score_chunk(params, sessions, mode=MIX_JOYSTICK):
+    """
+    Score a chunk of parameter combinations against all sessions.
+
+    Args:
+        params: Parameter name -> array of shape (P,)
+        sessions: List of StickTrace sessions
+        mode: Drive mixing mode passed to simulate()
+
+    Returns:
+        tuple: (score array (P,), metric name -> mean value array (P,))
+    """
+    count = len(next(iter(params.values())))
+    score = np.zeros(count)
+    metric_totals = {}
+
+    for session in sessions:
+        reference = session.reference
+        has_path = "x" in reference and "y" in reference
+        drive = simulate(session, params, mode=mode, record_trajectory=has_path)
+
+        if has_path:
+            dx = drive.trajectory[:, :, 0] - reference["x"][None, :]
+            dy = drive.trajectory[:, :, 1] - reference["y"][None, :]
+            path_error = np.sqrt(np.mean(dx * dx + dy * dy, axis=1))
+            score += path_error
+            metric_totals.setdefault("path_error_mm", np.zeros(count))
+            metric_totals["path_error_mm"] += path_error
+            if "heading" in reference:
+                diff = (drive.trajectory[:, :, 2] - reference["heading"][None, :] + 180.0) % 360.0 - 180.0
+                heading_error = np.sqrt(np.mean(diff * diff, axis=1))
+                score += heading_error
+                metric_totals.setdefault("heading_error_deg", np.zeros(count))
+                metric_totals["heading_error_deg"] += heading_error
+        else:
+            rise = np.nan_to_num(drive.metrics["rise_time_s"], nan=session.t[-1] - session.t[0])
+            score += (rise * 1000.0 + drive.metrics["tracking_rms"] +
+                      drive.metrics["command_change_per_s"] / 100.0)
+
+        for name, values in drive.metrics.items():
+            metric_totals.setdefault(name, np.zeros(count))
+            metric_totals[name] += values
+
+        if "turret_angle" in reference or np.any(session.r_left):
+            turret = simulate_turret(session, params, record_trajectory="turret_angle" in reference)
+            if "turret_angle" in reference:
+                diff = turret.trajectory - reference["turret_angle"][None, :]
+                turret_error = np.sqrt(np.mean(diff * diff, axis=1))
+                metric_totals.setdefault("turret_error_deg", np.zeros(count))
+                metric_totals["turret_error_deg"] += turret_error
+                score += turret_error
+            else:
+                score += turret.metrics["turret_tracking_rms"]
+            score += turret.metrics["turret_limit_violation_deg"] * LIMIT_VIOLATION_WEIGHT
+            for name, values in turret.metrics.items():
+                metric_totals.setdefault(name, np.zeros(count))
+                metric_totals[name] += values
+
+    sessions_count = max(1, len(sessions))
+    metrics = {name: total / sessions_count for name, total in metric_totals.items()}
+    return score, metrics
+
+
+def _init_worker(session_paths, mode):
+    """Load the sessions once per worker process"""
+    global _worker_sessions, _worker_mode
+    _worker_sessions = load_sessions(session_paths)
+    _worker_mode = mode
+
+
+def _score_task(task):
+    """Pool task: score one chunk (start index, params)"""
+    start, params = task
+    score, metrics = score_chunk(params, _worker_sessions, _worker_mode)
+    return start, score, metrics
+
+
+def load_sessions(paths):
+    """Load recorded sessions, or synthetic traces when no paths are given"""
+    if paths:
+        return [StickTrace.from_csv(path) for path in paths]
+    return [step_trace(left=400), sine_sweep_trace(), random_trace()]
+
+
+def run_sweep(combinations, session_paths, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              mode=MIX_JOYSTICK):
+    """
+    Score all combinations, spreading chunks across a process pool.
+
+    Args:
+        combinations: Parameter name -> array of shape (P,)
+        session_paths: Recorded session CSV paths (empty = synthetic traces)
+        workers: Pool size (None = os.cpu_count(), 1 = run in-process)
+        chunk_size: Combinations per task
+        mode: Drive mixing mode
+
+    Returns:
+        tuple: (score array (P,), metric name -> array (P,))
+    """
+    names = list(combinations)
+    count = len(combinations[names[0]])
+    tasks = []
+    for start in range(0, count, chunk_size):
+        chunk = {name: np.asarray(combinations[name][start:start + chunk_size]) for name in names}
+        tasks.append((start, chunk))
+
+    score = np.zeros(count)
+    metrics = {}
+
+    def collect(result):
+        start, chunk_score, chunk_metrics = result
+        end = start + len(chunk_score)
+        score[start:end] = chunk_score
+        for name, values in chunk_metrics.items():
+            metrics.setdefault(name, np.zeros(count))[start:end] = values
+
+    if workers == 1:
+        _init_worker(session_paths, mode)
+        for task in tasks:
+            collect(_score_task(task))
+    else:
+        with Pool(processes=workers, initializer=_init_worker, initargs=(session_paths, mode)) as pool:
+            for result in pool.imap_unordered(_score_task, tasks):
+                collect(result)
+    return score, metrics
+
+
+def write_results(path, combinations, score, metrics, limit=None):
+    """
+    Write the ranked results table (best first) as CSV.
+
+    Returns:
+        numpy.ndarray: Indices of the combinations in ranked order
+    """
+    order = np.argsort(score, kind="stable")
+    if limit:
+        order = order[:limit]
+    names = list(combinations)
+    metric_names = sorted(metrics)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "score"] + names + metric_names)
+        for rank, index in enumerate(order, 1):
+            row = [rank, "{:.4f}".format(score[index])]
+            row += ["{:.6g}".format(combinations[name][index]) for name in names]
+            row += ["{:.6g}".format(metrics[name][index]) for name in metric_names]
+            writer.writerow(row)
+    return order
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel drive/turret parameter sweep")
+    parser.add_argument("sessions", nargs="*", help="Recorded session CSV files (default: synthetic traces)")
+    parser.add_argument("--grid", nargs="*", metavar="NAME=SPEC",
+                        help="Grid values: start:stop:count or v1,v2,...")
+    parser.add_argument("--random", type=int, metavar="N", help="Random search with N combinations")
+    parser.add_argument("--range", nargs="*", metavar="NAME=LOW:HIGH", help="Random search ranges")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--mode", default=MIX_JOYSTICK, choices=["joystick", "steering"])
+    parser.add_argument("--out", default="sweep_results.csv")
+    parser.add_argument("--top", type=int, default=None, help="Only write the best N rows")
+    args = parser.parse_args(argv)
+
+    if args.random:
+        ranges = parse_assignments(args.range, _parse_range)
+        if not ranges:
+            parser.error("--random needs at least one --range NAME=LOW:HIGH")
+        combinations = random_search(ranges, args.random, args.seed)
+    else:
+        grid = parse_assignments(args.grid, parse_values)
+        if not grid:
+            grid = {"deadzone": np.linspace(50, 300, 11), "turn_mix_factor": np.linspace(0.3, 1.2, 10)}
+        combinations = param_grid(**grid)
+
+    count = len(next(iter(combinations.values())))
+    start = time.perf_counter()
+    score, metrics = run_sweep(combinations, args.sessions, args.workers, args.chunk_size, args.mode)
+    elapsed = time.perf_counter() - start
+    order = write_results(args.out, combinations, score, metrics, args.top)
+
+    print("Scored {} combinations in {:.2f}s -> {}".format(count, elapsed, args.out))
+    best = order[0]
+    print("Best (score {:.3f}): {}".format(score[best], ", ".join(
+        "{}={:.4g}".format(name, combinations[name][best]) for name in combinations)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Pixy2 get_blocks transaction benchmark
+
+Runs Pixy2.get_blocks() against the simulated I2C transport showing a
+frame of N blocks, and reports the I2C transactions, bytes and estimated bus
+time per frame. The old driver read each 14-byte block in its own
+transaction (1 write + 1 header read + N block reads). The bulk read needs
+1 write + 1 header read + ceil(14 * N / I2C_MAX_READ) payload reads.
+
+The fixed cost per transaction is an estimate for the EV3 I2C driver. Pass
+--overhead-us to use a figure measured on the brick.
+
+Usage:
+    python3 tools/pixy2_benchmark.py
+    python3 tools/pixy2_benchmark.py --blocks 1 2 4 8 --overhead-us 900
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pixycamev3.pixy2 import Pixy2, BLOCK_SIZE, I2C_MAX_READ
+from pixycamev3.simulator import SimFrame, SimulatedPixy2Transport
+
+# Fixed cost per I2C transaction and per byte on the EV3 (estimates)
+DEFAULT_OVERHEAD_US = 800
+DEFAULT_BYTE_US = 90
+
+
+def block_frame(nr_blocks):
+    """Simulated camera frame with nr_blocks signature 1 blocks"""
+    return SimFrame(blocks=[(1, 50 + 20 * b, 100, 20, 15, 0, b, 30) for b in range(nr_blocks)])
+
+
+def legacy_transactions(nr_blocks):
+    """Transactions per frame of the per-block read (before bulk reads)"""
+    return 2 + nr_blocks
+
+
+def measure(nr_blocks, frames=1000):
+    """
+    Run get_blocks() for a number of frames.
+
+    Returns:
+        tuple: (transactions per frame, bytes per frame, host time per frame in us
+                including the simulated camera)
+    """
+    transport = SimulatedPixy2Transport([block_frame(nr_blocks)])
+    pixy = Pixy2(transport=transport)
+    start = time.perf_counter()
+    for _ in range(frames):
+        count, blocks = pixy.get_blocks(1, nr_blocks)
+        assert count == nr_blocks
+    elapsed_us = (time.perf_counter() - start) * 1000000
+    return transport.transactions / frames, transport.bytes / frames, elapsed_us / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pixy2 get_blocks transaction benchmark")
+    parser.add_argument("--blocks", type=int, nargs="*", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--overhead-us", type=float, default=DEFAULT_OVERHEAD_US,
+                        help="Fixed cost per I2C transaction")
+    parser.add_argument("--byte-us", type=float, default=DEFAULT_BYTE_US,
+                        help="Cost per transferred byte")
+    args = parser.parse_args(argv)
+
+    print("I2C max read: {} bytes, block size: {} bytes".format(I2C_MAX_READ, BLOCK_SIZE))
+    print("{:>6} {:>12} {:>12} {:>10} {:>14} {:>14} {:>10}".format(
+        "blocks", "txn before", "txn after", "bytes", "bus us before", "bus us after", "host us"))
+    for nr_blocks in args.blocks:
+        transactions, nbytes, host_us = measure(nr_blocks, args.frames)
+        before = legacy_transactions(nr_blocks)
+        bus_before = before * args.overhead_us + nbytes * args.byte_us
+        bus_after = transactions * args.overhead_us + nbytes * args.byte_us
+        print("{:>6} {:>12} {:>12.0f} {:>10.0f} {:>14.0f} {:>14.0f} {:>10.1f}".format(
+            nr_blocks, before, transactions, nbytes, bus_before, bus_after, host_us))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())